@@ -0,0 +1,392 @@
+"""
+benchmark.py
+============
+
+This module benchmarks the solve_ivp methods on the ODE models of this
+project, so solver choices and regressions can be judged with data.
+
+Every run solves one model with one method for one (T, dt, rtol, atol)
+and records:
+    - wall_time: best wall-clock time of solve() over a few repeats [s],
+    - nfev, njev, accepted_steps, rejected_steps: the solver's own counters,
+      from the SolveStats of an instrumented solve (ODEModel.collect_stats),
+    - rhs_calls: calls of the model's RHS in that solve (a vectorized call
+      counts once, so for the implicit methods it differs from nfev),
+    - peak_memory: peak memory allocated during a plain solve() [bytes],
+    - max_error: largest absolute error on the grid against a reference
+      (the exact solution for linear models, else DOP853 with
+      rtol = atol = 1e-12),
+    - energy_drift: largest relative change of the total energy, for the
+      energy conserving (Hamiltonian) models.
+
+Contents:
+- MODELS:
+    The benchmarked models and their initial conditions: ExponentialDecay,
+    Pendulum, DampenedPendulum and DoublePendulum.
+- BENCHMARK_METHODS:
+    RK45, DOP853, Radau, BDF and LSODA.
+- run_case(name, method, T, dt, rtol, atol, repeat=3):
+    One benchmark run, returned as a dict.
+- run_benchmarks(models=None, methods=None, T_values=(10.0,),
+                 dt_values=(0.01,), tolerances=((1e-3, 1e-6), (1e-8, 1e-10)),
+                 repeat=3):
+    All combinations, returned with metadata (versions, platform, date) in a
+    JSON-compatible dict.
+- save_benchmarks(report, path) / load_benchmarks(path):
+    Write and read the JSON report.
+- compare_benchmarks(current, baseline, threshold=1.25, nfev_threshold=1.1):
+    Matches the runs of two reports and flags regressions: wall time,
+    peak memory, error or energy drift above threshold times the
+    baseline, or nfev above nfev_threshold times the baseline.
+
+Run file with:
+    python benchmark.py --output bench.json
+    python benchmark.py --output new.json --baseline bench.json
+The comparison mode prints a table and exits with status 1 on regressions.
+
+Dependencies:
+- numpy
+- scipy
+- ode.py, exp_decay.py, linear.py, pendulum.py, double_pendulum.py
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+import scipy
+from typing import Any, Callable, Iterable, Optional, Sequence
+from ode import ODEModel
+from linear import LinearODEModel
+from exp_decay import ExponentialDecay
+from pendulum import Pendulum, DampenedPendulum
+from double_pendulum import DoublePendulum
+
+MODELS: dict[str, tuple[Callable[[], ODEModel], np.ndarray]] = {
+    "ExponentialDecay": (lambda: ExponentialDecay(0.4), np.array([3.2])),
+    "Pendulum": (lambda: Pendulum(L=1.0, g=9.81), np.array([np.pi / 6, 0.35])),
+    "DampenedPendulum": (
+        lambda: DampenedPendulum(L=1.0, g=9.81, B=0.5),
+        np.array([np.pi / 6, 0.35]),
+    ),
+    "DoublePendulum": (
+        lambda: DoublePendulum(L1=1.0, L2=1.0, g=9.81),
+        np.array([np.pi / 6, 0.35, 0.0, 0.0]),
+    ),
+}
+
+BENCHMARK_METHODS = ("RK45", "DOP853", "Radau", "BDF", "LSODA")
+
+# Fields that identify a run; the other fields are measurements
+RUN_KEY = ("model", "method", "T", "dt", "rtol", "atol")
+
+
+_references: dict[tuple[str, float, float], np.ndarray] = {}
+
+
+def _reference(name: str, T: float, dt: float) -> np.ndarray:
+    """
+    Reference solution on the grid of solve(u0, T, dt), computed once per
+    (model, T, dt).
+
+    Returns
+        np.ndarray - shape (num_states, num_timepoints).
+    """
+    key = (name, T, dt)
+    if key not in _references:
+        factory, u0 = MODELS[name]
+        model = factory()
+        if isinstance(model, LinearODEModel):
+            result = model.solve(u0, T, dt, method="exact")
+        else:
+            result = model.solve(u0, T, dt, method="DOP853", rtol=1e-12, atol=1e-12)
+        _references[key] = np.asarray(result.solution)
+    return _references[key]
+
+
+def run_case(
+    name: str,
+    method: str,
+    T: float,
+    dt: float,
+    rtol: float,
+    atol: float,
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """
+    Benchmarks one model with one method and one set of parameters.
+
+    Parameters:
+    name: str
+        Key of MODELS.
+    method: str
+        solve_ivp method.
+    T, dt, rtol, atol: float
+        Passed to solve().
+    repeat: int
+        Number of timed solves; the fastest one is reported.
+
+    Returns
+        dict[str, Any] - the RUN_KEY fields plus wall_time, nfev, njev,
+        rhs_calls, accepted_steps, rejected_steps, peak_memory, max_error
+        and energy_drift (None if not defined).
+    """
+    factory, u0 = MODELS[name]
+    model = factory()
+    model.solve_cache = None  # always integrate, also with a cache installed
+
+    wall_time = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = model.solve(u0, T, dt, method=method, rtol=rtol, atol=atol)
+        wall_time = min(wall_time, time.perf_counter() - start)
+
+    # Peak memory of a plain solve, without the instrumentation wrappers
+    tracemalloc.start()
+    try:
+        model.solve(u0, T, dt, method=method, rtol=rtol, atol=atol)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # One more solve with instrumentation, untimed, for the counters
+    model.collect_stats = True
+    stats = model.solve(u0, T, dt, method=method, rtol=rtol, atol=atol).stats
+
+    reference = _reference(name, T, dt)
+    max_error = None
+    if result.solution.shape == reference.shape:
+        max_error = float(np.max(np.abs(result.solution - reference)))
+
+    energy_drift = None
+    if model.hamiltonian:
+        E = np.asarray(result.total_energy)
+        energy_drift = float(np.max(np.abs(E - E[0])) / max(abs(E[0]), 1e-300))
+
+    return {
+        "model": name,
+        "method": method,
+        "T": T,
+        "dt": dt,
+        "rtol": rtol,
+        "atol": atol,
+        "wall_time": wall_time,
+        "nfev": stats.nfev,
+        "njev": stats.njev,
+        "rhs_calls": stats.rhs_calls,
+        "accepted_steps": stats.accepted_steps,
+        "rejected_steps": stats.rejected_steps,
+        "peak_memory": peak_memory,
+        "max_error": max_error,
+        "energy_drift": energy_drift,
+    }
+
+
+def run_benchmarks(
+    models: Optional[Iterable[str]] = None,
+    methods: Optional[Iterable[str]] = None,
+    T_values: Iterable[float] = (10.0,),
+    dt_values: Iterable[float] = (0.01,),
+    tolerances: Iterable[tuple[float, float]] = ((1e-3, 1e-6), (1e-8, 1e-10)),
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """
+    Runs run_case() for every combination of the arguments.
+
+    Parameters:
+    models: Iterable[str] | None
+        Keys of MODELS (default all).
+    methods: Iterable[str] | None
+        solve_ivp methods (default BENCHMARK_METHODS).
+    T_values, dt_values: Iterable[float]
+        Simulated times and output steps.
+    tolerances: Iterable[tuple[float, float]]
+        (rtol, atol) pairs.
+    repeat: int
+        Timed solves per run.
+
+    Raises:
+        ValueError: If a model name is unknown.
+
+    Returns
+        dict[str, Any] - {"meta": {...}, "runs": [...]}, JSON-compatible.
+    """
+    models = list(MODELS if models is None else models)
+    unknown = [name for name in models if name not in MODELS]
+    if unknown:
+        raise ValueError(f"Unknown models {unknown}, choose from {list(MODELS)}.")
+    methods = list(BENCHMARK_METHODS if methods is None else methods)
+
+    runs = [
+        run_case(name, method, float(T), float(dt), rtol, atol, repeat)
+        for name in models
+        for T in T_values
+        for dt in dt_values
+        for rtol, atol in tolerances
+        for method in methods
+    ]
+    meta = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "repeat": repeat,
+    }
+    return {"meta": meta, "runs": runs}
+
+
+def save_benchmarks(report: dict[str, Any], path: str) -> None:
+    """
+    Writes a report of run_benchmarks() as JSON.
+
+    Returns
+        None
+    """
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_benchmarks(path: str) -> dict[str, Any]:
+    """
+    Reads a report written by save_benchmarks().
+
+    Returns
+        dict[str, Any]
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_benchmarks(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = 1.25,
+    nfev_threshold: float = 1.1,
+) -> list[dict[str, Any]]:
+    """
+    Compares the runs of two reports that share the same RUN_KEY fields.
+
+    A run is a regression if its wall time, peak memory or error (or
+    energy drift) is more than threshold times the baseline, or if it
+    needs more than nfev_threshold times the RHS evaluations.
+
+    Parameters:
+    current, baseline: dict[str, Any]
+        Reports of run_benchmarks() / load_benchmarks().
+    threshold: float
+        Allowed ratio before a measurement counts as a regression.
+    nfev_threshold: float
+        Allowed ratio for nfev. It is deterministic, so it gets a tighter
+        limit than the timings, but a few extra evaluations (e.g. one more
+        step) are not a regression.
+
+    Returns
+        list[dict[str, Any]] - per matched run the RUN_KEY fields, the
+        ratios current / baseline of wall_time, nfev, peak_memory,
+        max_error and energy_drift (None if not defined) and a list of the
+        regressed measurements under "regressions".
+    """
+    baseline_runs = {tuple(run[k] for k in RUN_KEY): run for run in baseline["runs"]}
+    rows = []
+    for run in current["runs"]:
+        key = tuple(run[k] for k in RUN_KEY)
+        if key not in baseline_runs:
+            continue
+        old = baseline_runs[key]
+        row = dict(zip(RUN_KEY, key))
+        regressions = []
+        for field in ("wall_time", "nfev", "peak_memory", "max_error", "energy_drift"):
+            new_value, old_value = run[field], old[field]
+            if new_value is None or old_value is None:
+                row[field] = None
+                continue
+            if old_value == 0:
+                ratio = 1.0 if new_value == 0 else float("inf")
+            else:
+                ratio = new_value / old_value
+            row[field] = ratio
+            limit = nfev_threshold if field == "nfev" else threshold
+            if ratio > limit:
+                regressions.append(field)
+        row["regressions"] = regressions
+        rows.append(row)
+    return rows
+
+
+def _format_rows(rows: Sequence[dict[str, Any]]) -> str:
+    """
+    Table of compare_benchmarks() rows, one line per run.
+
+    Returns
+        str
+    """
+
+    def ratio(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.2f}"
+
+    lines = [
+        f"{'model':<18}{'method':<8}{'T':>7}{'dt':>7}{'rtol':>8}"
+        f"{'time':>7}{'nfev':>7}{'mem':>7}{'error':>7}  regressions"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['model']:<18}{row['method']:<8}{row['T']:>7g}{row['dt']:>7g}"
+            f"{row['rtol']:>8g}{ratio(row['wall_time']):>7}{ratio(row['nfev']):>7}"
+            f"{ratio(row['peak_memory']):>7}{ratio(row['max_error']):>7}  "
+            + ", ".join(row["regressions"])
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line interface, see the module docstring.
+
+    Returns
+        int - exit status, 1 if the comparison found regressions.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the ODE solvers.")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS))
+    parser.add_argument("--methods", nargs="+", choices=BENCHMARK_METHODS)
+    parser.add_argument("--T", nargs="+", type=float, default=[10.0])
+    parser.add_argument("--dt", nargs="+", type=float, default=[0.01])
+    parser.add_argument(
+        "--tol",
+        nargs="+",
+        type=float,
+        default=[1e-3, 1e-6, 1e-8, 1e-10],
+        help="rtol atol pairs",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--nfev-threshold", type=float, default=1.1)
+    args = parser.parse_args(argv)
+    if len(args.tol) % 2:
+        parser.error("--tol needs rtol atol pairs.")
+
+    tolerances = list(zip(args.tol[::2], args.tol[1::2]))
+    report = run_benchmarks(
+        args.models, args.methods, args.T, args.dt, tolerances, args.repeat
+    )
+    save_benchmarks(report, args.output)
+    print(f"Wrote {len(report['runs'])} runs to {args.output}")
+
+    if args.baseline:
+        rows = compare_benchmarks(
+            report, load_benchmarks(args.baseline), args.threshold, args.nfev_threshold
+        )
+        print(_format_rows(rows))
+        if any(row["regressions"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+cache.py
+========
+
+This module provides an opt-in memoization cache for ODEModel.solve().
+
+The same solves are repeated again and again across the exercises, tests
+and reports (e.g. Pendulum(L=1, g=9.81) from u0 = (pi/6, 0.35) with T=10,
+dt=0.01). With a SolveCache installed, a repeated solve returns the stored
+trajectory instead of integrating again.
+
+Usage:
+    ODEModel.solve_cache = SolveCache(directory=".solve_cache")  # all models
+    Pendulum.solve_cache = SolveCache()                          # one class
+    model.solve_cache = None                                     # opt out
+
+Contents:
+- SolveCache:
+    Two-tier cache of solve() trajectories:
+        - an in-process LRU tier holding the last maxsize trajectories,
+        - an optional on-disk tier (one .npz file per solve) that is shared
+          between processes and runs, and evicts the least recently used
+          files once their total size exceeds max_bytes.
+    key(model, u0, T, dt, method, rtol, atol) builds the cache key, get()
+    and put() read and store the raw (t, y) of a solve.
+
+Design Notes:
+- The key is a SHA-256 hash of the model class, its parameters (the
+  instance attributes, e.g. _L and _g), u0, T, dt, method, rtol and atol.
+  Parameters that are not numbers, strings or arrays are keyed by repr().
+  The opt-in switches in RUNTIME_ATTRIBUTES (solve_cache, collect_stats)
+  and values of cached properties do not change the trajectory and are
+  left out, so they never cause a miss.
+- Only the time points and states are cached. The model rebuilds its own
+  result object (PendulumResults, ...) from them, so derived quantities
+  are computed as usual.
+- Cached arrays are shared between hits and therefore read-only.
+- Dense output and event solves are not cached.
+
+Dependencies:
+- numpy
+- scipy.optimize.OptimizeResult
+
+Run file with:
+    python cache.py
+"""
+
+import hashlib
+import os
+import numpy as np
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Optional
+from scipy.optimize import OptimizeResult
+
+# Bump when the cached data of a solve changes, so old disk entries are missed
+CACHE_VERSION = 1
+
+# Instance attributes that switch solve() features on or off without
+# changing the trajectory, they are not part of the key
+RUNTIME_ATTRIBUTES = frozenset({"solve_cache", "collect_stats"})
+
+
+def _feed(digest: Any, value: Any) -> None:
+    """
+    Adds one value to a hash, arrays by dtype, shape and raw data.
+
+    Returns
+        None
+    """
+    if isinstance(value, (np.ndarray, list, tuple)) and not isinstance(value, str):
+        array = np.ascontiguousarray(value)
+        if array.dtype != object:
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(array.tobytes())
+            return
+    if isinstance(value, (bool, int, float, np.number)):
+        value = float(value)
+    digest.update(repr(value).encode())
+    digest.update(b"\0")
+
+
+class SolveCache:
+    """
+    In-process LRU cache of solve() trajectories with an optional
+    size-bounded on-disk tier.
+
+    Parameters:
+    maxsize: int
+        Number of trajectories kept in memory (0 disables the memory tier).
+    directory: str | None
+        Directory of the on-disk tier, created if needed. None keeps the
+        cache in memory only.
+    max_bytes: int
+        Size limit of the on-disk tier. The least recently used files are
+        deleted when it is exceeded (default 1 GiB).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        directory: Optional[str] = None,
+        max_bytes: int = 2**30,
+    ) -> None:
+        """
+        Creates an empty cache.
+
+        Raises:
+            ValueError: If maxsize or max_bytes is negative.
+
+        Returns
+            None
+        """
+        if maxsize < 0 or max_bytes < 0:
+            raise ValueError("maxsize and max_bytes must be non-negative.")
+        self.maxsize = maxsize
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._memory: OrderedDict[str, OptimizeResult] = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(
+        self,
+        model: Any,
+        u0: np.ndarray,
+        T: float,
+        dt: float,
+        method: str,
+        rtol: float,
+        atol: float,
+    ) -> str:
+        """
+        The cache key of a solve.
+
+        Parameters:
+        model: ODEModel
+            The model, keyed by its class and instance attributes (except
+            RUNTIME_ATTRIBUTES and cached properties).
+        u0, T, dt, method, rtol, atol:
+            The arguments of solve().
+
+        Returns
+            str - hex digest.
+        """
+        digest = hashlib.sha256()
+        cls = type(model)
+        _feed(digest, (CACHE_VERSION, f"{cls.__module__}.{cls.__qualname__}"))
+        for name, value in sorted(vars(model).items()):
+            if name in RUNTIME_ATTRIBUTES:
+                continue
+            if isinstance(getattr(cls, name, None), cached_property):
+                continue
+            _feed(digest, name)
+            _feed(digest, value)
+        _feed(digest, np.asarray(u0, dtype=float))
+        for value in (T, dt, method, rtol, atol):
+            _feed(digest, value)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        """
+        File of a key in the on-disk tier.
+
+        Returns
+            str
+        """
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _remember(self, key: str, solution: OptimizeResult) -> None:
+        """
+        Adds a trajectory to the memory tier, dropping the least recently
+        used one when it is full.
+
+        Returns
+            None
+        """
+        if self.maxsize == 0:
+            return
+        self._memory[key] = solution
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[OptimizeResult]:
+        """
+        Looks a solve up, first in memory and then on disk.
+
+        Parameters:
+        key: str
+            From key().
+
+        Returns
+            OptimizeResult | None - with read-only t and y, or None on a
+            miss.
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with np.load(path) as data:
+                    t, y = data["t"], data["y"]
+            except (OSError, KeyError, ValueError):
+                pass
+            else:
+                os.utime(path)  # the file is now the most recently used
+                t.flags.writeable = False
+                y.flags.writeable = False
+                solution = OptimizeResult(t=t, y=y)
+                self._remember(key, solution)
+                self.hits += 1
+                self.disk_hits += 1
+                return solution
+        self.misses += 1
+        return None
+
+    def put(self, key: str, solution: Any) -> OptimizeResult:
+        """
+        Stores the time points and states of a solve in both tiers.
+
+        Parameters:
+        key: str
+            From key().
+        solution: Any
+            An object with t and y (e.g. the OptimizeResult of solve_ivp).
+
+        Returns
+            OptimizeResult - the cached (read-only) t and y, to be used in
+            place of solution.
+        """
+        t = np.array(solution.t, dtype=float)
+        y = np.array(solution.y)
+        t.flags.writeable = False
+        y.flags.writeable = False
+        cached = OptimizeResult(t=t, y=y)
+        self._remember(key, cached)
+        if self.directory is not None:
+            path = self._path(key)
+            # Write to a temporary file first, so readers never see half a file
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, t=t, y=y)
+            os.replace(tmp, path)
+            self._evict()
+        return cached
+
+    def _evict(self) -> None:
+        """
+        Deletes the least recently used files of the on-disk tier until
+        their total size is at most max_bytes.
+
+        Returns
+            None
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Empties the memory tier and deletes the files of the on-disk tier.
+
+        Returns
+            None
+        """
+        self._memory.clear()
+        if self.directory is not None:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".npz"):
+                    os.remove(entry.path)
+
+
+if __name__ == "__main__":
+    import time
+    from ode import ODEModel
+    from pendulum import Pendulum
+
+    ODEModel.solve_cache = SolveCache()
+    u0 = np.array([np.pi / 6, 0.35])
+    for label in ("first solve", "cached solve"):
+        start = time.perf_counter()
+        Pendulum(L=1.0, g=9.81).solve(u0=u0, T=10.0, dt=0.01)
+        print(f"{label}: {1e3 * (time.perf_counter() - start):.2f} ms")
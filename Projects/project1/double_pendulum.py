@@ -40,6 +40,17 @@ Feature functionality:
   angular velocities of the pendulums.
 - Implements safety against division by zero in denominators by adding
   a small epsilon value of 'e-12'.
+- Provides the exact 4x4 Jacobian of the right-hand side ('jacobian'),
+  which the implicit solvers (Radau, BDF, LSODA) use instead of
+  finite differences.
+- Provides the Hamiltonian form (canonical momenta and dH/dq, dH/dp) used
+  by the symplectic methods solve(method="verlet" | "yoshida4").
+- Provides a compiled RHS kernel, used by the fixed-step methods
+  ("rk4", "dopri5") when numba is installed.
+- DoublePendulumResults caches its coordinates, velocities and energies,
+  so each is computed once per result (see ode.CachedResult).
+- DoublePendulumResults.save(path) / load(path, mmap=True) store a result
+  on disk and open it again memory-mapped.
 
 Usage:
 The 'DoublePendulum' class is typically used together with the 'solve'
@@ -50,21 +61,62 @@ Dependencies:
 - typing
 - dataclass
 - ode.py
+- kernels.py (numba optional)
 
 Run file with:
     python doubel_pendulum.py
 """
 
+import math
 import numpy as np
-from typing import Final
+from typing import Final, Optional
 from dataclasses import dataclass
+from functools import cached_property
 from ode import *
+from kernels import njit
 
 DEFAULT_G: Final[float] = 9.81
 
 
+@njit
+def _double_pendulum_kernel(
+    t: float, u: np.ndarray, params: np.ndarray, out: np.ndarray
+) -> None:
+    """
+    Compiled RHS kernel, params = [L1, L2, g]. Same equations (and epsilon)
+    as DoublePendulum.__call__, written with scalar math.
+    """
+    L1, L2, g = params[0], params[1], params[2]
+    theta1, omega1, theta2, omega2 = u[0], u[1], u[2], u[3]
+
+    dtheta = theta2 - theta1
+    sin_dtheta = math.sin(dtheta)
+    cos_dtheta = math.cos(dtheta)
+    sin_theta1 = math.sin(theta1)
+    sin_theta2 = math.sin(theta2)
+
+    eps = 1e-12
+    denom1 = (2.0 * L1 - L1 * cos_dtheta * cos_dtheta) + eps
+    denom2 = (2.0 * L2 - L2 * cos_dtheta * cos_dtheta) + eps
+
+    out[0] = omega1
+    out[1] = (
+        L1 * omega1 * omega1 * sin_dtheta * cos_dtheta
+        + g * sin_theta2 * cos_dtheta
+        + L2 * omega2 * omega2 * sin_dtheta
+        - 2.0 * g * sin_theta1
+    ) / denom1
+    out[2] = omega2
+    out[3] = (
+        -L2 * omega2 * omega2 * sin_dtheta * cos_dtheta
+        + 2.0 * g * sin_theta1 * cos_dtheta
+        - 2.0 * L1 * omega1 * omega1 * sin_dtheta
+        - 2.0 * g * sin_theta2
+    ) / denom2
+
+
 @dataclass
-class DoublePendulumResults:
+class DoublePendulumResults(CachedResult):
     """
     Container for double pendulum simulation output and system parameters.
 
@@ -74,12 +126,24 @@ class DoublePendulumResults:
         solution (np.ndarray):
             2D array of shape (4, T) with rows:
                 [theta1, omega1, theta2, omega2]
+            or shape (4, K, T) for an ensemble from solve_many(), in
+            which case every derived quantity has shape (K, T).
         L1 (float):
             Length of first pendulum
         L2 (float):
             Length of second pendulum
         g (float):
             Gravitational acceleration
+        velocity_method (str):
+            "exact" (default) computes velocities and kinetic energy in
+            closed form from (θ1, ω1, θ2, ω2); "gradient" differentiates
+            the positions with np.gradient, as earlier versions did.
+        t_events, y_events (list[np.ndarray] | None):
+            Times and states of the events passed to solve(events=...),
+            None without events.
+        stats (SolveStats | None):
+            Instrumentation of the solve, None unless the model has
+            collect_stats = True. Not stored by save().
     """
 
     time: np.ndarray
@@ -87,6 +151,17 @@ class DoublePendulumResults:
     L1: float
     L2: float
     g: float
+    velocity_method: str = "exact"
+    t_events: Optional[list[np.ndarray]] = None
+    y_events: Optional[list[np.ndarray]] = None
+    stats: Optional[SolveStats] = None
+
+    def __post_init__(self) -> None:
+        if self.velocity_method not in VELOCITY_METHODS:
+            raise ValueError(
+                f"velocity_method must be one of {VELOCITY_METHODS}, "
+                f"got {self.velocity_method!r}."
+            )
 
     @property
     def num_states(self) -> int:
@@ -106,7 +181,7 @@ class DoublePendulumResults:
         Returns
             int
         """
-        return int(self.solution.shape[1])
+        return int(self.solution.shape[-1])
 
     # States
     @property
@@ -150,7 +225,7 @@ class DoublePendulumResults:
         return self.solution[3]
 
     # Cartesian coordinates
-    @property
+    @cached_property
     def x1(self) -> np.ndarray:
         """
         x of mass 1.
@@ -160,7 +235,7 @@ class DoublePendulumResults:
         """
         return self.L1 * np.sin(self.theta1)
 
-    @property
+    @cached_property
     def y1(self) -> np.ndarray:
         """
         y f mass 1
@@ -170,7 +245,7 @@ class DoublePendulumResults:
         """
         return -self.L1 * np.cos(self.theta1)
 
-    @property
+    @cached_property
     def x2(self) -> np.ndarray:
         """
         x of mass 2 = x1 + L2*sin(theta2).
@@ -180,7 +255,7 @@ class DoublePendulumResults:
         """
         return self.x1 + self.L2 * np.sin(self.theta2)
 
-    @property
+    @cached_property
     def y2(self) -> np.ndarray:
         """
         y of mass 2 = y1 + L2*cos(theta2).
@@ -191,48 +266,56 @@ class DoublePendulumResults:
         return self.y1 - self.L2 * np.cos(self.theta2)
 
     # Velocities
-    @property
+    @cached_property
     def vx1(self) -> np.ndarray:
         """
-        Velocity for x of pendulum 1.
+        Velocity for x of pendulum 1: L1 * cos(θ1) * ω1.
 
         Returns
             np.ndarray
         """
-        return np.gradient(self.x1, self.time)
+        if self.velocity_method == "gradient":
+            return np.gradient(self.x1, self.time, axis=-1)
+        return self.L1 * np.cos(self.theta1) * self.omega1
 
-    @property
+    @cached_property
     def vy1(self) -> np.ndarray:
         """
-        Velocity for y of pendulum 1.
+        Velocity for y of pendulum 1: L1 * sin(θ1) * ω1.
 
         Returns
             np.ndarray
         """
-        return np.gradient(self.y1, self.time)
+        if self.velocity_method == "gradient":
+            return np.gradient(self.y1, self.time, axis=-1)
+        return self.L1 * np.sin(self.theta1) * self.omega1
 
-    @property
+    @cached_property
     def vx2(self) -> np.ndarray:
         """
-        Velocity for x of pendulum 2.
+        Velocity for x of pendulum 2: vx1 + L2 * cos(θ2) * ω2.
 
         Returns
             np.ndarray
         """
-        return np.gradient(self.x2, self.time)
+        if self.velocity_method == "gradient":
+            return np.gradient(self.x2, self.time, axis=-1)
+        return self.vx1 + self.L2 * np.cos(self.theta2) * self.omega2
 
-    @property
+    @cached_property
     def vy2(self) -> np.ndarray:
         """
-        Velocity for y of pendulum 2.
+        Velocity for y of pendulum 2: vy1 + L2 * sin(θ2) * ω2.
 
         Returns
             np.ndarray
         """
-        return np.gradient(self.y2, self.time)
+        if self.velocity_method == "gradient":
+            return np.gradient(self.y2, self.time, axis=-1)
+        return self.vy1 + self.L2 * np.sin(self.theta2) * self.omega2
 
     # Energies
-    @property
+    @cached_property
     def potential_energy(self) -> np.ndarray:
         """
         (P = Potential energy)
@@ -248,23 +331,33 @@ class DoublePendulumResults:
         P2 = self.g * (self.y2 + self.L1 + self.L2)
         return P1 + P2
 
-    @property
+    @cached_property
     def kinetic_energy(self) -> np.ndarray:
         """
         (K = Kinetic energy)
 
         K = K1 + K2
-            K1 = 0.5 * (y1 + L1)
-            K2 = 0.5 * (y2 + L1 + L2)
+            K1 = 0.5 * L1^2 * ω1^2
+            K2 = 0.5 * (L1^2 * ω1^2 + L2^2 * ω2^2
+                        + 2 * L1 * L2 * ω1 * ω2 * cos(θ1 - θ2))
+
+        The second mass moves with both rods, hence the coupling term.
+        With velocity_method="gradient", K = 0.5 * sum of squared
+        finite-difference velocities.
 
         Returns
             np.ndarray
         """
-        K1 = 0.5 * (self.vx1**2 + self.vy1**2)
-        K2 = 0.5 * (self.vx2**2 + self.vy2**2)
-        return K1 + K2
+        if self.velocity_method == "gradient":
+            K1 = 0.5 * (self.vx1**2 + self.vy1**2)
+            K2 = 0.5 * (self.vx2**2 + self.vy2**2)
+            return K1 + K2
+        L1w1 = self.L1 * self.omega1
+        L2w2 = self.L2 * self.omega2
+        coupling = L1w1 * L2w2 * np.cos(self.theta1 - self.theta2)
+        return L1w1**2 + 0.5 * L2w2**2 + coupling
 
-    @property
+    @cached_property
     def total_energy(self) -> np.ndarray:
         """
         Total energy = Kinetic energy + potential energy.
@@ -277,6 +370,37 @@ class DoublePendulumResults:
         """
         return self.kinetic_energy + self.potential_energy
 
+    def save(self, path: str) -> None:
+        """
+        Stores the result in the directory path, see ode.save_result().
+
+        Parameters:
+        path: str
+            Target directory.
+
+        Returns
+            None
+        """
+        save_result(self, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "DoublePendulumResults":
+        """
+        Opens a result stored with save(). With mmap=True (default) time
+        and solution are memory-mapped, so even very large trajectories
+        open instantly and are only read where they are sliced.
+
+        Parameters:
+        path: str
+            Directory written by save().
+        mmap: bool, optional
+            Memory-map the arrays instead of reading them.
+
+        Returns
+            DoublePendulumResults
+        """
+        return load_result(cls, path, mmap)
+
 
 class DoublePendulum(ODEModel):
     """
@@ -304,6 +428,14 @@ class DoublePendulum(ODEModel):
                2 * L2 - L2 * cos^2(Δθ)
     """
 
+    # Unpacking u gives rows, so a (4, k) batch of states works unchanged
+    vectorized = True
+    # The kinetic energy couples the momenta through cos(Δθ), so H is not
+    # separable and the symplectic step is implicit
+    hamiltonian = True
+    separable = False
+    kernel = staticmethod(_double_pendulum_kernel)
+
     def __init__(
         self, *, L1: float = 1.0, L2: float = 1.0, g: float = DEFAULT_G
     ) -> None:
@@ -379,10 +511,11 @@ class DoublePendulum(ODEModel):
                 omega1 = angular velocity of pendulum 1
                 theta2 = angle of pendulum 2
                 omega2 = angular velocity of pendulum 2
+            Shape (4,), or (4, k) to evaluate k states at once.
 
         Returns:
             np.ndarray
-            Derivatives: [dθ1/dt, dω1/dt, dθ2/dt, dω2/dt].
+            Derivatives: [dθ1/dt, dω1/dt, dθ2/dt, dω2/dt], same shape as u.
         """
         # Unpacking the state variables
         theta1, omega1, theta2, omega2 = u
@@ -428,6 +561,224 @@ class DoublePendulum(ODEModel):
         # We return an array in the same vector ordering form: [θ1, ω1, θ2, ω2]
         return np.array([dtheta1_dt, domega1_dt, dtheta2_dt, domega2_dt], dtype=float)
 
+    def rhs_into(self, t: float, u: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Scalar RHS for a single state, written into out (see
+        ODEModel.rhs_into). The formulae and their order of operations are
+        those of __call__, on Python floats with math, so the result is
+        identical but no temporary arrays are created.
+
+        Parameters:
+        t: float
+            Time (not used).
+        u: np.ndarray
+            State [θ1, ω1, θ2, ω2], shape (4,).
+        out: np.ndarray
+            Output buffer, shape (4,).
+
+        Returns
+            np.ndarray - out.
+        """
+        theta1, omega1, theta2, omega2 = u.tolist()
+        L1, L2, g = self._L1, self._L2, self._g
+        dtheta = theta2 - theta1
+        sin_dtheta = math.sin(dtheta)
+        cos_dtheta = math.cos(dtheta)
+        sin_theta1 = math.sin(theta1)
+        sin_theta2 = math.sin(theta2)
+
+        eps = 1e-12
+        denom1 = (2.0 * L1 - L1 * cos_dtheta * cos_dtheta) + eps
+        denom2 = (2.0 * L2 - L2 * cos_dtheta * cos_dtheta) + eps
+
+        out[0] = omega1
+        out[1] = (
+            L1 * omega1 * omega1 * sin_dtheta * cos_dtheta
+            + g * sin_theta2 * cos_dtheta
+            + L2 * omega2 * omega2 * sin_dtheta
+            - 2.0 * g * sin_theta1
+        ) / denom1
+        out[2] = omega2
+        out[3] = (
+            -L2 * omega2 * omega2 * sin_dtheta * cos_dtheta
+            + 2.0 * g * sin_theta1 * cos_dtheta
+            - 2.0 * L1 * omega1 * omega1 * sin_dtheta
+            - 2.0 * g * sin_theta2
+        ) / denom2
+        return out
+
+    def kernel_params(self) -> np.ndarray:
+        """
+        Parameters for the compiled kernel: [L1, L2, g].
+
+        Return
+            np.ndarray
+        """
+        return np.array([self.L1, self.L2, self.g])
+
+    def jacobian(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        Exact Jacobian of the double pendulum RHS.
+
+        With N1, N2 the numerators and D1, D2 the denominators of dω1/dt
+        and dω2/dt, every entry follows from the quotient rule:
+            d(N/D)/dx = (dN/dx - (N/D) * dD/dx) / D
+        The angles enter through θ1, θ2 and Δθ = θ2 - θ1, where
+        dΔθ/dθ1 = -1 and dΔθ/dθ2 = 1.
+
+        Parameters:
+        t: float
+            Time
+        u: np.ndarray
+            State vector [θ1, ω1, θ2, ω2], shape (4,) or (4, k).
+
+        Returns:
+            np.ndarray
+            Shape (4, 4), or (4, 4, k) for a batch of states. Rows and
+            columns follow the state ordering [θ1, ω1, θ2, ω2].
+        """
+        theta1, omega1, theta2, omega2 = np.asarray(u, dtype=float)
+        L1, L2, g = self.L1, self.L2, self.g
+
+        dtheta = theta2 - theta1
+        sin_dtheta = np.sin(dtheta)
+        cos_dtheta = np.cos(dtheta)
+        sin_cos = sin_dtheta * cos_dtheta
+        # d(sin * cos)/dΔθ
+        cos_2dtheta = cos_dtheta * cos_dtheta - sin_dtheta * sin_dtheta
+
+        # Same epsilon as in __call__, so J matches the RHS exactly
+        eps = 1e-12
+        denom1 = (2.0 * L1 - L1 * cos_dtheta * cos_dtheta) + eps
+        denom2 = (2.0 * L2 - L2 * cos_dtheta * cos_dtheta) + eps
+        domega1_dt = (
+            L1 * omega1 * omega1 * sin_cos
+            + g * np.sin(theta2) * cos_dtheta
+            + L2 * omega2 * omega2 * sin_dtheta
+            - 2.0 * g * np.sin(theta1)
+        ) / denom1
+        domega2_dt = (
+            -L2 * omega2 * omega2 * sin_cos
+            + 2.0 * g * np.sin(theta1) * cos_dtheta
+            - 2.0 * L1 * omega1 * omega1 * sin_dtheta
+            - 2.0 * g * np.sin(theta2)
+        ) / denom2
+
+        # Derivatives of the numerators with respect to Δθ
+        dN1_ddtheta = (
+            L1 * omega1 * omega1 * cos_2dtheta
+            - g * np.sin(theta2) * sin_dtheta
+            + L2 * omega2 * omega2 * cos_dtheta
+        )
+        dN2_ddtheta = (
+            -L2 * omega2 * omega2 * cos_2dtheta
+            - 2.0 * g * np.sin(theta1) * sin_dtheta
+            - 2.0 * L1 * omega1 * omega1 * cos_dtheta
+        )
+        # Derivatives of the denominators with respect to Δθ
+        dD1_ddtheta = 2.0 * L1 * sin_cos
+        dD2_ddtheta = 2.0 * L2 * sin_cos
+
+        J = np.zeros((4, 4) + np.shape(theta1))
+        J[0, 1] = 1.0
+        J[2, 3] = 1.0
+
+        # Row of dω1/dt
+        J[1, 0] = (
+            -dN1_ddtheta - 2.0 * g * np.cos(theta1) + domega1_dt * dD1_ddtheta
+        ) / denom1
+        J[1, 1] = 2.0 * L1 * omega1 * sin_cos / denom1
+        J[1, 2] = (
+            dN1_ddtheta + g * np.cos(theta2) * cos_dtheta - domega1_dt * dD1_ddtheta
+        ) / denom1
+        J[1, 3] = 2.0 * L2 * omega2 * sin_dtheta / denom1
+
+        # Row of dω2/dt
+        J[3, 0] = (
+            -dN2_ddtheta
+            + 2.0 * g * np.cos(theta1) * cos_dtheta
+            + domega2_dt * dD2_ddtheta
+        ) / denom2
+        J[3, 1] = -4.0 * L1 * omega1 * sin_dtheta / denom2
+        J[3, 2] = (
+            dN2_ddtheta - 2.0 * g * np.cos(theta2) - domega2_dt * dD2_ddtheta
+        ) / denom2
+        J[3, 3] = -2.0 * L2 * omega2 * sin_cos / denom2
+        return J
+
+    def to_canonical(self, u: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Canonical coordinates q = (θ1, θ2) and momenta p = (p1, p2).
+
+        With unit masses the Lagrangian is
+            T = L1^2 ω1^2 + L2^2 ω2^2 / 2 + L1 L2 ω1 ω2 cos(Δθ)
+            V = -2 g L1 cos(θ1) - g L2 cos(θ2)
+        so the conjugate momenta are
+            p1 = 2 L1^2 ω1 + L1 L2 cos(Δθ) ω2
+            p2 = L2^2 ω2 + L1 L2 cos(Δθ) ω1
+
+        Parameters:
+        u: np.ndarray
+            State vector [θ1, ω1, θ2, ω2], shape (4,) or (4, k).
+
+        Returns
+            tuple[np.ndarray, np.ndarray]: (q, p), each of shape (2,) or (2, k).
+        """
+        theta1, omega1, theta2, omega2 = u
+        coupling = self.L1 * self.L2 * np.cos(theta2 - theta1)
+        p1 = 2.0 * self.L1**2 * omega1 + coupling * omega2
+        p2 = self.L2**2 * omega2 + coupling * omega1
+        return np.array([theta1, theta2]), np.array([p1, p2])
+
+    def from_canonical(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        Builds the state [θ1, ω1, θ2, ω2] from (q, p).
+
+        Returns
+            np.ndarray
+        """
+        omega1, omega2 = self.hamiltonian_dp(q, p)
+        return np.array([q[0], omega1, q[1], omega2])
+
+    def hamiltonian_dq(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        dH/dq for H(q, p) = T + V written in the momenta:
+            dH/dθ1 = 2 g L1 sin(θ1) - L1 L2 ω1 ω2 sin(Δθ)
+            dH/dθ2 = g L2 sin(θ2) + L1 L2 ω1 ω2 sin(Δθ)
+        where ω1, ω2 are the velocities belonging to (q, p).
+
+        Returns
+            np.ndarray
+        """
+        omega1, omega2 = self.hamiltonian_dp(q, p)
+        coupling = self.L1 * self.L2 * omega1 * omega2 * np.sin(q[1] - q[0])
+        return np.array(
+            [
+                2.0 * self.g * self.L1 * np.sin(q[0]) - coupling,
+                self.g * self.L2 * np.sin(q[1]) + coupling,
+            ]
+        )
+
+    def hamiltonian_dp(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        dH/dp = M(Δθ)^-1 p, the angular velocities (ω1, ω2), where
+            M = [[2 L1^2,            L1 L2 cos(Δθ)],
+                 [L1 L2 cos(Δθ),     L2^2         ]]
+        is the mass matrix with det(M) = L1^2 L2^2 (2 - cos^2(Δθ)).
+
+        Returns
+            np.ndarray
+        """
+        cos_dtheta = np.cos(q[1] - q[0])
+        det = self.L1**2 * self.L2**2 * (2.0 - cos_dtheta * cos_dtheta)
+        off_diagonal = self.L1 * self.L2 * cos_dtheta
+        return np.array(
+            [
+                (self.L2**2 * p[0] - off_diagonal * p[1]) / det,
+                (2.0 * self.L1**2 * p[1] - off_diagonal * p[0]) / det,
+            ]
+        )
+
     def _create_result(self, solution: Any) -> Any:
         """
         Adapt SciPy solve_ivp output to our DoublePendulumResults.
@@ -445,7 +796,14 @@ class DoublePendulum(ODEModel):
             raise AttributeError("Solution object must have t and y attributes.")
         # Returning DoublePendulumResults dataclass
         return DoublePendulumResults(
-            time=solution.t, solution=solution.y, L1=self.L1, L2=self.L2, g=self.g
+            time=solution.t,
+            solution=solution.y,
+            L1=self.L1,
+            L2=self.L2,
+            g=self.g,
+            t_events=getattr(solution, "t_events", None),
+            y_events=getattr(solution, "y_events", None),
+            stats=getattr(solution, "stats", None),
         )
 
 
@@ -14,10 +14,16 @@ where:
 
 Contents:
 - ExponentialDecay:
-    A class that inherits from ODEModel and represents the exponential
-    decay system. It provides:
+    A class that inherits from LinearODEModel (linear.py, du/dt = A u with
+    A = [[-a]]) and represents the exponential decay system. It provides:
         - A constructor that validates the decay constant.
-        - A __call__ method implementing the right-hand side of the ODE.
+        - A __call__ method implementing the right-hand side of the ODE,
+          and its allocation-free scalar version rhs_into.
+        - A jacobian method returning the exact Jacobian -a.
+        - An exact_solution method, u0 * exp(-a t), used by
+          solve(method="exact").
+        - A compiled RHS kernel (used by "rk4"/"dopri5" when numba is
+          installed, see kernels.py).
         - A property 'decay' with getter and setter for validation.
         - A 'num_states' property returning 1 (since the model only has one state).
 
@@ -35,24 +41,44 @@ Dependencies:
 - scipy.integrate.solve_ivp
 - matplotlib
 - ode.py
+- linear.py
+- kernels.py (numba optional)
 """
 
 import numpy as np
-from ode import ODEModel, ODEResult, plot_ode_solution
+from ode import ODEResult, plot_ode_solution
+from linear import LinearODEModel
+from kernels import njit
 import scipy as sp
 from scipy.integrate import solve_ivp
 import matplotlib.pyplot as plt
 
 
-# ExponentialDecay inherits from ODEModel
-class ExponentialDecay(ODEModel):
+@njit
+def _decay_kernel(t: float, u: np.ndarray, params: np.ndarray, out: np.ndarray) -> None:
+    """
+    Compiled RHS kernel, params = [a]: out = -a * u.
+    """
+    out[0] = -params[0] * u[0]
+
+
+# ExponentialDecay is the one dimensional linear system A = [[-a]]
+class ExponentialDecay(LinearODEModel):
     """
     A simple model of exponential decay.
     This represents the differntial equation (ODE):
         du/dt = -au
     Where 'u' is the quantity that decays, and 'a' is the decay constant.
+
+    It is the linear system du/dt = A u with A = [[-a]], and keeps its own
+    scalar RHS, kernel and exact solution, which are cheaper than the
+    general matrix versions.
     """
 
+    # -a * u is elementwise, so u may also have shape (1, k)
+    vectorized = True
+    kernel = staticmethod(_decay_kernel)
+
     def __init__(self, a: float) -> None:
         """
         Creates a new exponential decay model.
@@ -74,7 +100,7 @@ class ExponentialDecay(ODEModel):
         t:  float
             The time at which to evaluate the rate of change.
         u:  np.ndarray
-            The rate of change that du/dt has at this time and state.
+            The current state, shape (1,) or (1, k) for k states at once.
 
         Return
             np.ndarray[float]
@@ -82,6 +108,74 @@ class ExponentialDecay(ODEModel):
         du_dt = -self.decay * u
         return du_dt
 
+    def rhs_into(self, t: float, u: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Scalar RHS -a*u of a single state written into out (see
+        ODEModel.rhs_into), identical to __call__ without temporaries.
+
+        Parameters:
+        t:  float
+            The time (not used).
+        u:  np.ndarray
+            The current state, shape (1,).
+        out: np.ndarray
+            Output buffer, shape (1,).
+
+        Return
+            np.ndarray - out.
+        """
+        out[0] = -self.decay * u[0]
+        return out
+
+    def jacobian(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        Exact Jacobian of the RHS: d(-a*u)/du = -a.
+
+        Parameters:
+        t:  float
+            The time (the Jacobian does not depend on it).
+        u:  np.ndarray
+            The current state, shape (1,) or (1, k).
+
+        Return
+            np.ndarray - shape (1, 1) or (1, 1, k).
+        """
+        return np.full((1, 1) + np.shape(u)[1:], -self.decay)
+
+    def exact_solution(self, t: np.ndarray, u0: np.ndarray) -> np.ndarray:
+        """
+        Exact solution u(t) = u0 * exp(-a t), used by solve(method="exact").
+
+        Parameters:
+        t:  np.ndarray
+            The times.
+        u0: np.ndarray
+            The initial state, shape (1,) or (1, k).
+
+        Return
+            np.ndarray - shape u0.shape + (len(t),).
+        """
+        return u0[..., np.newaxis] * np.exp(-self.decay * np.asarray(t))
+
+    def kernel_params(self) -> np.ndarray:
+        """
+        Parameters for the compiled kernel: [a].
+
+        Return
+            np.ndarray
+        """
+        return np.array([self.decay])
+
+    @property
+    def A(self) -> np.ndarray:
+        """
+        The system matrix [[-a]] of the linear model.
+
+        Return
+            np.ndarray
+        """
+        return np.array([[-self.decay]])
+
     # With this, the decay works as a variable instead of a function
     @property
     def decay(self) -> float:
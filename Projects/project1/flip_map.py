@@ -0,0 +1,303 @@
+"""
+flip_map.py
+===========
+
+This module computes the "flip map" of the double pendulum: for every
+initial condition (θ1, θ2) of a grid, released from rest, the time until
+either arm first flips over (|θ1| or |θ2| passes π), up to a time cap T.
+Shown as an image, the flip times form the well-known fractal picture of
+the double pendulum.
+
+Contents:
+- FlipMap (dataclass):
+    The grid values theta1 and theta2, the image of flip times with shape
+    (len(theta2), len(theta1)) (rows follow θ2, columns follow θ1, as in
+    imshow(..., origin="lower")), and the parameters T, dt, L1, L2 and g.
+    Initial conditions that do not flip before T have flip time NaN.
+- can_flip(theta1, theta2, L1, L2, g):
+    Energy precheck, False where an initial condition can never flip.
+- flip_map(theta1, theta2, T=10.0, dt=0.01, L1=1.0, L2=1.0, g=DEFAULT_G,
+           method="rk4", max_workers=None, chunk_size=None):
+    Computes a FlipMap.
+- plot_flip_map(result, filename=None):
+    Plots log10 of the flip times as an image.
+
+Design Notes:
+- Energy precheck: with unit masses the potential energy is
+      V = -g (2 L1 cos θ1 + L2 cos θ2),
+  and its minimum over the configurations with an arm upside down
+  (θ1 = π or θ2 = π) is -g |2 L1 - L2|. Energy is conserved, so initial
+  conditions at rest with a lower energy can never flip and are not
+  integrated at all. For a wide grid this removes a large part of the
+  work.
+- The remaining initial conditions are integrated together as state-major
+  (4, K) arrays by ode.integrate_until(), i.e. the fixed-step engine of
+  solve(method="rk4" or "dopri5") with the vectorized DoublePendulum RHS.
+  After every step the members that flipped get their flip time and are
+  dropped from the arrays, so each member stops as soon as it flips and
+  the cost of a step shrinks with the number of members still running.
+- The members are dealt out round-robin into chunks that are integrated in
+  a process pool (as in sweep.py). Round-robin mixes cheap (early flip)
+  and expensive (never flip) regions of the grid into every chunk, so the
+  workers finish at about the same time. max_workers=1 runs in the calling
+  process.
+
+Dependencies:
+- numpy
+- matplotlib
+- ode.py
+- double_pendulum.py
+
+Run file with:
+    python flip_map.py
+"""
+
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Sequence
+from double_pendulum import DEFAULT_G, DoublePendulum
+from ode import FIXED_STEP_METHODS, integrate_until
+
+# Upper bound of the members per chunk, keeps the (stages, 4, K) stage
+# buffers of one step small
+MAX_CHUNK_SIZE = 2**16
+
+
+@dataclass
+class FlipMap:
+    """
+    Flip times of a grid of double pendulum initial conditions.
+
+    Attributes:
+        theta1 (np.ndarray):
+            Initial angles of the first arm (the image columns).
+        theta2 (np.ndarray):
+            Initial angles of the second arm (the image rows).
+        flip_time (np.ndarray):
+            Shape (len(theta2), len(theta1)). flip_time[j, i] is the first
+            time at which an arm of the pendulum started from
+            (theta1[i], theta2[j]) at rest flipped over, NaN if it did not
+            flip before T.
+        T, dt (float):
+            Time cap and step size of the integration.
+        L1, L2, g (float):
+            Parameters of the DoublePendulum.
+    """
+
+    theta1: np.ndarray
+    theta2: np.ndarray
+    flip_time: np.ndarray
+    T: float
+    dt: float
+    L1: float
+    L2: float
+    g: float
+
+    @property
+    def flipped(self) -> np.ndarray:
+        """
+        Mask of the initial conditions that flipped before T.
+
+        Returns
+            np.ndarray
+        """
+        return ~np.isnan(self.flip_time)
+
+
+def can_flip(
+    theta1: np.ndarray, theta2: np.ndarray, L1: float, L2: float, g: float
+) -> np.ndarray:
+    """
+    Energy precheck: False where an initial condition at rest has too little
+    energy to ever turn an arm upside down (see the module docstring).
+
+    Parameters:
+    theta1, theta2: np.ndarray
+        Initial angles (broadcast against each other).
+    L1, L2, g: float
+        Parameters of the DoublePendulum.
+
+    Returns
+        np.ndarray - boolean mask.
+    """
+    potential = -g * (2 * L1 * np.cos(theta1) + L2 * np.cos(theta2))
+    return potential >= -g * abs(2 * L1 - L2)
+
+
+def _flip_chunk(
+    L1: float,
+    L2: float,
+    g: float,
+    theta1: np.ndarray,
+    theta2: np.ndarray,
+    T: float,
+    dt: float,
+    method: str,
+) -> np.ndarray:
+    """
+    Integrates a chunk of initial conditions until they flip or reach T.
+    Runs inside the worker processes.
+
+    Parameters:
+    theta1, theta2: np.ndarray
+        Initial angles of the K members, shape (K,).
+
+    Returns
+        np.ndarray - flip times, shape (K,), NaN where no flip happened.
+    """
+    model = DoublePendulum(L1=L1, L2=L2, g=g)
+    U0 = np.zeros((4, theta1.size))
+    U0[0], U0[2] = theta1, theta2
+    t_eval = dt * np.arange(int(round(T / dt)) + 1)
+
+    def flipped(t: float, u: np.ndarray) -> np.ndarray:
+        return (np.abs(u[0]) > np.pi) | (np.abs(u[2]) > np.pi)
+
+    stop_index, _ = integrate_until(model, U0, t_eval, flipped, method)
+    return np.where(stop_index >= 0, t_eval[stop_index], np.nan)
+
+
+def flip_map(
+    theta1: Sequence[float],
+    theta2: Sequence[float],
+    T: float = 10.0,
+    dt: float = 0.01,
+    L1: float = 1.0,
+    L2: float = 1.0,
+    g: float = DEFAULT_G,
+    method: str = "rk4",
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> FlipMap:
+    """
+    Computes the flip times of the DoublePendulum for every initial
+    condition (theta1[i], theta2[j], at rest) of a grid.
+
+    Example:
+        angles = np.linspace(-3, 3, 1000)
+        result = flip_map(angles, angles, T=10)
+    gives a 1000 x 1000 image in result.flip_time.
+
+    Parameters:
+    theta1, theta2: Sequence[float]
+        Initial angles of the two arms, in [-π, π].
+    T: float
+        Time cap.
+    dt: float
+        Step size; flip times are multiples of dt.
+    L1, L2, g: float
+        Parameters of the DoublePendulum.
+    method: str
+        Fixed-step method of ode.FIXED_STEP_METHODS ("rk4" or "dopri5").
+    max_workers: int | None, optional
+        Number of worker processes (default os.cpu_count()). With 1 the
+        map is computed in the calling process.
+    chunk_size: int | None, optional
+        Initial conditions per task (default: about four tasks per worker,
+        at most MAX_CHUNK_SIZE).
+
+    Raises:
+        ValueError: If a grid is empty, an angle is outside [-π, π], the
+        method is unknown or T, dt are not positive.
+
+    Returns
+        FlipMap
+    """
+    theta1 = np.asarray(theta1, dtype=float).ravel()
+    theta2 = np.asarray(theta2, dtype=float).ravel()
+    if theta1.size == 0 or theta2.size == 0:
+        raise ValueError("theta1 and theta2 need at least one value.")
+    if np.any(np.abs(theta1) > np.pi) or np.any(np.abs(theta2) > np.pi):
+        raise ValueError("Initial angles must lie in [-pi, pi].")
+    if method not in FIXED_STEP_METHODS:
+        raise ValueError(
+            f"Unknown method {method!r}, use one of {sorted(FIXED_STEP_METHODS)}."
+        )
+    if T <= 0 or dt <= 0:
+        raise ValueError("T and dt must be positive.")
+    # Validates L1, L2 and g before any work is sent to the pool
+    DoublePendulum(L1=L1, L2=L2, g=g)
+
+    grid1, grid2 = np.meshgrid(theta1, theta2)
+    flip_time = np.full(grid1.shape, np.nan)
+    candidates = np.flatnonzero(can_flip(grid1, grid2, L1, L2, g))
+
+    if candidates.size:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, candidates.size))
+        if chunk_size is None:
+            chunk_size = -(-candidates.size // (4 * max_workers))
+            chunk_size = min(chunk_size, MAX_CHUNK_SIZE)
+        num_chunks = -(-candidates.size // max(1, chunk_size))
+        chunks = [candidates[i::num_chunks] for i in range(num_chunks)]
+
+        flat1, flat2, out = grid1.ravel(), grid2.ravel(), flip_time.ravel()
+        params = (L1, L2, g)
+        tail = (T, dt, method)
+        if max_workers == 1:
+            for chunk in chunks:
+                out[chunk] = _flip_chunk(*params, flat1[chunk], flat2[chunk], *tail)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(_flip_chunk, *params, flat1[chunk], flat2[chunk], *tail)
+                    for chunk in chunks
+                ]
+                for chunk, future in zip(chunks, futures):
+                    out[chunk] = future.result()
+
+    return FlipMap(
+        theta1=theta1,
+        theta2=theta2,
+        flip_time=flip_time,
+        T=float(T),
+        dt=float(dt),
+        L1=float(L1),
+        L2=float(L2),
+        g=float(g),
+    )
+
+
+def plot_flip_map(result: FlipMap, filename: Optional[str] = None) -> None:
+    """
+    Plots log10 of the flip times over the (θ1, θ2) grid. Initial
+    conditions that did not flip before T are left blank.
+
+    Parameters:
+    result: FlipMap
+        Output of flip_map().
+    filename: str or None, Optional
+        If provided, plot saved to filename
+
+    Returns
+        None
+    """
+    extent = (result.theta1[0], result.theta1[-1], result.theta2[0], result.theta2[-1])
+    plt.figure()
+    plt.imshow(np.log10(result.flip_time), origin="lower", extent=extent)
+    plt.colorbar(label="log10(flip time [s])")
+    plt.xlabel("θ1 [rad]")
+    plt.ylabel("θ2 [rad]")
+    plt.title("Double Pendulum Flip Time")
+
+    if filename:
+        plt.savefig(filename, dpi=150, bbox_inches="tight")
+        plt.close()
+    else:
+        plt.show()
+
+
+if __name__ == "__main__":
+    import time
+
+    angles = np.linspace(-3.0, 3.0, 200)
+    start = time.perf_counter()
+    result = flip_map(angles, angles, T=10.0, dt=0.01)
+    elapsed = time.perf_counter() - start
+    print(f"{angles.size}x{angles.size} grid in {elapsed:.2f} s")
+    print(f"Flipped before T: {result.flipped.mean():.1%}")
+    plot_flip_map(result, filename="flip_map.png")
@@ -0,0 +1,171 @@
+"""
+kernels.py
+==========
+
+This module provides the optional compiled backend of the ODE framework.
+Every right-hand side in this project is a Python method, and solve_ivp
+calls it once per stage of every step, so for small systems most of the
+solve time is spent in the interpreter. With numba installed, a model can
+expose its RHS as a nopython-compilable "kernel", and the fixed-step
+Runge-Kutta methods ("rk4", "dopri5") then run the whole integration loop
+as machine code.
+
+Kernel contract:
+    kernel(t, u, params, out) -> None
+        t:      float, the time.
+        u:      1D float array, the state (num_states,).
+        params: 1D float array with the model parameters, from
+                ODEModel.kernel_params().
+        out:    1D float array (num_states,), du/dt is written into it.
+    Kernels only use scalar math (the math module) and indexing, so they
+    compile in numba's nopython mode and also run as plain Python.
+
+Contents:
+- NUMBA_AVAILABLE:
+    True if numba could be imported.
+- njit(func):
+    Compiles func with numba.njit, or returns it unchanged when numba is
+    missing. Models decorate their kernels with it.
+- integrate_fixed_step(kernel, params, u0, t_eval, A, b, c):
+    Fixed-step explicit Runge-Kutta loop (Butcher tableau A, b, c) for one
+    initial condition (u0 shape (num_states,)) or a batch of them
+    (u0 shape (num_states, K)).
+
+Design Notes:
+- numba is an optional dependency. ODEModel.solve() only uses the compiled
+  loop when NUMBA_AVAILABLE is True and the model has a kernel; otherwise
+  it falls back to the NumPy engine in ode.py automatically, with the same
+  results up to rounding.
+- The loop receives the kernel as an argument, so it is compiled once
+  per kernel (on the first solve) and reused afterwards.
+
+Dependencies:
+- numpy
+- numba (optional)
+"""
+
+import numpy as np
+from typing import Any, Callable
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(func: Callable) -> Callable:
+    """
+    Compiles func in nopython mode if numba is installed.
+
+    Without numba the function is returned unchanged, so kernels stay
+    usable (and testable) as plain Python functions.
+
+    Returns
+        Callable
+    """
+    if NUMBA_AVAILABLE:
+        return numba.njit(func)
+    return func
+
+
+@njit
+def _rk_member(
+    kernel: Any,
+    params: np.ndarray,
+    t_eval: np.ndarray,
+    A: np.ndarray,
+    b: np.ndarray,
+    c: np.ndarray,
+    y: np.ndarray,
+) -> None:
+    """
+    Integrates one member in place. y has shape (num_states, len(t_eval))
+    and y[:, 0] holds the initial state.
+    """
+    num_states = y.shape[0]
+    num_stages = b.shape[0]
+    k = np.empty((num_stages, num_states))
+    stage_state = np.empty(num_states)
+    h = t_eval[1] - t_eval[0]
+
+    for n in range(t_eval.shape[0] - 1):
+        t = t_eval[n]
+        for s in range(num_stages):
+            for i in range(num_states):
+                acc = y[i, n]
+                for j in range(s):
+                    acc += h * A[s, j] * k[j, i]
+                stage_state[i] = acc
+            kernel(t + c[s] * h, stage_state, params, k[s])
+        for i in range(num_states):
+            acc = y[i, n]
+            for s in range(num_stages):
+                acc += h * b[s] * k[s, i]
+            y[i, n + 1] = acc
+
+
+@njit
+def _rk_batch(
+    kernel: Any,
+    params: np.ndarray,
+    t_eval: np.ndarray,
+    A: np.ndarray,
+    b: np.ndarray,
+    c: np.ndarray,
+    y: np.ndarray,
+) -> None:
+    """
+    Integrates every member of a batch in place. y has shape
+    (num_states, K, len(t_eval)) and y[:, :, 0] holds the initial states.
+    """
+    member = np.empty((y.shape[0], y.shape[2]))
+    for m in range(y.shape[1]):
+        member[:, 0] = y[:, m, 0]
+        _rk_member(kernel, params, t_eval, A, b, c, member)
+        y[:, m, :] = member
+
+
+def integrate_fixed_step(
+    kernel: Callable,
+    params: np.ndarray,
+    u0: np.ndarray,
+    t_eval: np.ndarray,
+    A: np.ndarray,
+    b: np.ndarray,
+    c: np.ndarray,
+) -> np.ndarray:
+    """
+    Runs the compiled fixed-step Runge-Kutta loop.
+
+    One step of size dt = t_eval[1] - t_eval[0] is taken per output time,
+    exactly like the NumPy engine in ode.py.
+
+    Parameters:
+    kernel: Callable
+        The model's RHS kernel (see the kernel contract above).
+    params: np.ndarray
+        The model parameters passed to the kernel.
+    u0: np.ndarray
+        Initial state, shape (num_states,) or (num_states, K).
+    t_eval: np.ndarray
+        Equally spaced output times starting at 0.
+    A, b, c: np.ndarray
+        The Butcher tableau of the method.
+
+    Returns
+        np.ndarray - the states, shape u0.shape + (len(t_eval),).
+    """
+    y = np.empty(u0.shape + (len(t_eval),))
+    y[..., 0] = u0
+    if len(t_eval) < 2:
+        return y
+
+    params = np.ascontiguousarray(params, dtype=float)
+    if u0.ndim == 1:
+        _rk_member(kernel, params, t_eval, A, b, c, y)
+    else:
+        _rk_batch(kernel, params, t_eval, A, b, c, y)
+    return y
@@ -0,0 +1,252 @@
+"""
+linear.py
+=========
+
+This module implements linear ODE systems
+    du/dt = A u
+with a constant matrix A of any size, using the ODE framework in 'ode.py'.
+
+Linear systems have the exact solution u(t) = expm(A t) u0. On an equally
+spaced grid the state is advanced from one time point to the next by the
+propagator P = expm(A dt):
+    u(t + dt) = P u(t),
+so after computing P once, every step is a single matrix-vector product,
+or one matrix-matrix product for a batch of initial conditions.
+
+Contents:
+- LinearODEModel:
+    ODEModel for du/dt = A u. Provides:
+        - __call__, rhs_into, jacobian (= A) and a compiled RHS kernel, so
+          all the numerical methods of ODEModel.solve() work as usual.
+        - propagator(dt): the matrix exponential expm(A dt), computed once
+          per (A, dt) and cached across solves and model instances.
+        - exact_solution(t, u0): used by solve(method="exact") and
+          solve_many(method="exact"); steps with the cached propagator on
+          equally spaced times.
+
+Dependencies:
+- numpy
+- scipy.linalg.expm
+- ode.py
+- kernels.py (numba optional)
+
+Run file with:
+    python linear.py
+"""
+
+import functools
+import numpy as np
+from scipy.linalg import expm
+from ode import ODEModel
+from kernels import njit
+
+
+@njit
+def _linear_kernel(
+    t: float, u: np.ndarray, params: np.ndarray, out: np.ndarray
+) -> None:
+    """
+    Compiled RHS kernel, params = A.ravel(): out = A @ u.
+    """
+    n = u.shape[0]
+    for i in range(n):
+        acc = 0.0
+        for j in range(n):
+            acc += params[i * n + j] * u[j]
+        out[i] = acc
+
+
+@functools.lru_cache(maxsize=128)
+def _propagator(A_bytes: bytes, num_states: int, dt: float) -> np.ndarray:
+    """
+    expm(A dt) for the matrix A given by its raw bytes, cached per (A, dt).
+
+    Returns
+        np.ndarray - read-only (num_states, num_states) matrix.
+    """
+    A = np.frombuffer(A_bytes, dtype=float).reshape(num_states, num_states)
+    P = expm(A * dt)
+    P.flags.writeable = False
+    return P
+
+
+class LinearODEModel(ODEModel):
+    """
+    Linear system with constant coefficients:
+        du/dt = A u
+
+    Parameters:
+    A: np.ndarray
+        Square (num_states, num_states) system matrix.
+    """
+
+    # A @ u works column-wise, so u may hold k states: (num_states, k)
+    vectorized = True
+    kernel = staticmethod(_linear_kernel)
+
+    def __init__(self, A: np.ndarray) -> None:
+        """
+        Creates a linear model from its system matrix.
+
+        Parameters:
+        A: np.ndarray
+            Square 2D array.
+
+        Raises:
+            ValueError: If A is not a square 2D array.
+
+        Returns
+            None
+        """
+        A = np.array(A, dtype=float)
+        if A.ndim != 2 or A.shape[0] != A.shape[1] or A.shape[0] == 0:
+            raise ValueError(f"A must be a square 2D array, got shape {A.shape}.")
+        A.flags.writeable = False
+        self._A = A
+
+    @property
+    def A(self) -> np.ndarray:
+        """
+        The (read-only) system matrix.
+
+        Returns
+            np.ndarray
+        """
+        return self._A
+
+    @property
+    def num_states(self) -> int:
+        """
+        Number of state variables, the size of A.
+
+        Returns
+            int
+        """
+        return int(self.A.shape[0])
+
+    def __call__(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        Right-hand side du/dt = A u.
+
+        Parameters:
+        t: float
+            Time (not used, the system is autonomous).
+        u: np.ndarray
+            State, shape (num_states,) or (num_states, k).
+
+        Returns
+            np.ndarray - same shape as u.
+        """
+        return self.A @ u
+
+    def rhs_into(self, t: float, u: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        RHS A u of a single state written into out (see ODEModel.rhs_into),
+        the same product as __call__ without allocating the result.
+
+        Parameters:
+        t: float
+            Time (not used).
+        u: np.ndarray
+            State, shape (num_states,).
+        out: np.ndarray
+            Output buffer, shape (num_states,).
+
+        Returns
+            np.ndarray - out.
+        """
+        return np.matmul(self.A, u, out=out)
+
+    def jacobian(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        The Jacobian of a linear system is A itself.
+
+        Parameters:
+        t: float
+            Time (not used).
+        u: np.ndarray
+            State, shape (num_states,) or (num_states, k).
+
+        Returns
+            np.ndarray - A, or A repeated to (num_states, num_states, k).
+        """
+        A = self.A
+        if np.ndim(u) == 1:
+            return A.copy()
+        return np.repeat(A[..., np.newaxis], np.shape(u)[1], axis=2)
+
+    def kernel_params(self) -> np.ndarray:
+        """
+        Parameters for the compiled kernel: A flattened row by row.
+
+        Returns
+            np.ndarray
+        """
+        return self.A.ravel()
+
+    def propagator(self, dt: float) -> np.ndarray:
+        """
+        The propagator P = expm(A dt), which advances any state by dt:
+        u(t + dt) = P u(t).
+
+        It is computed once per (A, dt) and then reused by every solve,
+        also across model instances with the same A.
+
+        Parameters:
+        dt: float
+            The time step.
+
+        Returns
+            np.ndarray - read-only (num_states, num_states) matrix.
+        """
+        A = np.ascontiguousarray(self.A)
+        return _propagator(A.tobytes(), self.num_states, float(dt))
+
+    def exact_solution(self, t: np.ndarray, u0: np.ndarray) -> np.ndarray:
+        """
+        Exact solution u(t) = expm(A t) u0, used by solve(method="exact").
+
+        On equally spaced times (the grid of solve()) the state is stepped
+        with the cached propagator, one product per time point; a batch
+        u0 of shape (num_states, K) makes every step a matrix-matrix
+        product. Other times fall back to one matrix exponential each.
+
+        Parameters:
+        t: np.ndarray
+            Increasing times.
+        u0: np.ndarray
+            Initial state, shape (num_states,) or (num_states, K).
+
+        Returns
+            np.ndarray - shape u0.shape + (len(t),).
+        """
+        t = np.asarray(t, dtype=float)
+        u0 = np.asarray(u0, dtype=float)
+        # Time-major buffer, so every step writes one contiguous block
+        steps = np.empty((len(t),) + u0.shape)
+        if len(t) == 0:
+            return np.moveaxis(steps, 0, -1)
+
+        dt = t[1] - t[0] if len(t) > 1 else 0.0
+        # np.arange grids carry rounding errors that grow with t, so
+        # compare against the ideal grid with an absolute tolerance
+        grid = t[0] + dt * np.arange(len(t))
+        tol = 1e-9 * max(abs(dt), np.max(np.abs(t)))
+        if dt > 0 and np.allclose(t, grid, rtol=0, atol=tol):
+            steps[0] = u0 if t[0] == 0 else expm(self.A * t[0]) @ u0
+            P = self.propagator(dt)
+            for n in range(len(t) - 1):
+                np.matmul(P, steps[n], out=steps[n + 1])
+        else:
+            for n, t_n in enumerate(t):
+                steps[n] = expm(self.A * t_n) @ u0
+        return np.moveaxis(steps, 0, -1)
+
+
+if __name__ == "__main__":
+    # Harmonic oscillator x'' = -x as a linear system
+    model = LinearODEModel(np.array([[0.0, 1.0], [-1.0, 0.0]]))
+    result = model.solve(u0=np.array([1.0, 0.0]), T=10.0, dt=0.01, method="exact")
+    print(
+        "Max error vs cos(t):", np.max(np.abs(result.solution[0] - np.cos(result.time)))
+    )
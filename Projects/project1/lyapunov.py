@@ -0,0 +1,174 @@
+"""
+lyapunov.py
+===========
+
+This module quantifies chaos in the ODE models of this project by
+estimating their Lyapunov spectrum. The double pendulum is the motivating
+example: it is regular for small swings and chaotic at higher energies,
+and the largest Lyapunov exponent tells the two apart.
+
+Method:
+Alongside the state u(t) we integrate the tangent-linear system
+    dΦ/dt = J(u) Φ,    Φ(0) = I,
+where J is the exact Jacobian of the model. The columns of Φ follow how
+small perturbations grow. They are re-orthonormalised with a QR
+decomposition every few steps (Φ = QR, continue with Φ = Q), and the
+exponents are the time averages of log|diag(R)|, ordered from the largest
+to the smallest.
+
+Everything is batched: K initial conditions are integrated as one
+(num_states + num_states^2, K) array with the fixed-step rk4 engine from
+ode.py, and the QR decompositions of all members are done in one call to
+np.linalg.qr on a (K, num_states, num_states) stack.
+
+Contents:
+- lyapunov_spectrum(model, U0, T, dt=0.01, renorm_every=10, transient=0.0):
+    Lyapunov spectrum of every initial condition in U0, shape
+    (K, num_states).
+- max_lyapunov_map(model, theta1, theta2, T, dt=0.01, renorm_every=10,
+                   transient=0.0):
+    Largest Lyapunov exponent of DoublePendulum over a grid in the
+    (θ1, θ2) plane, released from rest, in one batched run.
+
+Dependencies:
+- numpy
+- ode.py
+
+Run file with:
+    python lyapunov.py
+"""
+
+import numpy as np
+from typing import Any
+from ode import ODEModel, InvalidInitialConditionError, integrate_fixed_step
+
+
+def lyapunov_spectrum(
+    model: ODEModel,
+    U0: np.ndarray,
+    T: float,
+    dt: float = 0.01,
+    renorm_every: int = 10,
+    transient: float = 0.0,
+) -> np.ndarray:
+    """
+    Estimates the Lyapunov spectrum for a batch of initial conditions.
+
+    Parameters:
+    model: ODEModel
+        A vectorized model with an exact jacobian() (e.g. DoublePendulum).
+    U0: np.ndarray
+        Initial conditions, shape (K, num_states).
+    T: float
+        Averaging time. Longer runs give converged exponents; the error of
+        the estimate decays roughly like 1/T.
+    dt: float
+        Step size of the fixed-step rk4 integration.
+    renorm_every: int
+        Number of steps between two QR re-orthonormalisations.
+    transient: float
+        Time integrated first and left out of the average, so the tangent
+        vectors can align with the dominant directions.
+
+    Raises:
+        ValueError: If the model is not vectorized or has no Jacobian, or
+        if T, dt or renorm_every are not positive.
+        InvalidInitialConditionError: If U0 has the wrong shape.
+
+    Returns
+        np.ndarray - exponents, shape (K, num_states), each row ordered
+        from the largest to the smallest.
+    """
+    if not (model.vectorized and model.has_jacobian):
+        raise ValueError(
+            f"{type(model).__name__} needs vectorized = True and an exact jacobian()."
+        )
+    if T <= 0 or dt <= 0 or transient < 0:
+        raise ValueError("T and dt must be positive and transient non-negative.")
+    if renorm_every < 1:
+        raise ValueError("renorm_every must be a positive integer.")
+    if not isinstance(U0, np.ndarray) or U0.ndim != 2:
+        raise InvalidInitialConditionError(
+            "U0 must be a 2D numpy array with shape (K, num_states)."
+        )
+    n, K = model.num_states, U0.shape[0]
+    if U0.shape[1] != n:
+        raise InvalidInitialConditionError(
+            f"U0 has {U0.shape[1]} states per member but model expects {n} states"
+        )
+
+    def tangent_rhs(t: float, Y: np.ndarray) -> np.ndarray:
+        # Y holds the states (n, K) on top of the tangent matrices (n*n, K)
+        u, Phi = Y[:n], Y[n:].reshape(n, n, K)
+        dPhi = np.einsum("ijk,jlk->ilk", model.jacobian(t, u), Phi)
+        return np.concatenate([model(t, u), dPhi.reshape(n * n, K)])
+
+    Y = np.empty((n + n * n, K))
+    Y[:n] = U0.T
+    Y[n:] = np.broadcast_to(np.eye(n).reshape(n * n, 1), (n * n, K))
+
+    interval = renorm_every * dt
+    num_transient = int(round(transient / interval))
+    num_intervals = max(1, int(round(T / interval)))
+    log_growth = np.zeros((K, n))
+    t = 0.0
+    for i in range(num_transient + num_intervals):
+        t_eval = t + dt * np.arange(renorm_every + 1)
+        Y = integrate_fixed_step(tangent_rhs, Y, t_eval, "rk4").y[..., -1]
+        t = t_eval[-1]
+
+        # Batched QR of the (K, n, n) tangent matrices
+        Q, R = np.linalg.qr(np.moveaxis(Y[n:].reshape(n, n, K), -1, 0))
+        if i >= num_transient:
+            log_growth += np.log(np.abs(np.diagonal(R, axis1=1, axis2=2)))
+        Y[n:] = np.moveaxis(Q, 0, -1).reshape(n * n, K)
+
+    exponents = log_growth / (num_intervals * interval)
+    return -np.sort(-exponents, axis=1)
+
+
+def max_lyapunov_map(
+    model: Any,
+    theta1: np.ndarray,
+    theta2: np.ndarray,
+    T: float,
+    dt: float = 0.01,
+    renorm_every: int = 10,
+    transient: float = 0.0,
+) -> np.ndarray:
+    """
+    Largest Lyapunov exponent of a DoublePendulum over the (θ1, θ2) plane.
+
+    Every grid point is released from rest, u0 = [θ1, 0, θ2, 0], and all
+    of them are integrated together by lyapunov_spectrum().
+
+    Parameters:
+    model: DoublePendulum
+        The double pendulum to analyse.
+    theta1, theta2: np.ndarray
+        1D arrays with the initial angles of the two rods.
+    T, dt, renorm_every, transient:
+        As in lyapunov_spectrum().
+
+    Returns
+        np.ndarray - shape (len(theta1), len(theta2)).
+    """
+    theta1, theta2 = np.asarray(theta1, float), np.asarray(theta2, float)
+    T1, T2 = np.meshgrid(theta1, theta2, indexing="ij")
+    U0 = np.zeros((T1.size, 4))
+    U0[:, 0], U0[:, 2] = T1.ravel(), T2.ravel()
+    spectrum = lyapunov_spectrum(model, U0, T, dt, renorm_every, transient)
+    return spectrum[:, 0].reshape(T1.shape)
+
+
+if __name__ == "__main__":
+    from double_pendulum import DoublePendulum
+
+    model = DoublePendulum(L1=1.0, L2=1.0)
+    U0 = np.array([[0.1, 0.0, 0.1, 0.0], [2.0, 0.0, 2.5, 0.0]])
+    spectrum = lyapunov_spectrum(model, U0, T=100.0, dt=0.01)
+    print("Small swing spectrum:", spectrum[0])
+    print("Large swing spectrum:", spectrum[1])
+
+    angles = np.linspace(-np.pi, np.pi, 9)
+    print(max_lyapunov_map(model, angles, angles, T=20.0).round(2))
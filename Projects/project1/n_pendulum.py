@@ -0,0 +1,536 @@
+"""
+n_pendulum.py
+=============
+
+This module defines the 'NPendulum' class, a chain of N point masses
+connected by massless rigid rods and hanging from a fixed pivot. It
+generalises 'DoublePendulum' (N = 2 with unit masses) to chains of tens to
+hundreds of links, using the ODE framework in 'ode.py'.
+
+State vector ordering (interleaved, as in DoublePendulum):
+    u = [θ1, ω1, θ2, ω2, ..., θN, ωN]
+θi is the angle of rod i from the downward vertical, ωi = dθi/dt.
+
+Method:
+The textbook route assembles the dense N x N mass matrix of the Lagrangian,
+    M_ij = l_i l_j cos(θi - θj) * (m_max(i,j) + ... + m_N),
+and solves M dω/dt = f at O(N^3) per RHS call. Here the rod tensions T_i
+are used instead. Differentiating the rod constraints twice and projecting
+on the rod directions gives a symmetric, positive definite tridiagonal
+system for the tensions:
+    (1/m_i + 1/m_{i-1}) T_i - cos(θ_{i+1} - θ_i) / m_i T_{i+1}
+                            - cos(θ_i - θ_{i-1}) / m_{i-1} T_{i-1}
+        = l_i ω_i^2 + [i = 1] g cos(θ1)
+(with 1/m_0 = 0 and T_{N+1} = 0), and projecting on the normals gives
+the angular accelerations from the tensions of the neighbouring rods:
+    l_i dω_i/dt = T_{i+1} sin(θ_{i+1} - θ_i) / m_i
+                + T_{i-1} sin(θ_{i-1} - θ_i) / m_{i-1}
+                - [i = 1] g sin(θ1).
+A tridiagonal system is solved in O(N), so one RHS call costs O(N).
+
+Contents:
+- NPendulumResults (dataclass):
+    Time, solution, rod lengths, masses and g. Per-link Cartesian
+    coordinates, velocities and energies are cached properties with the
+    links on the first axis (shape (N, T), or (N, K, T) for an ensemble);
+    potential_energy, kinetic_energy and total_energy sum over the links,
+    so plot_energy() works unchanged. save(path) / load(path, mmap=True)
+    as for the other results.
+- NPendulum:
+    ODEModel for the N-link chain with the O(N) tension formulation. It is
+    vectorized: a (2N, K) batch solves K tridiagonal systems at once.
+
+Dependencies:
+- numpy
+- scipy.linalg.solveh_banded
+- ode.py
+
+Run file with:
+    python n_pendulum.py
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Final, Optional, Sequence
+from scipy.linalg import solveh_banded
+from ode import (
+    CachedResult,
+    ODEModel,
+    SolveStats,
+    load_result,
+    plot_energy,
+    save_result,
+)
+
+DEFAULT_G: Final[float] = 9.81
+
+
+def _solve_tridiagonal(diag: np.ndarray, off: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Solves K symmetric tridiagonal systems at once (Thomas algorithm),
+    vectorized over the columns.
+
+    Parameters:
+    diag: np.ndarray
+        Diagonals, shape (N,) or (N, K).
+    off: np.ndarray
+        Off-diagonals, shape (N - 1, K).
+    b: np.ndarray
+        Right-hand sides, shape (N, K).
+
+    Returns
+        np.ndarray - solutions, shape (N, K).
+    """
+    n = b.shape[0]
+    diag = np.broadcast_to(diag, b.shape)
+    upper = np.empty_like(off)
+    x = np.empty_like(b)
+    denom = diag[0].copy()
+    x[0] = b[0] / denom
+    for i in range(1, n):
+        upper[i - 1] = off[i - 1] / denom
+        denom = diag[i] - off[i - 1] * upper[i - 1]
+        x[i] = (b[i] - off[i - 1] * x[i - 1]) / denom
+    for i in range(n - 2, -1, -1):
+        x[i] -= upper[i] * x[i + 1]
+    return x
+
+
+@dataclass
+class NPendulumResults(CachedResult):
+    """
+    Container for N-link pendulum simulation output and system parameters.
+
+    Attributes:
+        time (np.ndarray):
+            1D array of time points.
+        solution (np.ndarray):
+            Array of shape (2N, T) with rows [θ1, ω1, ..., θN, ωN], or
+            (2N, K, T) for an ensemble from solve_many().
+        lengths (tuple[float, ...]):
+            Rod lengths l_1, ..., l_N.
+        masses (tuple[float, ...]):
+            Point masses m_1, ..., m_N.
+        g (float):
+            Gravitational acceleration.
+        t_events, y_events (list[np.ndarray] | None):
+            Times and states of the events passed to solve(events=...),
+            None without events.
+        stats (SolveStats | None):
+            Instrumentation of the solve, None unless the model has
+            collect_stats = True. Not stored by save().
+    """
+
+    time: np.ndarray
+    solution: np.ndarray
+    lengths: tuple[float, ...]
+    masses: tuple[float, ...]
+    g: float
+    t_events: Optional[list[np.ndarray]] = None
+    y_events: Optional[list[np.ndarray]] = None
+    stats: Optional[SolveStats] = None
+
+    def __post_init__(self) -> None:
+        # Plain tuples of floats, so save() can write them as JSON
+        self.lengths = tuple(float(l) for l in self.lengths)
+        self.masses = tuple(float(m) for m in self.masses)
+        if len(self.lengths) != len(self.masses):
+            raise ValueError("lengths and masses must have the same number of links.")
+
+    @property
+    def num_links(self) -> int:
+        """
+        Number of links N.
+
+        Returns
+            int
+        """
+        return len(self.lengths)
+
+    @property
+    def num_states(self) -> int:
+        """
+        Number of state variables, 2N.
+
+        Returns
+            int
+        """
+        return int(self.solution.shape[0])
+
+    @property
+    def num_timepoints(self) -> int:
+        """
+        Number of time points.
+
+        Returns
+            int
+        """
+        return int(self.solution.shape[-1])
+
+    def _per_link(self, values: Sequence[float]) -> np.ndarray:
+        """
+        Link parameters shaped to broadcast against theta.
+
+        Returns
+            np.ndarray - shape (N, 1) or (N, 1, 1) for an ensemble.
+        """
+        return np.asarray(values).reshape((-1,) + (1,) * (self.solution.ndim - 1))
+
+    # States
+    @property
+    def theta(self) -> np.ndarray:
+        """
+        Angles of all rods, shape (N, T) (or (N, K, T)).
+
+        Returns
+            np.ndarray
+        """
+        return self.solution[0::2]
+
+    @property
+    def omega(self) -> np.ndarray:
+        """
+        Angular velocities of all rods, shape (N, T) (or (N, K, T)).
+
+        Returns
+            np.ndarray
+        """
+        return self.solution[1::2]
+
+    # Cartesian coordinates
+    @cached_property
+    def x(self) -> np.ndarray:
+        """
+        x of every mass, x_i = l_1 sin θ1 + ... + l_i sin θi.
+
+        Returns
+            np.ndarray
+        """
+        return np.cumsum(self._per_link(self.lengths) * np.sin(self.theta), axis=0)
+
+    @cached_property
+    def y(self) -> np.ndarray:
+        """
+        y of every mass, y_i = -(l_1 cos θ1 + ... + l_i cos θi).
+
+        Returns
+            np.ndarray
+        """
+        return -np.cumsum(self._per_link(self.lengths) * np.cos(self.theta), axis=0)
+
+    @cached_property
+    def vx(self) -> np.ndarray:
+        """
+        Exact x velocity of every mass, vx_i = sum_{j<=i} l_j ω_j cos θj.
+
+        Returns
+            np.ndarray
+        """
+        L = self._per_link(self.lengths)
+        return np.cumsum(L * self.omega * np.cos(self.theta), axis=0)
+
+    @cached_property
+    def vy(self) -> np.ndarray:
+        """
+        Exact y velocity of every mass, vy_i = sum_{j<=i} l_j ω_j sin θj.
+
+        Returns
+            np.ndarray
+        """
+        L = self._per_link(self.lengths)
+        return np.cumsum(L * self.omega * np.sin(self.theta), axis=0)
+
+    # Energy
+    @cached_property
+    def link_potential_energy(self) -> np.ndarray:
+        """
+        Potential energy of every mass, m_i g (y_i + l_1 + ... + l_i),
+        zero when the chain hangs straight down (as in DoublePendulum).
+
+        Returns
+            np.ndarray
+        """
+        lowest = self._per_link(np.cumsum(self.lengths))
+        return self._per_link(self.masses) * self.g * (self.y + lowest)
+
+    @cached_property
+    def link_kinetic_energy(self) -> np.ndarray:
+        """
+        Kinetic energy of every mass, 0.5 m_i (vx_i^2 + vy_i^2).
+
+        Returns
+            np.ndarray
+        """
+        return 0.5 * self._per_link(self.masses) * (self.vx**2 + self.vy**2)
+
+    @cached_property
+    def potential_energy(self) -> np.ndarray:
+        """
+        Total potential energy of the chain.
+
+        Returns
+            np.ndarray
+        """
+        return self.link_potential_energy.sum(axis=0)
+
+    @cached_property
+    def kinetic_energy(self) -> np.ndarray:
+        """
+        Total kinetic energy of the chain.
+
+        Returns
+            np.ndarray
+        """
+        return self.link_kinetic_energy.sum(axis=0)
+
+    @cached_property
+    def total_energy(self) -> np.ndarray:
+        """
+        Total energy = Kinetic energy + potential energy.
+
+        Returns
+            np.ndarray
+        """
+        return self.kinetic_energy + self.potential_energy
+
+    def save(self, path: str) -> None:
+        """
+        Stores the result in the directory path, see ode.save_result().
+
+        Parameters:
+        path: str
+            Target directory.
+
+        Returns
+            None
+        """
+        save_result(self, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "NPendulumResults":
+        """
+        Opens a result stored with save(), memory-mapped by default.
+
+        Parameters:
+        path: str
+            Directory written by save().
+        mmap: bool, optional
+            Memory-map the arrays instead of reading them.
+
+        Returns
+            NPendulumResults
+        """
+        return load_result(cls, path, mmap)
+
+
+class NPendulum(ODEModel):
+    """
+    Chain of N point masses on massless rigid rods:
+        u = [θ1, ω1, ..., θN, ωN],
+    with the O(N) tension formulation described in the module docstring.
+
+    NPendulum([L1, L2], [1, 1], g) is the same system as
+    DoublePendulum(L1=L1, L2=L2, g=g).
+    """
+
+    # All link arrays are rows of u, so a (2N, k) batch works unchanged
+    vectorized = True
+
+    def __init__(
+        self,
+        lengths: Sequence[float],
+        masses: Optional[Sequence[float]] = None,
+        g: float = DEFAULT_G,
+    ) -> None:
+        """
+        Parameters:
+        lengths: Sequence[float]
+            Rod lengths in meter, from the pivot down. All must be > 0.
+        masses: Sequence[float] | None
+            Point masses in kg at the ends of the rods (default all 1).
+            All must be > 0.
+        g: float
+            Gravitational acceleration in m/s^2. Must be >= 0.
+
+        Raises:
+            ValueError: If the lengths or masses are empty, not positive or
+            of different sizes, or if g is negative.
+
+        Returns
+            None
+        """
+        lengths = np.array(lengths, dtype=float).ravel()
+        masses = np.ones_like(lengths) if masses is None else np.array(masses, float)
+        if lengths.size == 0 or masses.shape != lengths.shape:
+            raise ValueError("lengths and masses must be non-empty and of equal size.")
+        if np.any(lengths <= 0) or np.any(masses <= 0):
+            raise ValueError("lengths and masses must be positive.")
+        if g < 0:
+            raise ValueError("g must be positive.")
+
+        lengths.flags.writeable = False
+        masses.flags.writeable = False
+        self._lengths = lengths
+        self._masses = masses
+        self._g = float(g)
+
+        # The diagonal of the tension system does not depend on the state
+        inv_m = 1.0 / masses
+        self._inv_m = inv_m
+        self._diag = inv_m.copy()
+        self._diag[1:] += inv_m[:-1]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """
+        Rod lengths in meter (read-only).
+
+        Returns
+            np.ndarray
+        """
+        return self._lengths
+
+    @property
+    def masses(self) -> np.ndarray:
+        """
+        Point masses in kg (read-only).
+
+        Returns
+            np.ndarray
+        """
+        return self._masses
+
+    @property
+    def g(self) -> float:
+        """
+        Gravitational acceleration (m/s^2).
+
+        Returns
+            float
+        """
+        return self._g
+
+    @property
+    def num_links(self) -> int:
+        """
+        Number of links N.
+
+        Returns
+            int
+        """
+        return int(self._lengths.size)
+
+    @property
+    def num_states(self) -> int:
+        """
+        Two state variables per link.
+
+        Returns
+            int
+        """
+        return 2 * self.num_links
+
+    def tensions(self, u: np.ndarray) -> np.ndarray:
+        """
+        Rod tensions T_1, ..., T_N of the state(s) u, from the tridiagonal
+        system in the module docstring.
+
+        Parameters:
+        u: np.ndarray
+            State, shape (2N,) or (2N, k).
+
+        Returns
+            np.ndarray - shape (N,) or (N, k).
+        """
+        theta, omega = u[0::2], u[1::2]
+        column = (slice(None),) + (np.newaxis,) * (u.ndim - 1)
+        lengths, inv_m = self._lengths[column], self._inv_m[column]
+
+        b = lengths * omega * omega
+        b[0] += self._g * np.cos(theta[0])
+        if self.num_links == 1:
+            return b / inv_m
+        off = -np.cos(np.diff(theta, axis=0)) * inv_m[:-1]
+        if u.ndim == 1:
+            banded = np.empty((2, self.num_links))
+            banded[0, 0] = 0.0
+            banded[0, 1:] = off
+            banded[1] = self._diag
+            return solveh_banded(banded, b, check_finite=False)
+        return _solve_tridiagonal(self._diag[column], off, b)
+
+    def __call__(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        RHS f(t, u) of the N-link chain, O(N) per state.
+
+        Parameters:
+        t: float
+            Time (not used).
+        u: np.ndarray
+            State [θ1, ω1, ..., θN, ωN], shape (2N,) or (2N, k).
+
+        Returns
+            np.ndarray - derivatives [ω1, dω1/dt, ...], same shape as u.
+        """
+        theta, omega = u[0::2], u[1::2]
+        column = (slice(None),) + (np.newaxis,) * (u.ndim - 1)
+        lengths, inv_m = self._lengths[column], self._inv_m[column]
+
+        T = self.tensions(u)
+        # Each rod is pulled by the tensions of its neighbours
+        alpha = np.zeros_like(T)
+        if self.num_links > 1:
+            sin_diff = np.sin(np.diff(theta, axis=0)) * inv_m[:-1]
+            alpha[:-1] += T[1:] * sin_diff
+            alpha[1:] -= T[:-1] * sin_diff
+        alpha[0] -= self._g * np.sin(theta[0])
+
+        du = np.empty(u.shape)
+        du[0::2] = omega
+        du[1::2] = alpha / lengths
+        return du
+
+    def _create_result(self, solution: Any) -> NPendulumResults:
+        """
+        Adapt the solver output to NPendulumResults.
+
+        Parameters:
+        solution: Any
+            Object with t and y, e.g. the result of solve_ivp.
+
+        Raises:
+            AttributeError: If solution has no t or y.
+
+        Returns
+            NPendulumResults
+        """
+        if not hasattr(solution, "t") or not hasattr(solution, "y"):
+            raise AttributeError("Solution object must have t and y attributes.")
+        return NPendulumResults(
+            time=solution.t,
+            solution=solution.y,
+            lengths=tuple(self._lengths),
+            masses=tuple(self._masses),
+            g=self.g,
+            t_events=getattr(solution, "t_events", None),
+            y_events=getattr(solution, "y_events", None),
+            stats=getattr(solution, "stats", None),
+        )
+
+
+if __name__ == "__main__":
+    import time
+
+    N = 100
+    model = NPendulum(lengths=np.full(N, 1.0 / N))
+    u0 = np.zeros(2 * N)
+    u0[0::2] = np.linspace(0.0, np.pi / 2, N)
+
+    start = time.perf_counter()
+    result = model.solve(u0, T=2.0, dt=0.01, method="DOP853")
+    elapsed = time.perf_counter() - start
+    E = result.total_energy
+    print(f"{N} links, 2 s simulated in {elapsed:.2f} s")
+    print("Relative energy drift:", np.max(np.abs(E - E[0])) / abs(E[0]))
+    plot_energy(result, filename="energy_n_pendulum.png")
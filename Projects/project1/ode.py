@@ -11,6 +11,20 @@ Contents:
 - ODEResult (NamedTuple):
     A lightweight container holding the solution time points and state
     values produced by an ODE solver.
+- SolveStats (dataclass):
+    Instrumentation of one solve(): RHS and Jacobian calls and time,
+    solver counters (nfev, njev, nlu), accepted and rejected steps and the
+    solver overhead. Attached to the result as result.stats when the model
+    has collect_stats = True.
+- DenseResult:
+    Lazy result of solve(..., dense_output=True). Keeps the solver's
+    interpolant instead of a t_eval grid and evaluates the model's result
+    object (coordinates, energies) at arbitrary times with at(), or on a
+    full grid with materialize().
+- CachedResult:
+    Mixin for the result dataclasses. Their derived quantities (coordinates,
+    velocities, energies) are cached properties, computed once and cleared
+    whenever time, solution or a parameter is reassigned.
 - InvalidInitialConditionError:
     Custom exception raised when invalid initial conditions are passed
     to an ODE model (wrong type, dimension or length).
@@ -20,12 +34,58 @@ Contents:
     double pendulum) must inherit from this class and implement:
         __call__(t, u): RHS of the ODE system, returning du/dt.
         num_states: Property specifying the number of state variables.
+    solve() integrates a single initial condition, solve_many() integrates
+    a batch of initial conditions (an ensemble) in one vectorized run.
+    iter_solve() yields the trajectory in chunks of the model's result
+    type, so long runs never hold the full (num_states, T/dt) array.
     Concrete subclasses may override _create_result() to return class unique
     result objects (e.g.: coordinates and energies).
-- plot_ode_solution(results, state_labels=None, filename=None):
+    Models whose __call__ also accepts u with shape (num_states, k) set the
+    class attribute vectorized = True, which lets the implicit solvers
+    (Radau, BDF) evaluate all Jacobian columns in one call.
+    Models with a closed-form Jacobian override jacobian(t, u); solve()
+    forwards it to Radau, BDF and LSODA instead of finite differences.
+    Models with a closed-form solution override exact_solution(t, u0),
+    which solve(method="exact") evaluates on the whole grid at once.
+    Setting the class attribute solve_cache to a cache.SolveCache makes
+    repeated identical solves return the stored trajectory (opt-in).
+- Symplectic integrators ("verlet", "yoshida4"):
+    Fixed-step Störmer-Verlet and its 4th order Yoshida composition,
+    selected through ODEModel.solve(method=...) for Hamiltonian models
+    (Pendulum, DoublePendulum). They keep the energy error bounded over
+    very long runs.
+- Fixed-step Runge-Kutta engine ("rk4", "dopri5"):
+    Writes straight into a preallocated output buffer without per-step
+    allocations or step-size control. It takes one step per output time,
+    so its cost grows with T/dt and not with the tolerances: in plain
+    NumPy an adaptive solve_ivp method at its default tolerances usually
+    needs far fewer RHS calls on a fine grid and is faster. Models with a
+    numba kernel run the same methods as a compiled loop (kernels.py),
+    which is where the engine beats solve_ivp.
+    integrate_fixed_step(fun, u0, t_eval, method, fun_into=None) is the
+    public entry point of the NumPy engine, for any RHS (e.g. the tangent
+    system in lyapunov.py), not only ODEModel instances.
+    integrate_until(fun, U0, t_eval, stop, method="rk4") steps a batch
+    with the same FixedStepper and drops every member as soon as stop()
+    holds for it (used by flip_map.py).
+- time_grid(T, dt):
+    The output grid 0, dt, ..., T shared by solve(), solve_many(),
+    iter_solve() and sweep.py. T must be an integer multiple of dt.
+- make_event(func, terminal=False, direction=0.0):
+    Marks an event function for solve(events=...), whose zero crossings
+    are located on the solver's interpolant and returned in the t_events
+    and y_events fields of the result.
+- save_result(result, path) / load_result(cls, path, mmap=True):
+    Store a result dataclass as time.npy, solution.npy and params.json in
+    a directory, and open it again, memory-mapped by default. Used by the
+    save() and load() methods of PendulumResults and DoublePendulumResults.
+- downsample_minmax(t, y, max_points):
+    Min/max decimation of a curve to a bounded number of points, used by
+    the plotting functions so huge trajectories render quickly.
+- plot_ode_solution(results, state_labels=None, filename=None, max_points=4000):
     Generic plotting function for visualizing state over time.
     Works for any ODEResult-like object (e.g: PendulumResults and DoublePendulumResults).
-- plot_energy(results, filename=None):
+- plot_energy(results, filename=None, max_points=4000):
     Generic energy plotting function that works with both
     PendulumResults and DoublePendulumResults (duck typing). It only
     relies these attributes, being provided:
@@ -57,9 +117,102 @@ Run file with:
 
 import numpy as np
 import abc
-from typing import NamedTuple, Any, Optional
-from scipy.integrate import solve_ivp
+import dataclasses
+import functools
+import json
+import os
+import time
+from typing import NamedTuple, Any, Callable, Iterator, Optional
+from scipy.integrate import solve_ivp, OdeSolver, RK23, RK45, DOP853, Radau, BDF, LSODA
+from scipy.optimize import OptimizeResult
+from scipy import sparse
 import matplotlib.pyplot as plt
+import kernels
+
+# Implicit solvers in solve_ivp that build a Jacobian of the RHS.
+IMPLICIT_METHODS: tuple[str, ...] = ("Radau", "BDF", "LSODA")
+
+# The stepping classes behind the solve_ivp methods, used by iter_solve().
+IVP_SOLVERS: dict[str, type[OdeSolver]] = {
+    "RK23": RK23,
+    "RK45": RK45,
+    "DOP853": DOP853,
+    "Radau": Radau,
+    "BDF": BDF,
+    "LSODA": LSODA,
+}
+
+# Fixed-step symplectic methods, given as the weights of the Störmer-Verlet
+# sub-steps they are composed of. yoshida4 is Yoshida's (1990) symmetric
+# triple jump, which raises the order from 2 to 4.
+_YOSHIDA_W1 = 1.0 / (2.0 - 2.0 ** (1.0 / 3.0))
+_YOSHIDA_W0 = 1.0 - 2.0 * _YOSHIDA_W1
+SYMPLECTIC_METHODS: dict[str, tuple[float, ...]] = {
+    "verlet": (1.0,),
+    "yoshida4": (_YOSHIDA_W1, _YOSHIDA_W0, _YOSHIDA_W1),
+}
+
+
+# How the result classes compute Cartesian velocities and kinetic energy:
+# in closed form from the angles and angular velocities in the state, or by
+# finite differences of the positions over time (np.gradient).
+VELOCITY_METHODS: tuple[str, ...] = ("exact", "gradient")
+
+
+class ButcherTableau(NamedTuple):
+    """Coefficients of an explicit Runge-Kutta method.
+
+    Args:
+        A (np.ndarray): Stage coefficients, strictly lower triangular (s, s).
+        b (np.ndarray): Weights of the stages in the final update (s,).
+        c (np.ndarray): Time fractions of the stages within a step (s,).
+    """
+
+    A: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+
+
+# Fixed-step explicit Runge-Kutta methods run by the in-house engine.
+# dopri5 is the 5th order Dormand-Prince solution used by RK45, stepped with
+# a constant dt (its 7th, error-estimate-only stage is dropped).
+FIXED_STEP_METHODS: dict[str, ButcherTableau] = {
+    "rk4": ButcherTableau(
+        A=np.array(
+            [
+                [0.0, 0.0, 0.0, 0.0],
+                [0.5, 0.0, 0.0, 0.0],
+                [0.0, 0.5, 0.0, 0.0],
+                [0.0, 0.0, 1.0, 0.0],
+            ]
+        ),
+        b=np.array([1 / 6, 1 / 3, 1 / 3, 1 / 6]),
+        c=np.array([0.0, 0.5, 0.5, 1.0]),
+    ),
+    "dopri5": ButcherTableau(
+        A=np.array(
+            [
+                [0, 0, 0, 0, 0, 0],
+                [1 / 5, 0, 0, 0, 0, 0],
+                [3 / 40, 9 / 40, 0, 0, 0, 0],
+                [44 / 45, -56 / 15, 32 / 9, 0, 0, 0],
+                [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0, 0],
+                [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656, 0],
+            ]
+        ),
+        b=np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]),
+        c=np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1]),
+    ),
+}
+
+
+# Methods that only produce the fixed output grid: no interpolant for dense
+# output and no event location. "exact" uses the model's exact_solution().
+GRID_METHODS: tuple[str, ...] = (
+    *SYMPLECTIC_METHODS,
+    *FIXED_STEP_METHODS,
+    "exact",
+)
 
 
 class ODEResult(NamedTuple):
@@ -68,10 +221,18 @@ class ODEResult(NamedTuple):
     Args:
         time (np.ndarray): The time steps solved for
         solution (np.ndarray): The solution of the problem at the given times.
+        t_events (list[np.ndarray] | None): Times of each event passed to
+            solve(events=...), None without events.
+        y_events (list[np.ndarray] | None): States at these times.
+        stats (SolveStats | None): Instrumentation of the solve, None
+            unless the model has collect_stats = True.
     """
 
     time: np.ndarray
     solution: np.ndarray
+    t_events: Optional[list[np.ndarray]] = None
+    y_events: Optional[list[np.ndarray]] = None
+    stats: Optional["SolveStats"] = None
 
     @property
     def num_states(self) -> int:
@@ -91,7 +252,249 @@ class ODEResult(NamedTuple):
         Returns
             int
         """
-        return int(self.solution.shape[1])
+        return int(self.solution.shape[-1])
+
+
+@dataclasses.dataclass
+class SolveStats:
+    """Where the time of one solve() went.
+
+    Args:
+        method (str): The solver method.
+        nfev (int): RHS evaluations counted by the solver (solve_ivp's nfev,
+            or stages times steps for the fixed-step methods).
+        njev (int): Jacobian evaluations counted by the solver, including
+            finite-difference Jacobians.
+        nlu (int): LU decompositions of the implicit solvers.
+        rhs_calls (int): Calls of the model's RHS, including the columns of
+            finite-difference Jacobians (a vectorized call counts once).
+            0 when a compiled kernel does the work.
+        rhs_time (float): Cumulative time spent in these calls [s].
+        jac_calls (int): Calls of the model's exact jacobian().
+        jac_time (float): Cumulative time spent in these calls [s].
+        accepted_steps (int | None): Steps taken by the solver.
+        rejected_steps (int | None): Step attempts rejected by the error
+            control, None where the solver does not expose them (Radau,
+            BDF, LSODA).
+        total_time (float): Wall time of the whole solve [s].
+    """
+
+    method: str
+    nfev: int
+    njev: int
+    nlu: int
+    rhs_calls: int
+    rhs_time: float
+    jac_calls: int
+    jac_time: float
+    accepted_steps: Optional[int]
+    rejected_steps: Optional[int]
+    total_time: float
+
+    @property
+    def rhs_time_per_call(self) -> float:
+        """
+        Average time of one RHS call [s], nan without calls.
+
+        Returns
+            float
+        """
+        return self.rhs_time / self.rhs_calls if self.rhs_calls else float("nan")
+
+    @property
+    def overhead_time(self) -> float:
+        """
+        Time spent outside the RHS and the Jacobian: step-size control,
+        linear algebra, interpolation and bookkeeping [s].
+
+        Returns
+            float
+        """
+        return self.total_time - self.rhs_time - self.jac_time
+
+    @property
+    def overhead_fraction(self) -> float:
+        """
+        Share of the total time spent outside the RHS and the Jacobian.
+
+        Returns
+            float
+        """
+        return self.overhead_time / self.total_time if self.total_time else 0.0
+
+
+class DenseResult:
+    """
+    Lazy result of solve(..., dense_output=True).
+
+    Instead of the solution on the full t_eval grid it keeps the solver's
+    continuous interpolant (scipy's OdeSolution), whose memory only grows
+    with the number of adaptive steps. States, coordinates and energies
+    are evaluated on demand at arbitrary times through at(), and a full
+    grid is only built when materialize() is called.
+
+    Parameters:
+    model: ODEModel
+        The model that was solved, used to build the result objects.
+    interpolant: Callable
+        Continuous solution, interpolant(t) returns the flat state for
+        scalar t or an array of shape (flat_states, len(t)).
+    T: float
+        End time of the integration, the interpolant covers [0, T].
+    dt: float
+        Default grid spacing for materialize().
+    state_shape: tuple[int, ...]
+        Shape of one state, (num_states,) or (num_states, K) for an
+        ensemble from solve_many().
+    t_events, y_events: list[np.ndarray] | None
+        Times and states of the events passed to solve(events=...).
+    stats: SolveStats | None
+        Instrumentation of the solve, see ODEModel.collect_stats.
+    """
+
+    def __init__(
+        self,
+        model: "ODEModel",
+        interpolant: Callable,
+        T: float,
+        dt: float,
+        state_shape: tuple[int, ...],
+        t_events: Optional[list[np.ndarray]] = None,
+        y_events: Optional[list[np.ndarray]] = None,
+        stats: Optional[SolveStats] = None,
+    ) -> None:
+        self.model = model
+        self.interpolant = interpolant
+        self.T = float(T)
+        self.dt = float(dt)
+        self.state_shape = state_shape
+        self.t_events = t_events
+        self.y_events = y_events
+        self.stats = stats
+
+    @property
+    def num_states(self) -> int:
+        """
+        Number of state variables.
+
+        Returns
+            int
+        """
+        return int(self.state_shape[0])
+
+    @property
+    def num_steps(self) -> int:
+        """
+        Number of solver steps stored in the interpolant.
+
+        Returns
+            int
+        """
+        return len(getattr(self.interpolant, "interpolants", ()))
+
+    def __call__(self, t: Any) -> np.ndarray:
+        """
+        Evaluates the state at time(s) t.
+
+        Parameters:
+        t: float | array_like
+            Times in [0, T].
+
+        Raises:
+            ValueError: If a time lies outside the solved interval.
+
+        Returns
+            np.ndarray - shape state_shape, or state_shape + (len(t),).
+        """
+        t = np.asarray(t, dtype=float)
+        # np.arange(0, T + dt, dt) may overshoot T by rounding
+        tol = 1e-9 * max(1.0, self.T)
+        if t.size and (t.min() < -tol or t.max() > self.T + tol):
+            raise ValueError(
+                f"Times must lie within the solved interval [0, {self.T}]."
+            )
+        y = self.interpolant(np.clip(t, 0.0, self.T))
+        return np.reshape(y, self.state_shape + t.shape)
+
+    def at(self, t: Any) -> Any:
+        """
+        Result object of the model (e.g. PendulumResults) at the times t.
+
+        All derived quantities (theta, x, energies, ...) are then computed
+        only for these times.
+
+        Parameters:
+        t: array_like
+            1D increasing times in [0, T].
+
+        Returns
+            Any
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        return self.model._create_result(OptimizeResult(t=t, y=self(t)))
+
+    def materialize(self, dt: Optional[float] = None) -> Any:
+        """
+        Evaluates the solution on the grid np.arange(0, T + dt, dt), the
+        same grid solve() uses without dense output.
+
+        Parameters:
+        dt: float | None, optional
+            Grid spacing, defaults to the dt given to solve().
+
+        Returns
+            Any
+        """
+        dt = self.dt if dt is None else float(dt)
+        if dt <= 0:
+            raise ValueError("dt must be positive.")
+        return self.at(np.arange(0, self.T + dt, dt))
+
+
+class CachedResult:
+    """
+    Mixin for the result dataclasses (PendulumResults, ...) whose derived
+    quantities are functools.cached_property attributes.
+
+    Coordinates, velocities and energies are then computed once, on first
+    access, and reused by everything that reads them afterwards (e.g.
+    total_energy reuses kinetic_energy and potential_energy, and
+    plot_energy touches all three). Assigning any dataclass field (time,
+    solution or a parameter) clears the cache. Changing the arrays in place
+    is not detected, call clear_cache() after doing that.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in self.__dataclass_fields__:
+            self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """
+        Drops all cached derived quantities, they are recomputed on the
+        next access.
+
+        Returns
+            None
+        """
+        for name in _cached_property_names(type(self)):
+            self.__dict__.pop(name, None)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_property_names(cls: type) -> tuple[str, ...]:
+    """
+    Names of the functools.cached_property attributes of cls and its bases.
+
+    Returns
+        tuple[str, ...]
+    """
+    return tuple(
+        name
+        for klass in cls.__mro__
+        for name, attr in vars(klass).items()
+        if isinstance(attr, functools.cached_property)
+    )
 
 
 class InvalidInitialConditionError(RuntimeError):
@@ -107,17 +510,271 @@ class ODEModel(abc.ABC):
     Common interface for all ODE's (ordinary differntial equations).
     Can not be used directly - have to be inherited and it must
     be implemented a solution for a particular type of ODE.
+
+    Class attributes:
+    vectorized: bool
+        True if __call__ accepts u with shape (num_states, k) and returns
+        du/dt with the same shape, one column per state. solve() then
+        passes vectorized=True to the implicit solvers. Default False.
+    hamiltonian: bool
+        True if the model is a Hamiltonian system and implements
+        to_canonical, from_canonical, hamiltonian_dq and hamiltonian_dp.
+        This enables the symplectic methods "verlet" and "yoshida4". The
+        Hamiltonian is only used by the class that defines it and its
+        subclasses that keep its __call__ (see has_hamiltonian).
+    separable: bool
+        True if H(q, p) = T(p) + V(q), i.e. hamiltonian_dq only depends
+        on q and hamiltonian_dp only on p. The symplectic step is then
+        explicit (leapfrog); otherwise it is solved by fixed-point iteration.
+    kernel: Callable | None
+        Optional nopython-compilable version of the RHS, see kernels.py,
+        with the parameters given by kernel_params(). When numba is
+        installed the fixed-step methods ("rk4", "dopri5") run fully
+        compiled with it; otherwise they use the NumPy engine. A kernel
+        is only used by the class that defines it and its subclasses that
+        keep its __call__ (see has_kernel).
+    solve_cache: SolveCache | None
+        Opt-in memoization of solve(), see cache.py. When set (on
+        ODEModel, a subclass or an instance), a solve with the same model
+        class, parameters, u0, T, dt, method and tolerances returns the
+        cached trajectory. Default None (no caching).
+    collect_stats: bool
+        Opt-in instrumentation of solve(). When True, the RHS and the
+        Jacobian are wrapped in timers, the solver's steps are counted and
+        the result gets a SolveStats as result.stats. Default False, which
+        leaves solve() untouched.
     """
 
+    vectorized: bool = False
+    hamiltonian: bool = False
+    separable: bool = False
+    kernel: Optional[Callable] = None
+    solve_cache: Any = None
+    collect_stats: bool = False
+
     @abc.abstractmethod
     def __call__(self, t: float, u: np.ndarray) -> np.ndarray:
         """
         Calculate right side of the diff equation du/dt = f(t, u).
         Must be implemented from classes that inherits, or
         else we will get NotImplementedError.
+
+        u has shape (num_states,), or (num_states, k) if the model
+        declares vectorized = True.
         """
         raise NotImplementedError
 
+    def rhs_into(self, t: float, u: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Writes the RHS f(t, u) of a single state into out and returns out.
+
+        This is the allocation-free RHS protocol used by the solvers: the
+        fixed-step engine passes its stage buffers as out, and solve_ivp
+        gets a wrapper that only allocates the returned vector. Small
+        models override it with a scalar version based on math (unpack u
+        into floats, write every component of out), which skips the
+        temporary numpy scalars and the np.array of __call__ and gives
+        bit-identical results. The default copies __call__. An override is
+        only used by the class that defines it and its subclasses that keep
+        its __call__ (see has_rhs_into).
+
+        Parameters:
+        t: float
+            Time.
+        u: np.ndarray
+            State, shape (num_states,).
+        out: np.ndarray
+            Output buffer, shape (num_states,).
+
+        Returns
+            np.ndarray - out.
+        """
+        out[...] = self(t, u)
+        return out
+
+    @property
+    def has_rhs_into(self) -> bool:
+        """
+        True if the model overrides rhs_into() with a fast version of its
+        own __call__. A subclass that overrides __call__ but inherits
+        rhs_into() falls back to __call__.
+
+        Returns
+            bool
+        """
+        overridden = type(self).rhs_into is not ODEModel.rhs_into
+        return overridden and self._defined_for_rhs("rhs_into")
+
+    def _scalar_rhs(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        RHS handed to solve_ivp for models with their own rhs_into().
+
+        Returns
+            np.ndarray - a new (num_states,) array, solve_ivp keeps it.
+        """
+        return self.rhs_into(t, u, np.empty(u.shape))
+
+    def jacobian(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        Optional exact Jacobian J[i, j] = d f_i / d u_j of the RHS.
+
+        Models that know it in closed form override this method, and the
+        implicit solvers then use it instead of estimating J by finite
+        differences. For u with shape (num_states,) it returns a
+        (num_states, num_states) matrix; vectorized models also accept
+        u with shape (num_states, k) and return shape
+        (num_states, num_states, k).
+
+        Raises:
+            NotImplementedError: If the model has no closed-form Jacobian.
+
+        Returns
+            np.ndarray
+        """
+        raise NotImplementedError
+
+    @property
+    def has_jacobian(self) -> bool:
+        """
+        True if the model overrides jacobian() with the exact Jacobian of
+        its own __call__. A subclass that overrides __call__ but inherits
+        jacobian() falls back to finite differences.
+
+        Returns
+            bool
+        """
+        overridden = type(self).jacobian is not ODEModel.jacobian
+        return overridden and self._defined_for_rhs("jacobian")
+
+    def exact_solution(self, t: np.ndarray, u0: np.ndarray) -> np.ndarray:
+        """
+        Optional closed-form solution u(t) of the initial value problem
+        u(0) = u0, used by solve(method="exact").
+
+        Models that know it override this method and evaluate it for all
+        times in one vectorized expression. u0 has shape (num_states,), or
+        (num_states, K) for a batch from solve_many().
+
+        Raises:
+            NotImplementedError: If the model has no closed-form solution.
+
+        Returns
+            np.ndarray - shape u0.shape + (len(t),).
+        """
+        raise NotImplementedError
+
+    @property
+    def has_exact_solution(self) -> bool:
+        """
+        True if the model overrides exact_solution() with the solution of
+        its own __call__. A subclass that overrides __call__ but inherits
+        exact_solution() has none.
+
+        Returns
+            bool
+        """
+        overridden = type(self).exact_solution is not ODEModel.exact_solution
+        return overridden and self._defined_for_rhs("exact_solution")
+
+    def _defined_for_rhs(self, name: str) -> bool:
+        """
+        True if the attribute name (a fast version of the RHS, e.g. kernel)
+        is defined on the class that defines __call__ or on a subclass of
+        it. A subclass that overrides __call__ then does not pick up the
+        fast version of its parent, which would integrate the parent's
+        equations.
+
+        Parameters:
+        name: str
+            Attribute name, e.g. "kernel" or "rhs_into".
+
+        Returns
+            bool
+        """
+        if name in vars(self):
+            return True
+        mro = type(self).__mro__
+        owner = next(i for i, cls in enumerate(mro) if name in vars(cls))
+        call_owner = next(i for i, cls in enumerate(mro) if "__call__" in vars(cls))
+        return owner <= call_owner
+
+    @property
+    def has_kernel(self) -> bool:
+        """
+        True if the model has a kernel written for its own __call__.
+
+        Returns
+            bool
+        """
+        return self.kernel is not None and self._defined_for_rhs("kernel")
+
+    def kernel_params(self) -> np.ndarray:
+        """
+        The model parameters in the order the kernel expects them.
+
+        Only needed by models that define a kernel.
+
+        Returns
+            np.ndarray
+        """
+        raise NotImplementedError
+
+    def to_canonical(self, u: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Optional: split a state u into canonical coordinates (q, p).
+
+        Only needed by Hamiltonian models (hamiltonian = True), for the
+        symplectic methods of solve(). Works on u with shape (num_states,)
+        or (num_states, k).
+
+        Returns
+            tuple[np.ndarray, np.ndarray]
+        """
+        raise NotImplementedError
+
+    def from_canonical(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        Optional: inverse of to_canonical(), builds the state u from (q, p).
+
+        Returns
+            np.ndarray
+        """
+        raise NotImplementedError
+
+    def hamiltonian_dq(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        Optional: dH/dq of the Hamiltonian H(q, p), so that dp/dt = -dH/dq.
+
+        Returns
+            np.ndarray
+        """
+        raise NotImplementedError
+
+    def hamiltonian_dp(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        Optional: dH/dp of the Hamiltonian H(q, p), so that dq/dt = dH/dp.
+
+        Returns
+            np.ndarray
+        """
+        raise NotImplementedError
+
+    @property
+    def has_hamiltonian(self) -> bool:
+        """
+        True if the model is Hamiltonian and its hamiltonian_dq() and
+        hamiltonian_dp() belong to its own __call__. A subclass that
+        overrides __call__ but inherits them is not Hamiltonian.
+
+        Returns
+            bool
+        """
+        return (
+            self.hamiltonian
+            and self._defined_for_rhs("hamiltonian_dq")
+            and self._defined_for_rhs("hamiltonian_dp")
+        )
+
     @property
     @abc.abstractmethod
     def num_states(self) -> int:
@@ -147,9 +804,162 @@ class ODEModel(abc.ABC):
         """
         if not hasattr(solution, "t") or not hasattr(solution, "y"):
             raise AttributeError("Solution object must have attributes t and y")
-        return ODEResult(time=solution.t, solution=solution.y)
+        return ODEResult(
+            time=solution.t,
+            solution=solution.y,
+            t_events=getattr(solution, "t_events", None),
+            y_events=getattr(solution, "y_events", None),
+            stats=getattr(solution, "stats", None),
+        )
+
+    def _use_vectorized(self, method: str) -> bool:
+        """
+        Whether solve_ivp should call the RHS with (num_states, k) arrays.
+
+        Only the implicit methods benefit (they evaluate the columns of the
+        finite-difference Jacobian in one call); the explicit methods would
+        just pay for an extra reshape on every step.
+
+        Returns
+            bool
+        """
+        return self.vectorized and method in IMPLICIT_METHODS
+
+    def _vectorized_rhs(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        RHS handed to solve_ivp when vectorized=True.
+
+        solve_ivp then calls the RHS with shape (num_states, 1) for every
+        ordinary step and with (num_states, k) only for the Jacobian.
+        Numpy is much slower on (n, 1) arrays than on a flat vector, so the
+        single-column case is unwrapped to keep ordinary steps as cheap as
+        in the non-vectorized path.
+
+        Returns
+            np.ndarray
+        """
+        if u.shape[1] == 1:
+            if self.has_rhs_into:
+                out = np.empty(u.shape)
+                self.rhs_into(t, u[:, 0], out[:, 0])
+                return out
+            return self(t, u[:, 0])[:, np.newaxis]
+        return self(t, u)
+
+    def _check_inputs(self, u0: np.ndarray, T: float, dt: float) -> None:
+        """
+        Validates the arguments shared by solve() and iter_solve().
+
+        Raises:
+            ValueError: If T is negative, dt is not positive or T is not an
+            integer multiple of dt.
+            InvalidInitialConditionError: If u0 is not a 1D numpy array
+            with num_states entries.
+
+        Returns
+            None
+        """
+        if T < 0:
+            raise ValueError("T must be positive.")
+        if dt <= 0:
+            raise ValueError("dt must be positive.")
+        _num_steps(T, dt)
+        if not isinstance(u0, np.ndarray):
+            raise InvalidInitialConditionError("u0 must be a numpy.ndarray")
+        if u0.ndim != 1:
+            raise InvalidInitialConditionError("u0 must be a 1D numpy array.")
+        if len(u0) != self.num_states:
+            raise InvalidInitialConditionError(
+                f"u0 has length {len(u0)} but model expects {self.num_states} states"
+            )
+
+    def _ivp_options(self, method: str) -> tuple[Callable, dict[str, Any]]:
+        """
+        The RHS and keyword options for a solve_ivp method: the vectorized
+        wrapper and the exact Jacobian where they help.
+
+        Returns
+            tuple[Callable, dict[str, Any]]
+        """
+        vectorized = self._use_vectorized(method)
+        options: dict[str, Any] = {"vectorized": vectorized}
+        if method in IMPLICIT_METHODS and self.has_jacobian:
+            options["jac"] = self.jacobian
+        if vectorized:
+            return self._vectorized_rhs, options
+        return (self._scalar_rhs if self.has_rhs_into else self), options
+
+    def _solve_exact(self, u0: np.ndarray, t_eval: np.ndarray) -> OptimizeResult:
+        """
+        Fills the output grid from exact_solution() (method="exact").
+
+        Raises:
+            ValueError: If the model has no exact solution.
+
+        Returns
+            OptimizeResult
+        """
+        if not self.has_exact_solution:
+            raise ValueError(
+                f"Method 'exact' needs a closed-form solution, "
+                f"{type(self).__name__} does not provide exact_solution()."
+            )
+        return OptimizeResult(
+            t=t_eval,
+            y=self.exact_solution(t_eval, np.asarray(u0, dtype=float)),
+            nfev=0,
+            success=True,
+            status=0,
+            message="Evaluated the exact solution.",
+        )
+
+    def _solve_fixed_step(
+        self,
+        fun: Callable,
+        u0: np.ndarray,
+        t_eval: np.ndarray,
+        method: str,
+        fun_into: Optional[Callable] = None,
+    ) -> OptimizeResult:
+        """
+        Runs a fixed-step Runge-Kutta method, compiled if possible.
+
+        With numba installed and a kernel for the model's own RHS
+        (has_kernel), the whole loop runs in kernels.integrate_fixed_step.
+        Otherwise the NumPy engine integrate_fixed_step() is used with fun
+        as the RHS, or with fun_into(t, u, out) writing into the stage
+        buffers if given.
+
+        Returns
+            OptimizeResult
+        """
+        if not self.has_kernel or not kernels.NUMBA_AVAILABLE:
+            return integrate_fixed_step(fun, u0, t_eval, method, fun_into)
 
-    def solve(self, u0: np.ndarray, T: float, dt: float, method: str = "RK45") -> Any:
+        tableau = FIXED_STEP_METHODS[method]
+        y = kernels.integrate_fixed_step(
+            self.kernel, self.kernel_params(), u0, t_eval, *tableau
+        )
+        return OptimizeResult(
+            t=t_eval,
+            y=y,
+            nfev=len(tableau.b) * (len(t_eval) - 1),
+            success=True,
+            status=0,
+            message="Integration finished.",
+        )
+
+    def solve(
+        self,
+        u0: np.ndarray,
+        T: float,
+        dt: float,
+        method: str = "RK45",
+        dense_output: bool = False,
+        events: Any = None,
+        rtol: float = 1e-3,
+        atol: float = 1e-6,
+    ) -> Any:
         """
         solve() works out how the systen develops over time.
 
@@ -161,13 +971,310 @@ class ODEModel(abc.ABC):
         dt:
             How often we want results (time steps).
         method:
-            Which numerical method to use (Default is RK45).
+            Which numerical method to use (Default is RK45). Any solve_ivp
+            method, or one of the fixed-step symplectic methods "verlet"
+            (Störmer-Verlet, order 2) and "yoshida4" (order 4) for
+            Hamiltonian models. The symplectic methods step exactly with dt
+            and keep the energy error bounded over very long runs.
+            "rk4" and "dopri5" are fixed-step explicit Runge-Kutta methods
+            (one step of size dt per output time) run by an in-house
+            engine. Their cost grows with T/dt: without numba an adaptive
+            method at default tolerances is usually faster for a small dt,
+            and they pay off when they run compiled (numba installed and
+            the model has a kernel) or when every output time should be a
+            step of known order.
+            "exact" evaluates the model's closed-form exact_solution() on
+            the grid, without integrating.
+        dense_output:
+            If True, no t_eval grid is stored. A DenseResult holding the
+            solver's interpolant is returned instead, which evaluates the
+            solution at arbitrary times on demand (only for the solve_ivp
+            methods). dt is then just the default spacing of
+            DenseResult.materialize().
+        events:
+            Event function event(t, u) or a list of them, passed to
+            solve_ivp (only for the solve_ivp methods). An event happens
+            where the function crosses zero, located by root finding on the
+            solver's interpolant. Set the attribute terminal = True to stop
+            the integration at the first event, and direction (+1 / -1) to
+            only count rising or falling crossings, see make_event(). The
+            times and states of the events are returned in the t_events and
+            y_events fields of the result.
+        rtol, atol:
+            Relative and absolute error tolerances of the adaptive solve_ivp
+            methods (the scipy defaults). Not used by fixed-step methods.
 
         Validates that u0 matches the model's number of states.
 
+        If solve_cache is set, grid solves (no dense output, no events) are
+        looked up in it first and stored in it afterwards; cached results
+        have read-only time and solution arrays.
+
+        If collect_stats is True, the result carries a SolveStats in its
+        stats field (cache hits have none).
+
         solve() returns the times and the corresponding values of the system,
         so we can inspect or plot how the system changes over time.
 
+        Returns
+            Any
+        """
+        self._check_inputs(u0, T, dt)
+        if dense_output and (method in GRID_METHODS):
+            raise ValueError(f"Method {method!r} does not support dense output.")
+        if events is not None and (method in GRID_METHODS):
+            raise ValueError(f"Method {method!r} does not support events.")
+
+        cache = self.solve_cache
+        if dense_output or events is not None:
+            cache = None
+        if cache is not None:
+            key = cache.key(self, u0, T, dt, method, rtol, atol)
+            cached = cache.get(key)
+            if cached is not None:
+                return self._create_result(cached)
+
+        profiler = _SolveProfiler(method) if self.collect_stats else None
+        t_eval = time_grid(T, dt)
+        if method == "exact":
+            solution = self._solve_exact(u0, t_eval)
+        elif method in SYMPLECTIC_METHODS:
+            solution = _integrate_symplectic(self, u0, t_eval, method)
+        elif method in FIXED_STEP_METHODS:
+            fun, fun_into = self, (self.rhs_into if self.has_rhs_into else None)
+            if profiler is not None and fun_into is not None:
+                fun_into = profiler.wrap(fun_into)
+            elif profiler is not None:
+                fun = profiler.wrap(fun)
+            solution = self._solve_fixed_step(
+                fun, u0.astype(float), t_eval, method, fun_into
+            )
+        else:
+            solution = self._solve_ivp(
+                u0, T, t_eval, method, dense_output, events, rtol, atol, profiler
+            )
+        stats = None if profiler is None else profiler.finish(solution)
+        if dense_output:
+            return DenseResult(
+                self,
+                solution.sol,
+                solution.t[-1],
+                dt,
+                (self.num_states,),
+                t_events=solution.t_events,
+                y_events=solution.y_events,
+                stats=stats,
+            )
+
+        # Failed solves (fewer time points than the grid) are not cached
+        if cache is not None and len(solution.t) == len(t_eval):
+            solution = cache.put(key, solution)
+        if stats is not None:
+            # A shallow copy, so the stats never end up in the cached object
+            solution = OptimizeResult(solution, stats=stats)
+        return self._create_result(solution)
+
+    def _solve_ivp(
+        self,
+        u0: np.ndarray,
+        T: float,
+        t_eval: np.ndarray,
+        method: str,
+        dense_output: bool,
+        events: Any,
+        rtol: float,
+        atol: float,
+        profiler: Optional["_SolveProfiler"] = None,
+    ) -> OptimizeResult:
+        """
+        Runs solve_ivp for solve(), with the model's vectorized RHS and
+        Jacobian where available. With a profiler the RHS and Jacobian are
+        timed and the solver class is replaced by a step-counting subclass.
+
+        Returns
+            OptimizeResult - the solve_ivp result.
+        """
+        fun, options = self._ivp_options(method)
+        solver: Any = method
+        if profiler is not None:
+            fun = profiler.wrap(fun)
+            if "jac" in options:
+                options["jac"] = profiler.wrap_jacobian(options["jac"])
+            if method in IVP_SOLVERS:
+                solver = profiler.solver(IVP_SOLVERS[method])
+        return solve_ivp(
+            fun,
+            (0, T),
+            u0,
+            t_eval=None if dense_output else t_eval,
+            method=solver,
+            dense_output=dense_output,
+            events=events,
+            rtol=rtol,
+            atol=atol,
+            **options,
+        )
+
+    def iter_solve(
+        self,
+        u0: np.ndarray,
+        T: float,
+        dt: float,
+        method: str = "RK45",
+        chunk: int = 10_000,
+        rtol: float = 1e-3,
+        atol: float = 1e-6,
+    ) -> Iterator[Any]:
+        """
+        iter_solve() integrates like solve(), but yields the trajectory in
+        consecutive chunks instead of returning it at once.
+
+        The solver state is carried across chunk boundaries, so only one
+        chunk of shape (num_states, chunk) is in memory at a time and very
+        long runs never need the whole (num_states, T/dt) array. Each chunk
+        is a result object of the model's own type (e.g. PendulumResults),
+        so energies and plotting work on it unchanged.
+
+        Parameters:
+        u0:
+            The starting values or initial conditions.
+        T:
+            How long we want it to simulate.
+        dt:
+            How often we want results (time steps).
+        method:
+            Which numerical method to use, as in solve(). The solve_ivp
+            methods are stepped with scipy's OdeSolver classes and their
+            dense output is evaluated on the grid; the fixed-step methods
+            continue from the last state of the previous chunk.
+        chunk:
+            Number of time points per chunk (the last one may be shorter).
+        rtol, atol:
+            Error tolerances of the solve_ivp methods, as in solve(). Not
+            used by fixed-step methods.
+
+        Together the chunks cover the same grid time_grid(T, dt) as solve(),
+        without overlap.
+
+        Raises:
+            RuntimeError: If the solver fails.
+
+        Returns
+            Iterator[Any]
+        """
+        self._check_inputs(u0, T, dt)
+        if chunk < 1:
+            raise ValueError("chunk must be a positive integer.")
+
+        # Same grid as time_grid(T, dt), built one chunk at a time
+        num_timepoints = _num_steps(T, dt) + 1
+        starts = range(0, num_timepoints, chunk)
+
+        def grid(start: int, stop: int) -> np.ndarray:
+            return np.minimum(dt * np.arange(start, stop), T)
+
+        if method == "exact":
+            for start in starts:
+                t_chunk = grid(start, min(start + chunk, num_timepoints))
+                yield self._create_result(self._solve_exact(u0, t_chunk))
+            return
+        if method in SYMPLECTIC_METHODS or method in FIXED_STEP_METHODS:
+            state = u0.astype(float)
+            fun_into = self.rhs_into if self.has_rhs_into else None
+            for start in starts:
+                stop = min(start + chunk, num_timepoints)
+                # Start each segment at the last point of the previous chunk
+                first = max(start - 1, 0)
+                t_segment = grid(first, stop)
+                if method in SYMPLECTIC_METHODS:
+                    segment = _integrate_symplectic(self, state, t_segment, method)
+                else:
+                    segment = self._solve_fixed_step(
+                        self, state, t_segment, method, fun_into
+                    )
+                state = segment.y[:, -1]
+                yield self._create_result(
+                    OptimizeResult(
+                        t=t_segment[start - first :], y=segment.y[:, start - first :]
+                    )
+                )
+            return
+
+        if method not in IVP_SOLVERS:
+            raise ValueError(
+                f"Unknown method {method!r}, expected one of {sorted(IVP_SOLVERS)}, "
+                f"{sorted(SYMPLECTIC_METHODS)}, {sorted(FIXED_STEP_METHODS)} "
+                "or 'exact'."
+            )
+        fun, options = self._ivp_options(method)
+        solver = IVP_SOLVERS[method](
+            fun, 0.0, u0.astype(float), T, rtol=rtol, atol=atol, **options
+        )
+        for start in starts:
+            t_chunk = grid(start, min(start + chunk, num_timepoints))
+            y = np.empty((self.num_states, len(t_chunk)))
+            _fill_from_solver(solver, t_chunk, y)
+            yield self._create_result(OptimizeResult(t=t_chunk, y=y))
+
+    def solve_many(
+        self,
+        U0: np.ndarray,
+        T: float,
+        dt: float,
+        method: str = "RK45",
+        dense_output: bool = False,
+        events: Any = None,
+        rtol: float = 1e-3,
+        atol: float = 1e-6,
+    ) -> Any:
+        """
+        solve_many() solves the same model for a whole batch (ensemble)
+        of initial conditions at once.
+
+        All members are stacked into one large state vector and integrated
+        together in a single call to solve_ivp, so the right-hand side is
+        evaluated once per step for every member at the same time
+        (__call__ receives u with shape (num_states, K) when the model
+        declares vectorized = True). This removes the per-member Python
+        overhead of calling solve() in a loop.
+
+        Parameters:
+        U0:
+            The starting values, a 2D array with shape (K, num_states),
+            one row per ensemble member.
+        T:
+            How long we want it to simulate.
+        dt:
+            How often we want results (time steps).
+        method:
+            Which numerical method to use (Default is RK45).
+        dense_output:
+            If True, return a DenseResult with the ensemble interpolant
+            instead of the solution on the t_eval grid, see solve().
+        events:
+            Event function event(t, u) or a list of them, as in solve().
+            Each event is evaluated for every member separately, with u of
+            shape (num_states,). The result holds t_events[i][k] and
+            y_events[i][k], the times and (m, num_states) states of event i
+            for member k. A terminal event of any member stops the whole
+            ensemble.
+        rtol, atol:
+            Error tolerances of the adaptive solve_ivp methods, as in
+            solve(). Not used by fixed-step methods.
+
+        The returned result is the same type as from solve(), but the
+        solution has shape (num_states, K, num_timepoints), so e.g.
+        result.theta of a Pendulum ensemble is a (K, num_timepoints) array.
+
+        Note: the adaptive step size is shared by all members. solve_ivp
+        controls it with the RMS norm of the error over the whole stacked
+        state, so the error of a single hard member is diluted by the
+        others (by up to a factor sqrt(K)) and can be larger than in a
+        solve() of that member with the same tolerances. Divide rtol and
+        atol by sqrt(K) to get at least the per-member accuracy of solve().
+        For Radau and BDF the ensemble Jacobian is passed as a sparse
+        block-diagonal matrix, so its size grows linearly with K.
+
         Returns
             Any
         """
@@ -175,24 +1282,762 @@ class ODEModel(abc.ABC):
             raise ValueError("T must be positive.")
         if dt <= 0:
             raise ValueError("dt must be positive.")
-        if not isinstance(u0, np.ndarray):
-            raise InvalidInitialConditionError("u0 must be a numpy.ndarray")
-        if u0.ndim != 1:
-            raise InvalidInitialConditionError("u0 must be a 1D numpy array.")
-        if len(u0) != self.num_states:
+        _num_steps(T, dt)
+        if not isinstance(U0, np.ndarray):
+            raise InvalidInitialConditionError("U0 must be a numpy.ndarray")
+        if U0.ndim != 2:
             raise InvalidInitialConditionError(
-                f"u0 has length {len(u0)} but model expects {self.num_states} states"
+                "U0 must be a 2D numpy array with shape (K, num_states)."
+            )
+        if U0.shape[1] != self.num_states:
+            raise InvalidInitialConditionError(
+                f"U0 has {U0.shape[1]} states per member but model expects "
+                f"{self.num_states} states"
+            )
+
+        if dense_output and (method in GRID_METHODS):
+            raise ValueError(f"Method {method!r} does not support dense output.")
+        if events is not None and (method in GRID_METHODS):
+            raise ValueError(f"Method {method!r} does not support events.")
+
+        num_states, num_members = self.num_states, U0.shape[0]
+
+        def batch_rhs(t: float, u: np.ndarray) -> np.ndarray:
+            # u has shape (num_states, k), one column per member
+            if self.vectorized:
+                return self(t, u)
+            return np.column_stack([self(t, u[:, k]) for k in range(u.shape[1])])
+
+        t_eval = time_grid(T, dt)
+        if method == "exact":
+            return self._create_result(self._solve_exact(U0.T, t_eval))
+        if method in SYMPLECTIC_METHODS:
+            # The symplectic steps work on (num_states, K) arrays directly
+            solution = _integrate_symplectic(self, U0.T.astype(float), t_eval, method)
+            return self._create_result(solution)
+        if method in FIXED_STEP_METHODS:
+            solution = self._solve_fixed_step(
+                batch_rhs, U0.T.astype(float), t_eval, method
             )
+            return self._create_result(solution)
 
-        t_eval = np.arange(0, T + dt, dt)
-        solution = solve_ivp(self, (0, T), u0, t_eval=t_eval, method=method)
+        def ensemble_rhs(t: float, y: np.ndarray) -> np.ndarray:
+            # The flat state is ordered state-major: y = U.ravel() where U
+            # has shape (num_states, K), so one reshape hands every member
+            # (and every column, if solve_ivp passes a 2D y) to the model.
+            return np.reshape(batch_rhs(t, y.reshape(num_states, -1)), y.shape)
+
+        options: dict[str, Any] = {}
+        if method in ("Radau", "BDF"):
+            # Members are independent, so the ensemble Jacobian is block
+            # diagonal. Entry J[i, j, k] of member k sits at row i*K + k and
+            # column j*K + k of the flat system.
+            i, j, k = np.ix_(
+                np.arange(num_states), np.arange(num_states), np.arange(num_members)
+            )
+            blocks = (num_states, num_states, num_members)
+            rows = np.broadcast_to(i * num_members + k, blocks).ravel()
+            cols = np.broadcast_to(j * num_members + k, blocks).ravel()
+            shape = (num_states * num_members,) * 2
+
+            if self.has_jacobian and self.vectorized:
+
+                def ensemble_jac(t: float, y: np.ndarray) -> sparse.csc_matrix:
+                    J = self.jacobian(t, y.reshape(num_states, num_members))
+                    return sparse.csc_matrix((J.ravel(), (rows, cols)), shape=shape)
+
+                options["jac"] = ensemble_jac
+            else:
+                options["jac_sparsity"] = sparse.csc_matrix(
+                    (np.ones(rows.size), (rows, cols)), shape=shape
+                )
+
+        if events is not None:
+            events = list(events) if isinstance(events, (list, tuple)) else [events]
+            options["events"] = [
+                _member_event(event, k, num_members)
+                for event in events
+                for k in range(num_members)
+            ]
+
+        y0 = np.ascontiguousarray(U0.T, dtype=float).ravel()
+        solution = solve_ivp(
+            ensemble_rhs,
+            (0, T),
+            y0,
+            t_eval=None if dense_output else t_eval,
+            method=method,
+            vectorized=self._use_vectorized(method),
+            dense_output=dense_output,
+            rtol=rtol,
+            atol=atol,
+            **options,
+        )
+        if events is not None:
+            # One list per event with one entry per member
+            t_flat, y_flat = solution.t_events, solution.y_events
+            solution.t_events = [
+                t_flat[i * num_members : (i + 1) * num_members]
+                for i in range(len(events))
+            ]
+            solution.y_events = [
+                [
+                    y_flat[i * num_members + k][:, k::num_members]
+                    for k in range(num_members)
+                ]
+                for i in range(len(events))
+            ]
+        if dense_output:
+            return DenseResult(
+                self,
+                solution.sol,
+                solution.t[-1],
+                dt,
+                (num_states, num_members),
+                t_events=solution.t_events,
+                y_events=solution.y_events,
+            )
+        solution.y = solution.y.reshape(num_states, num_members, -1)
         return self._create_result(solution)
 
 
+def _member_event(event: Callable, k: int, num_members: int) -> Callable:
+    """
+    Event of one ensemble member for solve_many(): evaluates event on the
+    state of member k inside the flat, state-major ensemble state, and
+    keeps its terminal and direction attributes.
+
+    Returns
+        Callable
+    """
+
+    def member_event(t: float, y: np.ndarray) -> float:
+        return event(t, y[k::num_members])
+
+    member_event.terminal = getattr(event, "terminal", False)
+    member_event.direction = getattr(event, "direction", 0.0)
+    return member_event
+
+
+class _TimedCall:
+    """
+    Wraps a callable and counts its calls and their cumulative time.
+    """
+
+    def __init__(self, fun: Callable) -> None:
+        self.fun = fun
+        self.calls = 0
+        self.time = 0.0
+
+    def __call__(self, *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.fun(*args)
+        finally:
+            self.time += time.perf_counter() - start
+            self.calls += 1
+
+
+class _SolveProfiler:
+    """
+    Collects the SolveStats of one instrumented solve().
+
+    The RHS and the Jacobian are wrapped in _TimedCall. For the solve_ivp
+    methods, solver() builds a subclass of the OdeSolver that counts the
+    accepted steps, and for the explicit Runge-Kutta solvers also every
+    error estimate (one per step attempt), so rejected = attempts -
+    accepted.
+    """
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+        self.rhs: Optional[_TimedCall] = None
+        self.jac: Optional[_TimedCall] = None
+        self.accepted: Optional[int] = None
+        self.attempts: Optional[int] = None
+        self.start = time.perf_counter()
+
+    def wrap(self, fun: Callable) -> _TimedCall:
+        self.rhs = _TimedCall(fun)
+        return self.rhs
+
+    def wrap_jacobian(self, jac: Any) -> Any:
+        if not callable(jac):
+            return jac
+        self.jac = _TimedCall(jac)
+        return self.jac
+
+    def solver(self, base: type[OdeSolver]) -> type[OdeSolver]:
+        profiler = self
+        self.accepted = 0
+
+        class CountingSolver(base):  # type: ignore[valid-type, misc]
+            def _step_impl(self) -> tuple[bool, Optional[str]]:
+                success, message = super()._step_impl()
+                profiler.accepted += int(success)
+                return success, message
+
+        if hasattr(base, "_estimate_error_norm"):
+            self.attempts = 0
+
+            def _estimate_error_norm(solver: Any, *args: Any) -> float:
+                profiler.attempts += 1
+                return base._estimate_error_norm(solver, *args)
+
+            CountingSolver._estimate_error_norm = _estimate_error_norm
+        CountingSolver.__name__ = base.__name__
+        return CountingSolver
+
+    def finish(self, solution: Any) -> SolveStats:
+        accepted, rejected = self.accepted, None
+        if self.attempts is not None:
+            rejected = self.attempts - self.accepted
+        elif self.method in FIXED_STEP_METHODS or self.method in SYMPLECTIC_METHODS:
+            accepted, rejected = len(solution.t) - 1, 0
+        return SolveStats(
+            method=self.method,
+            nfev=int(getattr(solution, "nfev", 0)),
+            njev=int(getattr(solution, "njev", 0)),
+            nlu=int(getattr(solution, "nlu", 0)),
+            rhs_calls=self.rhs.calls if self.rhs else 0,
+            rhs_time=self.rhs.time if self.rhs else 0.0,
+            jac_calls=self.jac.calls if self.jac else 0,
+            jac_time=self.jac.time if self.jac else 0.0,
+            accepted_steps=accepted,
+            rejected_steps=rejected,
+            total_time=time.perf_counter() - self.start,
+        )
+
+
+def _fill_from_solver(solver: OdeSolver, t_chunk: np.ndarray, y: np.ndarray) -> None:
+    """
+    Advances an OdeSolver until it has passed the times t_chunk and writes
+    the states at these times into y (num_states, len(t_chunk)).
+
+    The states between the solver's steps come from the dense output of
+    the last step, exactly like solve_ivp evaluates t_eval. Times that
+    round past the end of the interval use the last step's interpolant.
+
+    Raises:
+        RuntimeError: If a solver step fails.
+
+    Returns
+        None
+    """
+    i = 0
+    while i < len(t_chunk):
+        if t_chunk[i] > solver.t and solver.status == "running":
+            message = solver.step()
+            if solver.status == "failed":
+                raise RuntimeError(f"Integration failed: {message}")
+            continue
+        if solver.status == "running":
+            j = int(np.searchsorted(t_chunk, solver.t, side="right"))
+        else:
+            j = len(t_chunk)
+        if solver.t_old is None:
+            # No step taken yet, only t = t0 can be requested
+            y[:, i:j] = solver.y[:, np.newaxis]
+        else:
+            y[:, i:j] = solver.dense_output()(t_chunk[i:j])
+        i = j
+
+
+def _stormer_verlet_step(
+    model: ODEModel, q: np.ndarray, p: np.ndarray, h: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    One Störmer-Verlet step of size h for the Hamiltonian of model.
+
+    For separable Hamiltonians this is the explicit leapfrog
+    (kick - drift - kick). Otherwise it is the generalised Störmer-Verlet
+    scheme, whose first two stages are implicit and are solved by
+    fixed-point iteration:
+        p_half = p - h/2 * dH/dq(q, p_half)
+        q_new = q + h/2 * (dH/dp(q, p_half) + dH/dp(q_new, p_half))
+        p_new = p_half - h/2 * dH/dq(q_new, p_half)
+
+    Raises:
+        RuntimeError: If the fixed-point iteration does not converge
+        (dt is too large for the problem).
+
+    Returns
+        tuple[np.ndarray, np.ndarray]: the new (q, p).
+    """
+    half = 0.5 * h
+    if model.separable:
+        p_half = p - half * model.hamiltonian_dq(q, p)
+        q_new = q + h * model.hamiltonian_dp(q, p_half)
+        return q_new, p_half - half * model.hamiltonian_dq(q_new, p_half)
+
+    def fixed_point(update: Any, x: np.ndarray) -> np.ndarray:
+        for _ in range(50):
+            x_new = update(x)
+            if (np.abs(x_new - x) <= 1e-13 * (1.0 + np.abs(x_new))).all():
+                return x_new
+            x = x_new
+        raise RuntimeError("Symplectic step did not converge, try a smaller dt.")
+
+    # Explicit first-order guesses, so the iterations start close to the root
+    dq = model.hamiltonian_dq(q, p)
+    p_half = fixed_point(
+        lambda ph: p - half * model.hamiltonian_dq(q, ph), p - half * dq
+    )
+    dp_start = model.hamiltonian_dp(q, p_half)
+    q_new = fixed_point(
+        lambda qn: q + half * (dp_start + model.hamiltonian_dp(qn, p_half)),
+        q + h * dp_start,
+    )
+    return q_new, p_half - half * model.hamiltonian_dq(q_new, p_half)
+
+
+def _integrate_symplectic(
+    model: ODEModel, u0: np.ndarray, t_eval: np.ndarray, method: str
+) -> OptimizeResult:
+    """
+    Integrates a Hamiltonian model with a fixed-step symplectic method.
+
+    One step of size dt = t_eval[1] - t_eval[0] is taken between
+    consecutive output times. Each step is a composition of Störmer-Verlet
+    sub-steps with the weights in SYMPLECTIC_METHODS[method].
+
+    Parameters:
+    model: ODEModel
+        A Hamiltonian model (has_hamiltonian).
+    u0: np.ndarray
+        Initial state, shape (num_states,) or (num_states, K).
+    t_eval: np.ndarray
+        Equally spaced output times, starting at the time of u0.
+    method: str
+        "verlet" or "yoshida4".
+
+    Raises:
+        ValueError: If the model is not Hamiltonian (see has_hamiltonian).
+
+    Returns
+        OptimizeResult: with t (times) and y (states, time on last axis),
+        like the object solve_ivp returns.
+    """
+    if not model.has_hamiltonian:
+        raise ValueError(
+            f"Method {method!r} needs a Hamiltonian model, "
+            f"{type(model).__name__} is not one."
+        )
+    weights = SYMPLECTIC_METHODS[method]
+    dt = float(t_eval[1] - t_eval[0]) if len(t_eval) > 1 else 0.0
+
+    y = np.empty(np.shape(u0) + (len(t_eval),))
+    y[..., 0] = u0
+    q, p = model.to_canonical(u0)
+    for i in range(1, len(t_eval)):
+        for w in weights:
+            q, p = _stormer_verlet_step(model, q, p, w * dt)
+        y[..., i] = model.from_canonical(q, p)
+
+    return OptimizeResult(
+        t=t_eval, y=y, success=True, status=0, message="Integration finished."
+    )
+
+
+class FixedStepper:
+    """
+    One explicit Runge-Kutta step of fixed size h at a time.
+
+    All stage buffers are allocated once for a state shape and reused by
+    every step; resize() reallocates them when the shape changes (e.g. when
+    integrate_until() drops members). Shared by integrate_fixed_step() and
+    integrate_until(), so both take exactly the same steps.
+
+    step(t, current, out) writes the state one step after (t, current)
+    into out, which may be current itself. It is a closure over the
+    buffers, so a step does no attribute lookups.
+
+    Parameters:
+    fun: Callable
+        The RHS f(t, u), called with arrays of shape shape.
+    shape: tuple[int, ...]
+        Shape of the states, (num_states,) or (num_states, K).
+    h: float
+        Step size.
+    method: str
+        A key of FIXED_STEP_METHODS ("rk4" or "dopri5").
+    fun_into: Callable | None
+        Optional RHS fun_into(t, u, out) that writes into out (see
+        ODEModel.rhs_into). If given it is used instead of fun and the
+        stages are evaluated straight into the stage buffers, without any
+        allocation.
+    """
+
+    def __init__(
+        self,
+        fun: Callable,
+        shape: tuple[int, ...],
+        h: float,
+        method: str,
+        fun_into: Optional[Callable] = None,
+    ) -> None:
+        """
+        Scales the tableau by h and allocates the buffers for shape.
+
+        Returns
+            None
+        """
+        A, b, c = FIXED_STEP_METHODS[method]
+        self.fun = fun
+        self.fun_into = fun_into
+        self.num_stages = len(b)
+        self.hb, self.hc = h * b, h * c
+        self.stage_weights = [h * A[s, :s] for s in range(self.num_stages)]
+        self.resize(shape)
+
+    def resize(self, shape: tuple[int, ...]) -> None:
+        """
+        Allocates the stage derivatives k and the work vectors for states of
+        the given shape, and builds step() on them.
+
+        Returns
+            None
+        """
+        fun, fun_into, num_stages = self.fun, self.fun_into, self.num_stages
+        hb, hc, stage_weights = self.hb, self.hc, self.stage_weights
+        k = np.empty((num_stages,) + tuple(shape))
+        stage_state = np.empty(shape)
+        increment = np.empty(shape)
+        # Flat views, so every weighted sum of stages is a single np.dot
+        k_flat = k.reshape(num_stages, -1)
+        increment_flat = increment.reshape(-1)
+        # Stage buffers as views, so fun_into writes straight into k
+        k_rows = list(k)
+        dot, add = np.dot, np.add
+
+        def step(t: float, current: np.ndarray, out: np.ndarray) -> None:
+            if fun_into is None:
+                k[0] = fun(t, current)
+            else:
+                fun_into(t, current, k_rows[0])
+            for s in range(1, num_stages):
+                dot(stage_weights[s], k_flat[:s], out=increment_flat)
+                add(current, increment, out=stage_state)
+                if fun_into is None:
+                    k[s] = fun(t + hc[s], stage_state)
+                else:
+                    fun_into(t + hc[s], stage_state, k_rows[s])
+            dot(hb, k_flat, out=increment_flat)
+            add(current, increment, out=out)
+
+        self.shape = tuple(shape)
+        self.step = step
+
+
+def integrate_fixed_step(
+    fun: Any,
+    u0: np.ndarray,
+    t_eval: np.ndarray,
+    method: str,
+    fun_into: Optional[Callable] = None,
+) -> OptimizeResult:
+    """
+    In-house fixed-step explicit Runge-Kutta engine, used by solve() for
+    "rk4" and "dopri5" and by other modules for their own RHS.
+
+    Takes exactly one step of size dt = t_eval[1] - t_eval[0] between
+    consecutive output times, so there is no step-size control and no
+    interpolation. All memory is allocated up front: the output buffer
+    y of shape u0.shape + (len(t_eval),) and the buffers of a
+    FixedStepper. Every step then writes into these buffers in place, and
+    the new state goes straight into its column of y.
+
+    Parameters:
+    fun: Callable
+        The RHS f(t, u), called with arrays of shape u0.shape.
+    u0: np.ndarray
+        Initial state, shape (num_states,) or (num_states, K).
+    t_eval: np.ndarray
+        Equally spaced output times, starting at the time of u0.
+    method: str
+        A key of FIXED_STEP_METHODS ("rk4" or "dopri5").
+    fun_into: Callable | None
+        Optional RHS fun_into(t, u, out) that writes into out (see
+        ODEModel.rhs_into). If given it is used instead of fun and the
+        stages are evaluated straight into k, without any allocation.
+
+    Returns
+        OptimizeResult: with t, y (time on the last axis) and nfev, like the
+        object solve_ivp returns.
+    """
+    num_steps = len(t_eval) - 1
+    h = float(t_eval[1] - t_eval[0]) if num_steps > 0 else 0.0
+    stepper = FixedStepper(fun, u0.shape, h, method, fun_into)
+
+    y = np.empty(u0.shape + (len(t_eval),))
+    # steps[n] is a view of the state at t_eval[n] inside y
+    steps = np.moveaxis(y, -1, 0)
+    steps[0] = u0
+    step = stepper.step
+    times = t_eval.tolist()
+    for n in range(num_steps):
+        step(times[n], steps[n], steps[n + 1])
+
+    return OptimizeResult(
+        t=t_eval,
+        y=y,
+        nfev=stepper.num_stages * num_steps,
+        success=True,
+        status=0,
+        message="Integration finished.",
+    )
+
+
+def integrate_until(
+    fun: Callable,
+    U0: np.ndarray,
+    t_eval: np.ndarray,
+    stop: Callable,
+    method: str = "rk4",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fixed-step integration of a batch of initial conditions in which every
+    member stops as soon as a condition holds for it.
+
+    The members are stepped together as one (num_states, K) array with the
+    same steps as integrate_fixed_step(). After every step stop(t, u)
+    marks the members that are done; they are dropped from the array, so
+    the cost of a step shrinks with the number of members still running.
+    Only the stop times and final states are kept, not the trajectories.
+
+    Parameters:
+    fun: Callable
+        The RHS f(t, u), called with u of shape (num_states, k) for any k
+        (a vectorized model).
+    U0: np.ndarray
+        Initial states, shape (num_states, K).
+    t_eval: np.ndarray
+        Equally spaced times, starting at the time of U0.
+    stop: Callable
+        stop(t, u) -> boolean array of shape (k,), True for the members of
+        u that are done at time t.
+    method: str
+        A key of FIXED_STEP_METHODS ("rk4" or "dopri5").
+
+    Returns
+        tuple[np.ndarray, np.ndarray]: stop_index of shape (K,), the index
+        into t_eval of the first time at which stop was True (-1 if it
+        never was), and the states at that time (or at t_eval[-1]), shape
+        (num_states, K).
+    """
+    u = np.array(U0, dtype=float)
+    final = u.copy()
+    stop_index = np.full(u.shape[1], -1)
+    active = np.arange(u.shape[1])
+    num_steps = len(t_eval) - 1
+    h = float(t_eval[1] - t_eval[0]) if num_steps > 0 else 0.0
+    stepper = FixedStepper(fun, u.shape, h, method)
+    times = t_eval.tolist()
+
+    for n in range(num_steps + 1):
+        if n > 0:
+            stepper.step(times[n - 1], u, u)
+        done = np.asarray(stop(times[n], u), dtype=bool)
+        if done.any():
+            stop_index[active[done]] = n
+            final[:, active[done]] = u[:, done]
+            running = ~done
+            u, active = u[:, running], active[running]
+            if active.size == 0:
+                break
+            stepper.resize(u.shape)
+    final[:, active] = u
+    return stop_index, final
+
+
+# Fields of the result dataclasses that hold solver output, not parameters.
+RESULT_ARRAY_FIELDS: tuple[str, ...] = (
+    "time",
+    "solution",
+    "t_events",
+    "y_events",
+    "stats",
+)
+
+
+def _num_steps(T: float, dt: float) -> int:
+    """
+    Number of steps of size dt from 0 to T.
+
+    Raises:
+        ValueError: If T is not an integer multiple of dt (up to rounding).
+
+    Returns
+        int
+    """
+    num_steps = round(T / dt)
+    if abs(num_steps * dt - T) > 1e-9 * max(T, dt):
+        raise ValueError(f"T must be an integer multiple of dt, got T={T}, dt={dt}.")
+    return num_steps
+
+
+def time_grid(T: float, dt: float) -> np.ndarray:
+    """
+    The output grid 0, dt, 2 dt, ..., T of solve() and solve_many().
+
+    The times are dt * n, like np.arange(0, T + dt, dt), but the grid has
+    exactly T / dt + 1 points and ends at T: a last time that rounds
+    slightly above T is clamped to it, so the grid always lies within the
+    span (0, T) of solve_ivp and the fixed-step methods never step past T.
+
+    Parameters:
+    T: float
+        End time, an integer multiple of dt.
+    dt: float
+        Step size, positive.
+
+    Raises:
+        ValueError: If T is not an integer multiple of dt.
+
+    Returns
+        np.ndarray
+    """
+    return np.minimum(dt * np.arange(_num_steps(T, dt) + 1), T)
+
+
+def make_event(
+    func: Callable, terminal: bool = False, direction: float = 0.0
+) -> Callable:
+    """
+    Marks func(t, u) as an event for solve(events=...).
+
+    Parameters:
+    func: Callable
+        Event function, the event happens where it crosses zero.
+    terminal: bool, optional
+        Stop the integration at the first event.
+    direction: float, optional
+        +1 only counts crossings from negative to positive, -1 the other
+        way around, 0 (default) both.
+
+    Returns
+        Callable - func, with the terminal and direction attributes that
+        solve_ivp reads.
+    """
+    func.terminal = terminal
+    func.direction = direction
+    return func
+
+
+def save_result(result: Any, path: str) -> None:
+    """
+    Stores a result dataclass (e.g. PendulumResults) in the directory path.
+
+    Layout:
+        path/time.npy       the time points (.npy: small header + raw data)
+        path/solution.npy   the states, time on the last axis
+        path/params.json    the result type and its other fields (L, g, ...)
+
+    Event times and states (t_events, y_events) are not stored.
+    The arrays are written as plain .npy files, so load_result() can map
+    them into memory without reading or copying them.
+
+    Parameters:
+    result: Any
+        A dataclass with the fields time and solution, and JSON-compatible
+        parameter fields.
+    path: str
+        Target directory, created if it does not exist.
+
+    Returns
+        None
+    """
+    params = {
+        field.name: getattr(result, field.name)
+        for field in dataclasses.fields(result)
+        if field.name not in RESULT_ARRAY_FIELDS
+    }
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "time.npy"), np.asarray(result.time))
+    np.save(os.path.join(path, "solution.npy"), np.asarray(result.solution))
+    with open(os.path.join(path, "params.json"), "w") as f:
+        json.dump({"type": type(result).__name__, "params": params}, f, indent=2)
+
+
+def load_result(cls: type, path: str, mmap: bool = True) -> Any:
+    """
+    Loads a result stored by save_result() as an instance of cls.
+
+    Parameters:
+    cls: type
+        The result dataclass to build, must match the stored type.
+    path: str
+        Directory written by save_result().
+    mmap: bool, optional
+        If True (default) time and solution are read-only np.memmap
+        arrays: opening is instant and only the slices that are used are
+        read from disk. If False they are read into memory.
+
+    Raises:
+        ValueError: If the directory holds a different result type.
+
+    Returns
+        Any
+    """
+    with open(os.path.join(path, "params.json")) as f:
+        meta = json.load(f)
+    if meta["type"] != cls.__name__:
+        raise ValueError(f"{path} holds a {meta['type']}, not a {cls.__name__}.")
+    mmap_mode = "r" if mmap else None
+    time = np.load(os.path.join(path, "time.npy"), mmap_mode=mmap_mode)
+    solution = np.load(os.path.join(path, "solution.npy"), mmap_mode=mmap_mode)
+    return cls(time=time, solution=solution, **meta["params"])
+
+
+def downsample_minmax(
+    t: np.ndarray, y: np.ndarray, max_points: Optional[int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Shape-preserving min/max decimation of the curve (t, y) for plotting.
+
+    The curve is split into max_points // 2 consecutive buckets, and only
+    the minimum and the maximum of each bucket are kept, in time order.
+    A plotted line can not show more detail than one value range per
+    pixel column anyway, so peaks, troughs and the envelope stay visible
+    while the number of points handed to matplotlib is bounded.
+
+    Parameters:
+    t: np.ndarray
+        1D time points.
+    y: np.ndarray
+        1D values at these times.
+    max_points: int | None
+        Target number of points. None (or a curve that is already short
+        enough) returns the input unchanged.
+
+    Returns
+        tuple[np.ndarray, np.ndarray] - the kept (t, y), at most
+        max_points long (and at least 2 points).
+    """
+    n = len(y)
+    if max_points is None or n <= max_points:
+        return t, y
+    num_buckets = max(1, max_points // 2)
+    size = n // num_buckets
+    # Equal buckets of `size` points; the remainder is added to the last one
+    head = np.asarray(y[: num_buckets * size]).reshape(num_buckets, size)
+    starts = np.arange(num_buckets) * size
+    lo = starts + np.argmin(head, axis=1)
+    hi = starts + np.argmax(head, axis=1)
+    tail = np.asarray(y[num_buckets * size :])
+    if len(tail):
+        last = slice((num_buckets - 1) * size, n)
+        lo[-1] = last.start + np.argmin(y[last])
+        hi[-1] = last.start + np.argmax(y[last])
+    index = np.sort(np.concatenate([lo, hi]))
+    return t[index], y[index]
+
+
 def plot_ode_solution(
     results: ODEResult,
     state_labels: Optional[list[str]] = None,
     filename: Optional[str] = None,
+    max_points: Optional[int] = 4000,
 ) -> None:
     """
     Plotting the solution of an ODE system.
@@ -208,6 +2053,11 @@ def plot_ode_solution(
     filename:   str | None, optional
         If not None, the plot is saved to file path.
         Else: plot window is displayed.
+    max_points: int | None, optional
+        Every curve longer than this is reduced with downsample_minmax()
+        before plotting, so rendering time and file size depend on the
+        figure and not on the trajectory length (default 4000). None
+        plots every point.
 
     Returns
         None
@@ -243,7 +2093,9 @@ def plot_ode_solution(
     plt.figure()
     # Plot in the states and time points
     for i in range(num_states):
-        plt.plot(result_time, solu[i, :], label=labels[i])
+        plt.plot(
+            *downsample_minmax(result_time, solu[i, :], max_points), label=labels[i]
+        )
 
     plt.xlabel("Time")
     plt.ylabel("State Value")
@@ -257,7 +2109,9 @@ def plot_ode_solution(
         plt.show()
 
 
-def plot_energy(results: Any, filename: Optional[str] = None) -> None:
+def plot_energy(
+    results: Any, filename: Optional[str] = None, max_points: Optional[int] = 4000
+) -> None:
     """
     This function plots the potential, kinetic, and
     total energy of a pendulum system.
@@ -279,6 +2133,9 @@ def plot_energy(results: Any, filename: Optional[str] = None) -> None:
     filename: str or None, Optional
         If provided, plot saved to filename
         If not provided, plot window displayed
+    max_points: int | None, Optional
+        Curves longer than this are reduced with downsample_minmax()
+        (default 4000), None plots every point.
 
     Returns
         None
@@ -289,9 +2146,9 @@ def plot_energy(results: Any, filename: Optional[str] = None) -> None:
     E = results.total_energy
 
     plt.figure()
-    plt.plot(t, P, label="Potential Energy")
-    plt.plot(t, K, label="Kinetic Energy")
-    plt.plot(t, E, label="Total Energy", linewidth=2)
+    plt.plot(*downsample_minmax(t, P, max_points), label="Potential Energy")
+    plt.plot(*downsample_minmax(t, K, max_points), label="Kinetic Energy")
+    plt.plot(*downsample_minmax(t, E, max_points), label="Total Energy", linewidth=2)
 
     plt.xlabel("Time [s]")
     plt.ylabel("Energy [J]")
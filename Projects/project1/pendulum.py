@@ -13,8 +13,14 @@ Core components:
    - Provides convenient properties:
      - theta, omega: angular displacement and velocity over time.
      - x, y: Cartesian coordinates of the pendulum bob.
-     - vx, vy: Cartesian velocities (computed via np.gradient).
+     - vx, vy: Cartesian velocities, exact from (θ, ω) by default, or
+       via np.gradient with velocity_method="gradient".
      - potential_energy, kinetic_energy, total_energy: derived energy values.
+     - save(path), load(path, mmap=True): on-disk storage, loaded as
+       memory-mapped arrays.
+   - Derived quantities (x, y, velocities, energies) are cached properties:
+     computed once per result and recomputed only after time, solution,
+     L or g are reassigned (see ode.CachedResult).
 - Pendulum (ODEModel subclass)
    - Models a single undamped pendulum with length L and gravity g.
    - Implements:
@@ -22,6 +28,19 @@ Core components:
          dθ/dt = ω,
          dω/dt = -(g/L) * sin(θ).
      - num_states: always 2 (θ and ω).
+     - jacobian: exact Jacobian of the RHS for the implicit solvers.
+     - period: oscillation periods for an array of release amplitudes,
+       located with events in one batched solve_many() run (NaN for a
+       critically or overdamped DampenedPendulum).
+     - exact_period: the same periods in closed form from the complete
+       elliptic integral K, without solving the ODE.
+     - exact_solution: the small-angle (linearised) solution, evaluated
+       by solve(method="exact"); DampenedPendulum gives the linear damped
+       oscillator.
+     - to_canonical, from_canonical, hamiltonian_dq, hamiltonian_dp:
+       the Hamiltonian form used by the symplectic methods
+       solve(method="verlet") and solve(method="yoshida4").
+     - kernel: compiled RHS used by "rk4"/"dopri5" when numba is installed.
      - _create_result: wraps the solver output into a PendulumResults object.
      - plot_energy: plots potential, kinetic and total energy vs. time, in the grid.
 - DampenedPendulum (Pendulum subclass)
@@ -51,21 +70,77 @@ Dependencies:
 - matplotlib
 - scipy
 - ode.py
+- kernels.py (numba optional)
 
 Run file with:
     python pendulum.py
 """
 
+import math
 import numpy as np
 from typing import Final, Any, Optional
 from dataclasses import dataclass
+from scipy.special import ellipk
+from functools import cached_property
 from ode import *
+from kernels import njit
 
 DEFAULT_G: Final[float] = 9.81
+# How often period() doubles its horizon before giving up with NaN
+PERIOD_MAX_DOUBLINGS: Final[int] = 4
+
+
+@njit
+def _pendulum_kernel(
+    t: float, u: np.ndarray, params: np.ndarray, out: np.ndarray
+) -> None:
+    """
+    Compiled RHS kernel, params = [L, g].
+    """
+    out[0] = u[1]
+    out[1] = -(params[1] / params[0]) * math.sin(u[0])
+
+
+@njit
+def _dampened_pendulum_kernel(
+    t: float, u: np.ndarray, params: np.ndarray, out: np.ndarray
+) -> None:
+    """
+    Compiled RHS kernel with damping, params = [L, g, B].
+    """
+    out[0] = u[1]
+    out[1] = -(params[1] / params[0]) * math.sin(u[0]) - params[2] * u[1]
+
+
+def _linear_oscillator(
+    t: np.ndarray, u0: np.ndarray, omega0_sq: float, B: float
+) -> np.ndarray:
+    """
+    Exact solution of the linear (small-angle) pendulum
+        dθ/dt = ω,   dω/dt = -omega0_sq * θ - B * ω.
+
+    The state is propagated as u(t) = exp(M t) u0, with M the 2x2 system
+    matrix. Writing mu = sqrt(B^2/4 - omega0_sq),
+        exp(M t) = exp(-B t/2) * (cosh(mu t) I + sinh(mu t)/mu (M + B/2 I)),
+    which covers the under-, critically (mu = 0) and overdamped cases;
+    for imaginary mu the hyperbolic functions become cos and sin.
+
+    Returns
+        np.ndarray - shape u0.shape + (len(t),).
+    """
+    t = np.asarray(t, dtype=float)
+    mu = np.sqrt(complex(0.25 * B**2 - omega0_sq))
+    cosh = np.cosh(mu * t).real
+    sinc = t if mu == 0 else (np.sinh(mu * t) / mu).real
+    decay = np.exp(-0.5 * B * t)
+    theta0, omega0 = u0[0][..., np.newaxis], u0[1][..., np.newaxis]
+    theta = decay * (cosh * theta0 + sinc * (omega0 + 0.5 * B * theta0))
+    omega = decay * (cosh * omega0 - sinc * (omega0_sq * theta0 + 0.5 * B * omega0))
+    return np.stack([theta, omega])
 
 
 @dataclass
-class PendulumResults:
+class PendulumResults(CachedResult):
     """Results from solving the pendulum problem.
 
     Args:
@@ -73,16 +148,39 @@ class PendulumResults:
             The timesteps of the solution.
         solution (np.ndarray):
             The values of the solution at the given timesteps.
+            Shape (2, T), or (2, K, T) for an ensemble from solve_many(),
+            in which case every derived quantity has shape (K, T).
         L (float):
             The length of the pendulum rod.
         g (float):
             The gravitational acceleration.
+        velocity_method (str):
+            How vx, vy and kinetic_energy are computed. "exact" (default)
+            uses the closed form from (θ, ω); "gradient" differentiates
+            x and y with np.gradient, as earlier versions did.
+        t_events, y_events (list[np.ndarray] | None):
+            Times and states of the events passed to solve(events=...),
+            None without events.
+        stats (SolveStats | None):
+            Instrumentation of the solve, None unless the model has
+            collect_stats = True. Not stored by save().
     """
 
     time: np.ndarray
     solution: np.ndarray
     L: float
     g: float
+    velocity_method: str = "exact"
+    t_events: Optional[list[np.ndarray]] = None
+    y_events: Optional[list[np.ndarray]] = None
+    stats: Optional[SolveStats] = None
+
+    def __post_init__(self) -> None:
+        if self.velocity_method not in VELOCITY_METHODS:
+            raise ValueError(
+                f"velocity_method must be one of {VELOCITY_METHODS}, "
+                f"got {self.velocity_method!r}."
+            )
 
     @property
     def num_states(self) -> int:
@@ -102,7 +200,7 @@ class PendulumResults:
         Returns
             int
         """
-        return int(self.solution.shape[1])
+        return int(self.solution.shape[-1])
 
     @property
     def theta(self) -> np.ndarray:
@@ -124,7 +222,7 @@ class PendulumResults:
         """
         return self.solution[1]
 
-    @property
+    @cached_property
     def x(self) -> np.ndarray:
         """
         Computes the horizontal position of the pendulum (x-axis).
@@ -134,7 +232,7 @@ class PendulumResults:
         """
         return self.L * np.sin(self.theta)
 
-    @property
+    @cached_property
     def y(self) -> np.ndarray:
         """
         Computes the vertical position of the pendulum (y-axis).
@@ -144,7 +242,7 @@ class PendulumResults:
         """
         return -self.L * np.cos(self.theta)
 
-    @property
+    @cached_property
     def potential_energy(self) -> np.ndarray:
         """
         Potential energy: P(t) = g * (y + L) = g*L*(1 - cos theta).
@@ -155,38 +253,48 @@ class PendulumResults:
         """
         return self.g * (self.y + self.L)
 
-    @property
+    @cached_property
     def vx(self) -> np.ndarray:
         """
-        x-velocity v_x(t) = dx/dt.
-        Uses np.gradient with time points array.
+        x-velocity v_x(t) = dx/dt = L * cos(θ) * ω.
+        With velocity_method="gradient", np.gradient of x over time.
 
         Returns
             np.ndarray
         """
-        return np.gradient(self.x, self.time)
+        if self.velocity_method == "gradient":
+            return np.gradient(self.x, self.time, axis=-1)
+        return self.L * np.cos(self.theta) * self.omega
 
-    @property
+    @cached_property
     def vy(self) -> np.ndarray:
         """
-        y-velocity v_y(t) = dy/dt.
+        y-velocity v_y(t) = dy/dt = L * sin(θ) * ω.
+        With velocity_method="gradient", np.gradient of y over time.
 
         Returns
             np.ndarray
         """
-        return np.gradient(self.y, self.time)
+        if self.velocity_method == "gradient":
+            return np.gradient(self.y, self.time, axis=-1)
+        return self.L * np.sin(self.theta) * self.omega
 
-    @property
+    @cached_property
     def kinetic_energy(self) -> np.ndarray:
         """
-        Kinetic energy K(t) = dy/dt.
+        Kinetic energy K(t) = 0.5 * (vx^2 + vy^2) = 0.5 * L^2 * ω^2.
+
+        The exact form needs no velocities at all; with
+        velocity_method="gradient" it uses the finite-difference vx, vy.
 
         Returns
             np.ndarray
         """
-        return 0.5 * (self.vx**2 + self.vy**2)
+        if self.velocity_method == "gradient":
+            return 0.5 * (self.vx**2 + self.vy**2)
+        return 0.5 * self.L**2 * self.omega**2
 
-    @property
+    @cached_property
     def total_energy(self) -> np.ndarray:
         """
         Total energy: Potential energy + Kinetic energy.
@@ -197,6 +305,37 @@ class PendulumResults:
         """
         return self.potential_energy + self.kinetic_energy
 
+    def save(self, path: str) -> None:
+        """
+        Stores the result in the directory path, see ode.save_result().
+
+        Parameters:
+        path: str
+            Target directory.
+
+        Returns
+            None
+        """
+        save_result(self, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "PendulumResults":
+        """
+        Opens a result stored with save(). With mmap=True (default) time
+        and solution are memory-mapped, so even very large trajectories
+        open instantly and are only read where they are sliced.
+
+        Parameters:
+        path: str
+            Directory written by save().
+        mmap: bool, optional
+            Memory-map the arrays instead of reading them.
+
+        Returns
+            PendulumResults
+        """
+        return load_result(cls, path, mmap)
+
 
 class Pendulum(ODEModel):
     """
@@ -214,6 +353,13 @@ class Pendulum(ODEModel):
         Gravitational accelaration (m/s^2), default 9.81.
     """
 
+    # The RHS works row-wise, so u can hold k states as columns: (2, k)
+    vectorized = True
+    # H = ω²/2 - (g/L)cos(θ) splits into kinetic and potential parts
+    hamiltonian = True
+    separable = True
+    kernel = staticmethod(_pendulum_kernel)
+
     def __init__(self, *, L: float = 1.0, g: float = DEFAULT_G) -> None:
         """
         Initialize a simple pendulum model.
@@ -281,11 +427,11 @@ class Pendulum(ODEModel):
         t:  float
             Time (not used yet?)
         u: np.ndarray
-            State vector [θ, w]
+            State vector [θ, w], shape (2,) or (2, k) for k states at once.
 
         Returns:
         np.ndarray
-            Derivative vector [dθ/dt, dw/dt].
+            Derivative vector [dθ/dt, dw/dt], same shape as u.
         """
         # We unpack the vector
         theta, omega = u
@@ -295,6 +441,243 @@ class Pendulum(ODEModel):
         domega_dt = -(self.g / self.L) * np.sin(theta)
         return np.array([dtheta_dt, domega_dt], dtype=float)
 
+    def rhs_into(self, t: float, u: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Scalar RHS for a single state, written into out (see
+        ODEModel.rhs_into). Same operations as __call__ on Python floats
+        with math.sin, so the result is identical without temporaries.
+
+        Parameters:
+        t: float
+            Time (not used).
+        u: np.ndarray
+            State vector [θ, w], shape (2,).
+        out: np.ndarray
+            Output buffer, shape (2,).
+
+        Returns
+            np.ndarray - out.
+        """
+        theta, omega = u.tolist()
+        out[0] = omega
+        out[1] = -(self._g / self._L) * math.sin(theta)
+        return out
+
+    def exact_solution(self, t: np.ndarray, u0: np.ndarray) -> np.ndarray:
+        """
+        Small-angle solution used by solve(method="exact"):
+            θ(t) = θ0 cos(w t) + (ω0 / w) sin(w t),   w = sqrt(g/L).
+
+        This is the exact solution of the linearised pendulum
+        (sin θ ≈ θ), so it only matches the nonlinear model for small
+        swings; the relative error grows like θ0^2 / 16.
+
+        Parameters:
+        t:  np.ndarray
+            The times.
+        u0: np.ndarray
+            Initial state [θ0, ω0], shape (2,) or (2, k).
+
+        Returns
+            np.ndarray - shape u0.shape + (len(t),).
+        """
+        return _linear_oscillator(t, u0, self.g / self.L, 0.0)
+
+    def kernel_params(self) -> np.ndarray:
+        """
+        Parameters for the compiled kernel: [L, g].
+
+        Returns
+            np.ndarray
+        """
+        return np.array([self.L, self.g])
+
+    def jacobian(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        Exact Jacobian of the pendulum RHS:
+            J = [[0,                1],
+                 [-(g/L) * cos(θ),  0]]
+
+        Used by the implicit solvers (Radau, BDF, LSODA) instead of
+        finite-difference estimates.
+
+        Parameters:
+        t:  float
+            Time (not used).
+        u: np.ndarray
+            State vector [θ, w], shape (2,) or (2, k).
+
+        Returns:
+        np.ndarray
+            Shape (2, 2), or (2, 2, k) for a batch of states.
+        """
+        theta = np.asarray(u, dtype=float)[0]
+        J = np.zeros((2, 2) + np.shape(theta))
+        J[0, 1] = 1.0
+        J[1, 0] = -(self.g / self.L) * np.cos(theta)
+        return J
+
+    def to_canonical(self, u: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Canonical coordinates for the symplectic methods: q = θ, p = ω.
+
+        We use the Hamiltonian scaled by 1/(m L^2),
+            H(θ, ω) = ω^2 / 2 - (g/L) * cos(θ),
+        whose Hamilton equations are exactly the pendulum equations.
+
+        Parameters:
+        u: np.ndarray
+            State vector [θ, w], shape (2,) or (2, k).
+
+        Returns
+            tuple[np.ndarray, np.ndarray]: (q, p), each of shape (1,) or (1, k).
+        """
+        return u[:1], u[1:]
+
+    def from_canonical(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        Builds the state [θ, w] from (q, p) = (θ, ω).
+
+        Returns
+            np.ndarray
+        """
+        return np.concatenate([q, p])
+
+    def hamiltonian_dq(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        dH/dθ = (g/L) * sin(θ).
+
+        Returns
+            np.ndarray
+        """
+        return (self.g / self.L) * np.sin(q)
+
+    def hamiltonian_dp(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        dH/dω = ω.
+
+        Returns
+            np.ndarray
+        """
+        return p
+
+    def period(
+        self,
+        amplitudes: Any,
+        method: str = "DOP853",
+        rtol: float = 1e-10,
+        atol: float = 1e-12,
+    ) -> np.ndarray:
+        """
+        Oscillation periods for pendulums released from rest, u0 = [θ0, 0].
+
+        The swing from θ0 to the opposite turning point takes half a
+        period. It ends where ω crosses zero upwards, which is found by an
+        event, i.e. by root finding on the solver's interpolant. All
+        amplitudes are solved together in one solve_many() ensemble on the
+        two-point grid [0, horizon], so no trajectory is stored or scanned.
+        The tolerances are divided by sqrt(K) for an ensemble of K
+        amplitudes, so every period is as accurate as in a single solve.
+
+        The horizon starts at 1.25 times the expected half period and is
+        doubled at most PERIOD_MAX_DOUBLINGS times for the amplitudes that
+        have not turned yet.
+
+        Parameters:
+        amplitudes: float | array_like
+            Release angles θ0 in radians, |θ0| < π. Only |θ0| matters.
+        method: str, optional
+            solve_ivp method (default DOP853).
+        rtol, atol: float, optional
+            Solver tolerances, they set the accuracy of the periods.
+
+        Raises:
+            ValueError: If an amplitude is not in (-π, π).
+
+        Returns
+            np.ndarray - the periods in seconds, same shape as amplitudes.
+            Zero amplitude gives the small-angle period, and g = 0 gives
+            inf. NaN where the motion does not oscillate (a critically or
+            overdamped DampenedPendulum) or no turning point was found
+            within the capped horizon. Very close to π the pendulum lingers
+            near the unstable upright position, which amplifies solver
+            errors, so the periods there are less accurate.
+        """
+        amplitudes = np.abs(np.asarray(amplitudes, dtype=float))
+        if np.any(amplitudes >= np.pi) or np.any(np.isnan(amplitudes)):
+            raise ValueError("Amplitudes must lie in (-pi, pi).")
+        if self.g == 0:
+            return np.full(amplitudes.shape, np.inf)
+
+        small_angle_period = self._small_angle_period()
+        periods = np.full(amplitudes.shape, small_angle_period)
+        if np.isnan(small_angle_period):
+            return periods
+
+        flat, out = amplitudes.ravel(), periods.ravel()
+        pending = np.flatnonzero(flat > 0)
+        # Half the undamped period 4 sqrt(L/g) K(m), rescaled by the
+        # small-angle period (which includes the damping)
+        half_period = small_angle_period * ellipk(np.sin(flat / 2) ** 2) / np.pi
+        turning_point = make_event(lambda t, u: u[1], direction=1)
+        for doubling in range(PERIOD_MAX_DOUBLINGS + 1):
+            if pending.size == 0:
+                break
+            horizon = 1.25 * half_period[pending].max() * 2**doubling
+            U0 = np.column_stack([flat[pending], np.zeros(pending.size)])
+            scale = np.sqrt(pending.size)
+            result = self.solve_many(
+                U0,
+                T=horizon,
+                dt=horizon,
+                method=method,
+                events=turning_point,
+                rtol=max(rtol / scale, 100 * np.finfo(float).eps),
+                atol=atol / scale,
+            )
+            crossings = result.t_events[0]
+            turned = np.array([len(times) > 0 for times in crossings])
+            out[pending[turned]] = [2 * times[0] for times in crossings if len(times)]
+            pending = pending[~turned]
+        out[pending] = np.nan
+        return out.reshape(amplitudes.shape)
+
+    def _small_angle_period(self) -> float:
+        """
+        Period of the linearised oscillation, 2π sqrt(L/g).
+
+        Returns
+            float
+        """
+        return 2 * np.pi * np.sqrt(self.L / self.g)
+
+    def exact_period(self, amplitudes: Any) -> np.ndarray:
+        """
+        Exact period of the nonlinear pendulum from the complete elliptic
+        integral of the first kind:
+            T(θ0) = 4 * sqrt(L/g) * K(m),   m = sin^2(θ0 / 2).
+
+        One vectorized expression, no ODE solve, so it is cheap enough for
+        millions of amplitudes and serves as the reference for period().
+
+        Parameters:
+        amplitudes: float | array_like
+            Release angles θ0 in radians, |θ0| < π.
+
+        Raises:
+            ValueError: If an amplitude is not in (-π, π).
+
+        Returns
+            np.ndarray - the periods in seconds, same shape as amplitudes
+            (inf if g = 0).
+        """
+        amplitudes = np.asarray(amplitudes, dtype=float)
+        if np.any(np.abs(amplitudes) >= np.pi) or np.any(np.isnan(amplitudes)):
+            raise ValueError("Amplitudes must lie in (-pi, pi).")
+        if self.g == 0:
+            return np.full(amplitudes.shape, np.inf)
+        return 4 * np.sqrt(self.L / self.g) * ellipk(np.sin(amplitudes / 2) ** 2)
+
     def _create_result(self, solution: Any) -> Any:
         """
         This method converts the raw numerical solution from SciPy into a
@@ -324,7 +707,15 @@ class Pendulum(ODEModel):
         """
         if not hasattr(solution, "t") or not hasattr(solution, "y"):
             raise AttributeError("Solution object must have attributes t and y.")
-        return PendulumResults(time=solution.t, solution=solution.y, L=self.L, g=self.g)
+        return PendulumResults(
+            time=solution.t,
+            solution=solution.y,
+            L=self.L,
+            g=self.g,
+            t_events=getattr(solution, "t_events", None),
+            y_events=getattr(solution, "y_events", None),
+            stats=getattr(solution, "stats", None),
+        )
 
 
 class DampenedPendulum(Pendulum):
@@ -337,6 +728,11 @@ class DampenedPendulum(Pendulum):
     parameter B, also overrides RHS.
     """
 
+    # Damping removes energy, so there is no Hamiltonian to preserve
+    hamiltonian = False
+    separable = False
+    kernel = staticmethod(_dampened_pendulum_kernel)
+
     def __init__(self, *, L: float = 1.0, g: float = DEFAULT_G, B: float = 1.0) -> None:
         """
         Initialize a damped pendulum model.
@@ -379,16 +775,106 @@ class DampenedPendulum(Pendulum):
         t: float
             Time
         u: np.ndarray
-            State vector [theta, omega]
+            State vector [theta, omega], shape (2,) or (2, k).
 
         Returns:
-            np.ndarray - Derivatives with linear damping.
+            np.ndarray - Derivatives with linear damping, same shape as u.
         """
         theta, omega = u
         dtheta_dt = omega
         domega_dt = -(self.g / self.L) * np.sin(theta) - self.B * omega
         return np.array([dtheta_dt, domega_dt], dtype=float)
 
+    def rhs_into(self, t: float, u: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Scalar RHS with damping for a single state, written into out.
+
+        Parameters:
+        t: float
+            Time (not used).
+        u: np.ndarray
+            State vector [theta, omega], shape (2,).
+        out: np.ndarray
+            Output buffer, shape (2,).
+
+        Returns
+            np.ndarray - out.
+        """
+        theta, omega = u.tolist()
+        out[0] = omega
+        out[1] = -(self._g / self._L) * math.sin(theta) - self._B * omega
+        return out
+
+    def exact_solution(self, t: np.ndarray, u0: np.ndarray) -> np.ndarray:
+        """
+        Small-angle solution of the damped pendulum, the linear damped
+        oscillator θ'' + B θ' + (g/L) θ = 0 (under-, critically or
+        overdamped, depending on B). Only valid for small swings.
+
+        Parameters:
+        t:  np.ndarray
+            The times.
+        u0: np.ndarray
+            Initial state [θ0, ω0], shape (2,) or (2, k).
+
+        Returns
+            np.ndarray - shape u0.shape + (len(t),).
+        """
+        return _linear_oscillator(t, u0, self.g / self.L, self.B)
+
+    def kernel_params(self) -> np.ndarray:
+        """
+        Parameters for the compiled kernel: [L, g, B].
+
+        Returns
+            np.ndarray
+        """
+        return np.array([self.L, self.g, self.B])
+
+    def _small_angle_period(self) -> float:
+        """
+        Period of the linearised damped oscillation, 2π / sqrt(g/L - B²/4),
+        NaN if it does not oscillate (critically or overdamped, B >= 2
+        sqrt(g/L)). The pendulum's restoring force sin(θ) is weaker than θ,
+        so large swings do not oscillate then either.
+
+        Returns
+            float
+        """
+        damped = self.g / self.L - 0.25 * self.B**2
+        return 2 * np.pi / np.sqrt(damped) if damped > 0 else np.nan
+
+    def exact_period(self, amplitudes: Any) -> np.ndarray:
+        """
+        Damping has no closed-form period, use period() instead.
+
+        Raises:
+            NotImplementedError: Always.
+
+        Returns
+            np.ndarray
+        """
+        raise NotImplementedError(
+            "The damped pendulum has no closed-form period, use period()."
+        )
+
+    def jacobian(self, t: float, u: np.ndarray) -> np.ndarray:
+        """
+        Exact Jacobian with damping, the undamped one plus -B in dω/dω.
+
+        Parameters:
+        t: float
+            Time
+        u: np.ndarray
+            State vector [theta, omega], shape (2,) or (2, k).
+
+        Returns:
+            np.ndarray - Shape (2, 2), or (2, 2, k) for a batch of states.
+        """
+        J = super().jacobian(t, u)
+        J[1, 1] = -self.B
+        return J
+
 
 def exercise_2b() -> ODEResult:
     """
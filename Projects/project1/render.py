@@ -0,0 +1,336 @@
+"""
+render.py
+=========
+
+This module renders many ODE results to image files without pyplot.
+
+plot_ode_solution() and plot_energy() in 'ode.py' build a new pyplot
+figure for every call, which is fine for one plot but slow and stateful
+for a report with thousands of them. Here one matplotlib Figure with an
+Agg canvas is created per process and reused: for every result only the
+data of the existing lines is replaced, the axes are rescaled and the
+canvas is written out.
+
+Contents:
+- FigureRenderer:
+    A reusable headless figure for one kind of plot, "energy" (potential,
+    kinetic and total energy, like plot_energy) or "solution" (every state
+    over time, like plot_ode_solution). draw(curves) updates the lines in
+    place, save(target) writes a PNG file or a page of a PdfPages.
+- extract_curves(result, kind="energy", max_points=4000):
+    The (t, y) curves of one result, reduced with downsample_minmax().
+- render_batch(results, output, kind="energy", state_labels=None,
+               titles=None, max_points=4000, dpi=150, max_workers=1):
+    Renders a sequence of results to numbered PNG files in a directory, or
+    to one multi-page PDF when output ends with ".pdf". PNG output can be
+    spread over worker processes.
+
+Design Notes:
+- The curves are extracted and downsampled in the calling process, so
+  only a few thousand points per curve are sent to the workers, not the
+  full results.
+- Every worker builds its own FigureRenderer once and renders a chunk of
+  results with it.
+- A multi-page PDF is written by a single PdfPages, so it is always
+  rendered in the calling process.
+
+Dependencies:
+- numpy
+- matplotlib
+- ode.py
+
+Run file with:
+    python render.py
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional, Sequence, Union
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from ode import downsample_minmax
+
+Curves = list[tuple[np.ndarray, np.ndarray]]
+
+ENERGY_LABELS = ("Potential Energy", "Kinetic Energy", "Total Energy")
+PLOT_KINDS = ("energy", "solution")
+# Title of each kind, as in plot_energy and plot_ode_solution
+DEFAULT_TITLES = {"energy": "Pendulum Energy VS. Time", "solution": ""}
+
+
+def extract_curves(
+    result: Any, kind: str = "energy", max_points: Optional[int] = 4000
+) -> Curves:
+    """
+    The curves to plot for one result, each reduced with
+    downsample_minmax().
+
+    Parameters:
+    result: Any
+        "energy": an object with time, potential_energy, kinetic_energy
+        and total_energy (duck-typed, as in plot_energy).
+        "solution": an object with time and solution (num_states, T).
+    kind: str
+        "energy" or "solution".
+    max_points: int | None
+        Target number of points per curve, None keeps every point.
+
+    Raises:
+        ValueError: If kind is unknown.
+
+    Returns
+        list[tuple[np.ndarray, np.ndarray]] - (t, y) per line.
+    """
+    t = np.asarray(result.time)
+    if kind == "energy":
+        curves = [
+            result.potential_energy,
+            result.kinetic_energy,
+            result.total_energy,
+        ]
+    elif kind == "solution":
+        solution = np.asarray(result.solution)
+        curves = list(solution.reshape(-1, solution.shape[-1]))
+    else:
+        raise ValueError(f"kind must be one of {PLOT_KINDS}, got {kind!r}.")
+    return [downsample_minmax(t, np.asarray(y), max_points) for y in curves]
+
+
+class FigureRenderer:
+    """
+    One headless figure (Agg canvas) that is reused for many plots.
+
+    The lines are created on the first draw() and afterwards only get new
+    data, so no figure, axes or legend is rebuilt per result.
+
+    Parameters:
+    kind: str
+        "energy" or "solution".
+    state_labels: Sequence[str] | None
+        Legend labels of the states for kind="solution" (default
+        "State 1", "State 2", ...).
+    dpi: int
+        Resolution of the saved images.
+    """
+
+    def __init__(
+        self,
+        kind: str = "energy",
+        state_labels: Optional[Sequence[str]] = None,
+        dpi: int = 150,
+    ) -> None:
+        """
+        Creates the figure, its Agg canvas and the (empty) axes.
+
+        Raises:
+            ValueError: If kind is unknown.
+
+        Returns
+            None
+        """
+        if kind not in PLOT_KINDS:
+            raise ValueError(f"kind must be one of {PLOT_KINDS}, got {kind!r}.")
+        self.kind = kind
+        self.state_labels = state_labels
+        self.dpi = dpi
+        self.figure = Figure()
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot()
+        self.lines: list[Any] = []
+
+        if kind == "energy":
+            self.axes.set_xlabel("Time [s]")
+            self.axes.set_ylabel("Energy [J]")
+            self.axes.grid(True, linestyle="--", alpha=0.4)
+        else:
+            self.axes.set_xlabel("Time")
+            self.axes.set_ylabel("State Value")
+            self.axes.grid(True, which="both", linestyle="--", alpha=0.4)
+        self.axes.set_title(DEFAULT_TITLES[kind])
+
+    def _create_lines(self, num_lines: int) -> None:
+        """
+        Creates the lines and the legend for the first plot.
+
+        Raises:
+            ValueError: If state_labels does not have num_lines labels.
+
+        Returns
+            None
+        """
+        if self.kind == "energy":
+            labels = list(ENERGY_LABELS)
+        elif self.state_labels is None:
+            labels = [f"State {i + 1}" for i in range(num_lines)]
+        else:
+            labels = list(self.state_labels)
+        if len(labels) != num_lines:
+            raise ValueError(
+                f"Got {num_lines} curves but {len(labels)} labels: {labels}."
+            )
+        for label in labels:
+            linewidth = 2 if label == "Total Energy" else None
+            (line,) = self.axes.plot([], [], label=label, linewidth=linewidth)
+            self.lines.append(line)
+        self.axes.legend()
+
+    def draw(self, curves: Curves, title: Optional[str] = None) -> Figure:
+        """
+        Replaces the data of the lines and rescales the axes.
+
+        Parameters:
+        curves: list[tuple[np.ndarray, np.ndarray]]
+            (t, y) per line, e.g. from extract_curves().
+        title: str | None
+            Title of the axes, None for the default title of the kind (not
+            the title of the previous draw).
+
+        Raises:
+            ValueError: If the number of curves differs from the first draw.
+
+        Returns
+            Figure
+        """
+        if not self.lines:
+            self._create_lines(len(curves))
+        if len(curves) != len(self.lines):
+            raise ValueError(
+                f"Renderer has {len(self.lines)} lines, got {len(curves)} curves."
+            )
+        for line, (t, y) in zip(self.lines, curves):
+            line.set_data(t, y)
+        self.axes.set_title(DEFAULT_TITLES[self.kind] if title is None else title)
+        self.axes.relim()
+        self.axes.autoscale_view()
+        return self.figure
+
+    def save(self, target: Union[str, PdfPages]) -> None:
+        """
+        Writes the current figure.
+
+        Parameters:
+        target: str | PdfPages
+            A file path (format from its extension), or an open PdfPages
+            that gets the figure as a new page.
+
+        Returns
+            None
+        """
+        if isinstance(target, PdfPages):
+            target.savefig(self.figure)
+        else:
+            self.figure.savefig(target, dpi=self.dpi)
+
+
+def _render_chunk(
+    kind: str,
+    state_labels: Optional[Sequence[str]],
+    dpi: int,
+    items: list[tuple[str, Curves, Optional[str]]],
+) -> None:
+    """
+    Renders a chunk of plots with one FigureRenderer. Runs inside the
+    worker processes.
+
+    Parameters:
+    items: list[tuple[str, Curves, str | None]]
+        (file path, curves, title) per plot.
+
+    Returns
+        None
+    """
+    renderer = FigureRenderer(kind, state_labels, dpi)
+    for path, curves, title in items:
+        renderer.draw(curves, title)
+        renderer.save(path)
+
+
+def render_batch(
+    results: Sequence[Any],
+    output: str,
+    kind: str = "energy",
+    state_labels: Optional[Sequence[str]] = None,
+    titles: Optional[Sequence[Optional[str]]] = None,
+    max_points: Optional[int] = 4000,
+    dpi: int = 150,
+    max_workers: int = 1,
+) -> list[str]:
+    """
+    Renders many results with reused headless figures.
+
+    Example:
+        render_batch(results, "report/energy")      # energy_00000.png, ...
+        render_batch(results, "report/energy.pdf")  # one page per result
+
+    Parameters:
+    results: Sequence[Any]
+        Result objects, see extract_curves() for what each kind needs.
+    output: str
+        Directory for the PNG files (created if needed), or the path of a
+        multi-page PDF if it ends with ".pdf".
+    kind: str
+        "energy" or "solution".
+    state_labels: Sequence[str] | None
+        Legend labels of the states for kind="solution".
+    titles: Sequence[str | None] | None
+        One title per result; None (for all results or a single one)
+        gives the default title of the kind.
+    max_points: int | None
+        Target number of points per curve, see downsample_minmax().
+    dpi: int
+        Resolution of the images.
+    max_workers: int
+        Number of worker processes for PNG output. With 1 everything is
+        rendered in the calling process.
+
+    Raises:
+        ValueError: If kind is unknown, titles has the wrong length, or
+        max_workers > 1 is used with PDF output.
+
+    Returns
+        list[str] - the written files, in the order of results.
+    """
+    if titles is not None and len(titles) != len(results):
+        raise ValueError(f"Got {len(titles)} titles for {len(results)} results.")
+    if titles is None:
+        titles = [None] * len(results)
+    curves = [extract_curves(result, kind, max_points) for result in results]
+
+    if output.lower().endswith(".pdf"):
+        if max_workers != 1:
+            raise ValueError("A multi-page PDF is rendered with max_workers=1.")
+        renderer = FigureRenderer(kind, state_labels, dpi)
+        with PdfPages(output) as pdf:
+            for result_curves, title in zip(curves, titles):
+                renderer.draw(result_curves, title)
+                renderer.save(pdf)
+        return [output]
+
+    os.makedirs(output, exist_ok=True)
+    paths = [os.path.join(output, f"{kind}_{i:05d}.png") for i in range(len(results))]
+    items = list(zip(paths, curves, titles))
+    max_workers = max(1, min(max_workers, len(items)))
+    if max_workers == 1:
+        _render_chunk(kind, state_labels, dpi, items)
+    else:
+        chunk_size = -(-len(items) // max_workers)
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_render_chunk, kind, state_labels, dpi, chunk)
+                for chunk in chunks
+            ]
+            for future in futures:
+                future.result()
+    return paths
+
+
+if __name__ == "__main__":
+    from pendulum import Pendulum
+
+    u0 = np.array([np.pi / 6, 0.35])
+    results = [Pendulum(L=L).solve(u0=u0, T=10.0, dt=0.01) for L in (0.5, 1.0, 2.0)]
+    titles = [f"Pendulum Energy, L = {L} m" for L in (0.5, 1.0, 2.0)]
+    print(render_batch(results, "energy_report.pdf", titles=titles))
@@ -0,0 +1,283 @@
+"""
+sweep.py
+========
+
+This module provides a parameter-sweep engine for the ODE models in this
+project. A sweep solves the same initial condition(s) for every
+combination of a grid of model parameters, e.g. DampenedPendulum over
+(L, g, B) or DoublePendulum over (L1, L2, g), and collects all
+trajectories in one array indexed by the parameter axes.
+
+Contents:
+- SweepResult (dataclass):
+    Holds the parameter grid, the time points and the solutions of all
+    parameter combinations, with shape
+        (len(values_1), ..., len(values_m), num_states, num_timepoints)
+    or, for a batch of K initial conditions,
+        (len(values_1), ..., len(values_m), num_states, K, num_timepoints).
+    result(index) rebuilds the model's own result object (PendulumResults,
+    DoublePendulumResults, ...) for one parameter combination.
+- sweep(model_cls, grid, u0, T, dt, method="RK45", max_workers=None,
+        chunk_size=None):
+    Runs the sweep. The parameter combinations are split into chunks that
+    are solved in a process pool; every worker writes its trajectories
+    directly into one shared memory block, so no results are pickled back
+    to the parent process.
+
+Design Notes:
+- The models are built inside the workers from model_cls(**params), so
+  only the class, the parameter values and the initial conditions are sent
+  to the pool.
+- A batch of initial conditions (u0 with shape (K, num_states)) is solved
+  with ODEModel.solve_many(), one vectorized run per parameter set.
+- max_workers=1 solves everything in the calling process, which avoids the
+  start-up cost of the pool for small sweeps.
+
+Dependencies:
+- numpy
+- ode.py
+
+Run file with:
+    python sweep.py
+"""
+
+import itertools
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Optional, Sequence
+from scipy.optimize import OptimizeResult
+from ode import ODEModel, time_grid
+
+
+@dataclass
+class SweepResult:
+    """Results of a parameter sweep.
+
+    Args:
+        model_cls (type):
+            The swept ODEModel subclass.
+        params (dict[str, np.ndarray]):
+            The values of every swept parameter, in axis order.
+        time (np.ndarray):
+            The time points, shared by all solutions.
+        solution (np.ndarray):
+            The solutions, indexed by the parameter axes first, e.g.
+            solution[i, j, k] belongs to the i-th, j-th and k-th value of
+            the first, second and third parameter.
+        fixed (dict[str, Any]):
+            Model parameters that were passed to every model unchanged.
+    """
+
+    model_cls: type
+    params: dict[str, np.ndarray]
+    time: np.ndarray
+    solution: np.ndarray
+    fixed: dict[str, Any]
+
+    @property
+    def grid_shape(self) -> tuple[int, ...]:
+        """
+        Shape of the parameter grid.
+
+        Returns
+            tuple[int, ...]
+        """
+        return tuple(len(values) for values in self.params.values())
+
+    def model(self, index: tuple[int, ...]) -> ODEModel:
+        """
+        The model of one parameter combination.
+
+        Parameters:
+        index: tuple[int, ...]
+            One index per parameter axis.
+
+        Returns
+            ODEModel
+        """
+        values = {
+            name: float(self.params[name][i]) for name, i in zip(self.params, index)
+        }
+        return self.model_cls(**self.fixed, **values)
+
+    def result(self, index: tuple[int, ...]) -> Any:
+        """
+        The model's own result object (e.g. PendulumResults) for one
+        parameter combination.
+
+        Parameters:
+        index: tuple[int, ...]
+            One index per parameter axis.
+
+        Returns
+            Any
+        """
+        solution = OptimizeResult(t=self.time, y=self.solution[tuple(index)])
+        return self.model(index)._create_result(solution)
+
+
+def _solve_chunk(
+    model_cls: type,
+    fixed: dict[str, Any],
+    names: list[str],
+    combinations: list[tuple[int, tuple[float, ...]]],
+    u0: np.ndarray,
+    T: float,
+    dt: float,
+    method: str,
+    shm_name: str,
+    shape: tuple[int, ...],
+) -> None:
+    """
+    Solves a chunk of parameter combinations and writes the trajectories
+    into the shared output array. Runs inside the worker processes.
+
+    Parameters:
+    combinations: list[tuple[int, tuple[float, ...]]]
+        (flat index into the parameter grid, parameter values) pairs.
+    shm_name: str
+        Name of the shared memory block holding the output array.
+    shape: tuple[int, ...]
+        Shape of the output array, the grid axes flattened into the first.
+
+    Raises:
+        RuntimeError: If a solve does not reach T.
+
+    Returns
+        None
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        for flat_index, values in combinations:
+            model = model_cls(**fixed, **dict(zip(names, values)))
+            if u0.ndim == 1:
+                result = model.solve(u0=u0, T=T, dt=dt, method=method)
+            else:
+                result = model.solve_many(u0, T=T, dt=dt, method=method)
+            if result.solution.shape != shape[1:]:
+                raise RuntimeError(
+                    f"Solve failed for {dict(zip(names, values))}: got "
+                    f"{result.solution.shape[-1]} of {shape[-1]} time points."
+                )
+            out[flat_index] = result.solution
+        del out
+    finally:
+        shm.close()
+
+
+def sweep(
+    model_cls: type,
+    grid: dict[str, Sequence[float]],
+    u0: np.ndarray,
+    T: float,
+    dt: float,
+    method: str = "RK45",
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    **fixed: Any,
+) -> SweepResult:
+    """
+    Solves model_cls for every combination of the parameter values in grid.
+
+    Example:
+        sweep(DampenedPendulum, {"L": [1, 2], "B": [0.1, 0.5, 1.0]},
+              u0=np.array([np.pi / 6, 0.35]), T=10, dt=0.01, g=9.81)
+    gives a SweepResult with solution shape (2, 3, 2, 1001).
+
+    Parameters:
+    model_cls: type
+        ODEModel subclass, built as model_cls(**fixed, **params).
+    grid: dict[str, Sequence[float]]
+        The values of each swept (keyword) parameter of model_cls.
+    u0: np.ndarray
+        Initial condition (num_states,), or a batch (K, num_states) that
+        is solved with solve_many() for every parameter combination.
+    T: float
+        How long we want it to simulate.
+    dt: float
+        How often we want results (time steps).
+    method: str
+        Solver method, as in ODEModel.solve().
+    max_workers: int | None, optional
+        Number of worker processes (default os.cpu_count()). With 1 the
+        sweep runs in the calling process.
+    chunk_size: int | None, optional
+        Parameter combinations per task (default: about four tasks per
+        worker).
+    **fixed: Any
+        Further model parameters that are not swept.
+
+    Raises:
+        ValueError: If the grid is empty or has an empty axis.
+
+    Returns
+        SweepResult
+    """
+    if not grid or any(len(values) == 0 for values in grid.values()):
+        raise ValueError("grid needs at least one parameter with values.")
+    params = {
+        name: np.asarray(values, dtype=float).ravel() for name, values in grid.items()
+    }
+    names = list(params)
+    grid_shape = tuple(len(values) for values in params.values())
+    combinations = list(
+        enumerate(itertools.product(*(values.tolist() for values in params.values())))
+    )
+
+    u0 = np.asarray(u0, dtype=float)
+    time = time_grid(T, dt)
+    state_shape = u0.shape[::-1]  # (num_states,) or (num_states, K)
+    shape = (len(combinations),) + state_shape + (len(time),)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(combinations)))
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(combinations) // (4 * max_workers)))
+    chunks = [
+        combinations[i : i + chunk_size]
+        for i in range(0, len(combinations), chunk_size)
+    ]
+
+    nbytes = int(np.prod(shape)) * np.dtype(float).itemsize
+    shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    try:
+        args = (model_cls, fixed, names)
+        tail = (u0, T, dt, method, shm.name, shape)
+        if max_workers == 1:
+            for chunk in chunks:
+                _solve_chunk(*args, chunk, *tail)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(_solve_chunk, *args, c, *tail) for c in chunks]
+                for future in futures:
+                    future.result()
+        shared = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        solution = shared.reshape(grid_shape + shape[1:]).copy()
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return SweepResult(
+        model_cls=model_cls, params=params, time=time, solution=solution, fixed=fixed
+    )
+
+
+if __name__ == "__main__":
+    from pendulum import DampenedPendulum
+
+    result = sweep(
+        DampenedPendulum,
+        {"L": np.linspace(0.5, 2.0, 4), "B": np.linspace(0.0, 1.0, 5)},
+        u0=np.array([np.pi / 6, 0.35]),
+        T=10.0,
+        dt=0.01,
+        g=9.81,
+    )
+    print("Solution shape:", result.solution.shape)
+    print("Final energy, L = 2.0, B = 1.0:", result.result((3, 4)).total_energy[-1])
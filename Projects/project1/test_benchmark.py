@@ -0,0 +1,131 @@
+"""
+test_benchmark.py
+=================
+
+This file contains unit tests for the solver benchmark suite in benchmark.py.
+
+Overview of Tests
+1. test_run_benchmarks_records_measurements
+    - A small benchmark grid records wall time, the solver's nfev, RHS
+      calls, peak memory, error against the reference and (for the
+      pendulum) energy drift, and tighter tolerances give smaller errors
+      with more RHS evaluations.
+2. test_compare_benchmarks_flags_regressions
+    - Comparing a report with itself finds no regressions, and neither does
+      a single extra RHS evaluation; a baseline that was faster and needed
+      far fewer evaluations is flagged, and the command line exits with
+      status 1.
+
+Dependencies
+- numpy
+- pytest
+
+Run all tests with:
+    pytest test_benchmark.py -v
+"""
+
+import copy
+import pytest
+from pathlib import Path
+from benchmark import (
+    RUN_KEY,
+    compare_benchmarks,
+    load_benchmarks,
+    main,
+    run_benchmarks,
+    save_benchmarks,
+)
+
+SMALL = dict(
+    models=["ExponentialDecay", "Pendulum"],
+    methods=["RK45", "LSODA"],
+    T_values=[2.0],
+    dt_values=[0.05],
+    tolerances=[(1e-3, 1e-6), (1e-9, 1e-11)],
+    repeat=1,
+)
+
+
+def test_run_benchmarks_records_measurements(tmp_path: Path) -> None:
+    """
+    Run with:
+        pytest test_benchmark.py::test_run_benchmarks_records_measurements
+    """
+    report = run_benchmarks(**SMALL)
+    runs = report["runs"]
+    assert len(runs) == 2 * 2 * 2
+    assert {"numpy", "scipy", "python"} <= set(report["meta"])
+
+    for run in runs:
+        assert set(RUN_KEY) <= set(run)
+        assert run["wall_time"] > 0 and run["nfev"] > 0 and run["peak_memory"] > 0
+        assert run["rhs_calls"] > 0
+        assert run["max_error"] is not None
+        assert (run["energy_drift"] is None) == (run["model"] == "ExponentialDecay")
+
+    by_key = {(r["model"], r["method"], r["rtol"]): r for r in runs}
+    loose, tight = by_key["Pendulum", "RK45", 1e-3], by_key["Pendulum", "RK45", 1e-9]
+    assert tight["max_error"] < loose["max_error"]
+    assert tight["nfev"] > loose["nfev"]
+    # The solver's nfev: 2 evaluations to start, then 6 per step attempt
+    attempts = loose["accepted_steps"] + loose["rejected_steps"]
+    assert loose["nfev"] == 2 + 6 * attempts
+    assert tight["energy_drift"] < 1e-6
+
+    path = str(tmp_path / "bench.json")
+    save_benchmarks(report, path)
+    assert load_benchmarks(path) == report
+
+    with pytest.raises(ValueError):
+        run_benchmarks(models=["Lorenz"])
+
+
+def test_compare_benchmarks_flags_regressions(tmp_path: Path) -> None:
+    """
+    Run with:
+        pytest test_benchmark.py::test_compare_benchmarks_flags_regressions
+    """
+    report = run_benchmarks(**dict(SMALL, models=["ExponentialDecay"]))
+    rows = compare_benchmarks(report, report)
+    assert len(rows) == len(report["runs"])
+    assert all(row["regressions"] == [] for row in rows)
+    assert all(row["wall_time"] == pytest.approx(1.0) for row in rows)
+
+    # A few extra RHS evaluations are within nfev_threshold
+    baseline = copy.deepcopy(report)
+    baseline["runs"][0]["nfev"] -= 1
+    assert compare_benchmarks(report, baseline)[0]["regressions"] == []
+
+    baseline["runs"][0]["wall_time"] /= 2
+    baseline["runs"][0]["nfev"] //= 2
+    rows = compare_benchmarks(report, baseline)
+    assert rows[0]["regressions"] == ["wall_time", "nfev"]
+    assert all(row["regressions"] == [] for row in rows[1:])
+
+    baseline_path = str(tmp_path / "baseline.json")
+    save_benchmarks(baseline, baseline_path)
+    status = main(
+        [
+            "--output",
+            str(tmp_path / "new.json"),
+            "--baseline",
+            baseline_path,
+            "--models",
+            "ExponentialDecay",
+            "--methods",
+            "RK45",
+            "--T",
+            "2",
+            "--dt",
+            "0.05",
+            "--tol",
+            "1e-3",
+            "1e-6",
+            "--repeat",
+            "1",
+            "--threshold",
+            "1e6",
+        ]
+    )
+    assert status == 1
+    assert len(load_benchmarks(str(tmp_path / "new.json"))["runs"]) == 1
@@ -0,0 +1,204 @@
+"""
+test_cache.py
+=============
+
+This file contains unit tests for the solve() memoization cache in cache.py.
+
+Overview of Tests
+1. test_memory_tier_returns_cached_solve
+    - A repeated Pendulum solve is a cache hit that returns the same
+      (read-only) trajectory without integrating, while changing a
+      parameter, u0, T, dt or method is a miss.
+2. test_disk_tier_is_shared_between_caches
+    - A second SolveCache on the same directory finds the solve on disk,
+      and the least recently used files are evicted above max_bytes.
+3. test_memory_tier_is_lru
+    - The memory tier keeps at most maxsize trajectories and drops the
+      least recently used one.
+4. test_cache_is_opt_in_and_skips_dense_and_events
+    - Without solve_cache nothing is cached, and dense output and event
+      solves bypass the cache.
+5. test_key_ignores_runtime_flags
+    - An instance-level collect_stats or solve_cache and the values of
+      cached properties do not change the key, parameters do.
+6. test_cached_solve_does_not_keep_stats
+    - With collect_stats on, the stats of the first solve stay on its own
+      result: cache hits carry no stats, with or without collect_stats.
+
+Dependencies
+- numpy
+- pytest
+
+Run all tests with:
+    pytest test_cache.py -v
+"""
+
+import os
+import numpy as np
+import pytest
+from functools import cached_property
+from pathlib import Path
+from cache import SolveCache
+from ode import ODEModel, make_event
+from pendulum import Pendulum, DampenedPendulum, PendulumResults
+
+U0 = np.array([np.pi / 6, 0.35])
+
+
+def test_memory_tier_returns_cached_solve(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Run with:
+        pytest test_cache.py::test_memory_tier_returns_cached_solve
+    """
+    cache = SolveCache()
+    monkeypatch.setattr(ODEModel, "solve_cache", cache)
+
+    first = Pendulum(L=1.0, g=9.81).solve(u0=U0, T=2.0, dt=0.01)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # Parameters equal as numbers (int vs float) give the same key
+    calls = []
+    model = Pendulum(L=1, g=9.81)
+    monkeypatch.setattr(Pendulum, "__call__", lambda self, t, u: calls.append(t))
+    second = model.solve(u0=U0.copy(), T=2, dt=0.01)
+    assert calls == [] and cache.hits == 1
+    assert isinstance(second, PendulumResults)
+    assert second.solution is first.solution
+    assert not second.solution.flags.writeable
+    monkeypatch.undo()
+
+    monkeypatch.setattr(ODEModel, "solve_cache", cache)
+    Pendulum(L=2.0).solve(u0=U0, T=2.0, dt=0.01)
+    DampenedPendulum(B=0.0).solve(u0=U0, T=2.0, dt=0.01)
+    Pendulum().solve(u0=U0 + 0.1, T=2.0, dt=0.01)
+    Pendulum().solve(u0=U0, T=3.0, dt=0.01)
+    Pendulum().solve(u0=U0, T=2.0, dt=0.02)
+    Pendulum().solve(u0=U0, T=2.0, dt=0.01, method="rk4")
+    Pendulum().solve(u0=U0, T=2.0, dt=0.01, rtol=1e-8)
+    assert (cache.hits, cache.misses) == (1, 8)
+
+
+def test_disk_tier_is_shared_between_caches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Run with:
+        pytest test_cache.py::test_disk_tier_is_shared_between_caches
+    """
+    writer = SolveCache(directory=str(tmp_path))
+    monkeypatch.setattr(ODEModel, "solve_cache", writer)
+    stored = Pendulum().solve(u0=U0, T=2.0, dt=0.01)
+    assert len(os.listdir(tmp_path)) == 1
+
+    reader = SolveCache(directory=str(tmp_path))
+    monkeypatch.setattr(ODEModel, "solve_cache", reader)
+    loaded = Pendulum().solve(u0=U0, T=2.0, dt=0.01)
+    assert reader.disk_hits == 1
+    assert np.array_equal(loaded.solution, stored.solution)
+    assert np.array_equal(loaded.time, stored.time)
+
+    # One file holds about 3 * 201 floats; allow two of them
+    size = os.path.getsize(next(tmp_path.iterdir()))
+    small = SolveCache(maxsize=0, directory=str(tmp_path), max_bytes=2 * size + 100)
+    monkeypatch.setattr(ODEModel, "solve_cache", small)
+    for L in (2.0, 3.0):
+        Pendulum(L=L).solve(u0=U0, T=2.0, dt=0.01)
+    assert len(os.listdir(tmp_path)) == 2
+    small.clear()
+    assert os.listdir(tmp_path) == []
+
+
+def test_memory_tier_is_lru(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Run with:
+        pytest test_cache.py::test_memory_tier_is_lru
+    """
+    cache = SolveCache(maxsize=2)
+    monkeypatch.setattr(Pendulum, "solve_cache", cache)
+    for L in (1.0, 2.0, 1.0, 3.0):
+        Pendulum(L=L).solve(u0=U0, T=1.0, dt=0.01)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    Pendulum(L=1.0).solve(u0=U0, T=1.0, dt=0.01)
+    Pendulum(L=2.0).solve(u0=U0, T=1.0, dt=0.01)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    with pytest.raises(ValueError):
+        SolveCache(maxsize=-1)
+
+
+def test_cache_is_opt_in_and_skips_dense_and_events(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Run with:
+        pytest test_cache.py::test_cache_is_opt_in_and_skips_dense_and_events
+    """
+    assert ODEModel.solve_cache is None
+    a = Pendulum().solve(u0=U0, T=1.0, dt=0.01)
+    b = Pendulum().solve(u0=U0, T=1.0, dt=0.01)
+    assert a.solution is not b.solution and a.solution.flags.writeable
+
+    cache = SolveCache()
+    monkeypatch.setattr(ODEModel, "solve_cache", cache)
+    Pendulum().solve(u0=U0, T=1.0, dt=0.01, dense_output=True)
+    event = make_event(lambda t, u: u[1])
+    Pendulum().solve(u0=U0, T=1.0, dt=0.01, events=event)
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    model = Pendulum()
+    model.solve_cache = None
+    model.solve(u0=U0, T=1.0, dt=0.01)
+    assert cache.misses == 0
+
+
+class FrequencyPendulum(Pendulum):
+    """
+    Pendulum with a cached derived attribute.
+    """
+
+    @cached_property
+    def frequency(self) -> float:
+        return np.sqrt(self.g / self.L)
+
+
+def test_key_ignores_runtime_flags(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Run with:
+        pytest test_cache.py::test_key_ignores_runtime_flags
+    """
+    cache = SolveCache()
+    monkeypatch.setattr(ODEModel, "solve_cache", cache)
+    Pendulum().solve(u0=U0, T=1.0, dt=0.01)
+
+    model = Pendulum()
+    model.collect_stats = True
+    model.solve(u0=U0, T=1.0, dt=0.01)
+    assert (cache.hits, cache.misses) == (1, 1)
+    model.solve_cache = cache
+    args = (U0, 1.0, 0.01, "RK45", 1e-3, 1e-6)
+    assert cache.key(model, *args) == cache.key(Pendulum(), *args)
+
+    derived = FrequencyPendulum()
+    before = cache.key(derived, *args)
+    assert derived.frequency > 0
+    assert cache.key(derived, *args) == before
+    assert cache.key(FrequencyPendulum(L=2.0), *args) != before
+
+
+def test_cached_solve_does_not_keep_stats(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Run with:
+        pytest test_cache.py::test_cached_solve_does_not_keep_stats
+    """
+    cache = SolveCache()
+    monkeypatch.setattr(ODEModel, "solve_cache", cache)
+    monkeypatch.setattr(Pendulum, "collect_stats", True)
+    first = Pendulum().solve(u0=U0, T=1.0, dt=0.01)
+    assert first.stats is not None
+
+    key = cache.key(Pendulum(), U0, 1.0, 0.01, "RK45", 1e-3, 1e-6)
+    assert "stats" not in cache.get(key)
+    assert Pendulum().solve(u0=U0, T=1.0, dt=0.01).stats is None
+    monkeypatch.setattr(Pendulum, "collect_stats", False)
+    assert Pendulum().solve(u0=U0, T=1.0, dt=0.01).stats is None
@@ -17,6 +17,32 @@ Overview of Tests:
    - Parameterized test for verifying that the derivative of ω2 (angular
      velocity of pendulum 2) is computed correctly.
    - Similar setup as 'test_domega1_dt' but checks dθ2/dt and dω2/dt.
+3. test_solve_many_rejects_wrong_shape
+   - Checks that solve_many() validates the (K, num_states) batch shape
+     and returns (K, T) arrays for the ensemble.
+4. test_vectorized_rhs_matches_columns
+   - Checks that a (4, k) batch of states gives the same derivatives as
+     calling the model one column at a time.
+5. test_jacobian_matches_finite_differences
+   - Compares the exact 4x4 Jacobian with central finite differences.
+6. test_radau_with_jacobian_matches_rk45
+   - Checks that a Radau solve using the exact Jacobian matches the
+     default RK45 solve.
+7. test_symplectic_verlet_conserves_energy
+   - Checks the canonical transform round trip and that the (implicit)
+     Störmer-Verlet method keeps the energy bounded, for a single run and
+     for an ensemble.
+8. test_iter_solve_chunks_match_solve
+   - Checks that the chunks from iter_solve() are DoublePendulumResults,
+     cover the solve() grid without overlap and reproduce solve() with the
+     same tolerances for an adaptive, a fixed-step and a symplectic method.
+9. test_save_and_load_round_trip
+   - Saves a DoublePendulumResults and loads it back memory-mapped with the
+     same parameters and trajectory.
+10. test_exact_kinetic_energy
+   - The closed-form kinetic energy (with the chain coupling term) equals
+     0.5 * |v|^2 of the exact velocities and is close to the
+     finite-difference version.
 
 Structure
 - Both tests use 'pytest.mark.parametrize' to efficiently test multiple
@@ -139,3 +165,162 @@ def test_solve_double_pendulum_function_zero_ic(
     assert np.allclose(result.x2, 0.0)
     assert np.allclose(result.y1, -L1)
     assert np.allclose(result.y2, -(L1 + L2))
+
+
+def test_solve_many_rejects_wrong_shape() -> None:
+    """
+    solve_many() needs U0 with shape (K, num_states).
+
+    Run test:
+        pytest test_double_pendulum.py::test_solve_many_rejects_wrong_shape
+    """
+    model = DoublePendulum()
+    with pytest.raises(InvalidInitialConditionError):
+        model.solve_many(np.zeros(4), T=1.0, dt=0.1)
+    with pytest.raises(InvalidInitialConditionError):
+        model.solve_many(np.zeros((3, 2)), T=1.0, dt=0.1)
+
+    result = model.solve_many(np.zeros((3, 4)), T=1.0, dt=0.1)
+    assert result.theta1.shape == (3, result.num_timepoints)
+    assert np.allclose(result.y2, -2.0)
+
+
+def test_vectorized_rhs_matches_columns() -> None:
+    """
+    Check the vectorized RHS contract used by the implicit solvers.
+
+    Run test:
+        pytest test_double_pendulum.py::test_vectorized_rhs_matches_columns
+    """
+    model = DoublePendulum(L1=1.5, L2=0.7)
+    assert model.vectorized
+    u = np.array(
+        [[0.0, 0.5, np.pi / 6], [0.25, 0.25, 0.35], [0.5, 0.0, 0.0], [0.15, 0.15, 0.0]]
+    )
+    d = model(0, u)
+
+    assert d.shape == u.shape
+    for k in range(u.shape[1]):
+        assert np.allclose(d[:, k], model(0, u[:, k]), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "u",
+    [
+        np.array([np.pi / 6, 0.35, 0.0, 0.0]),
+        np.array([0.3, 0.7, -1.1, 1.9]),
+    ],
+)
+def test_jacobian_matches_finite_differences(u: np.ndarray) -> None:
+    """
+    Check the closed-form Jacobian against central differences.
+
+    Run test:
+        pytest test_double_pendulum.py::test_jacobian_matches_finite_differences
+    """
+    model = DoublePendulum(L1=1.5, L2=0.7, g=3.71)
+    h = 1e-6
+    J_fd = np.column_stack(
+        [(model(0, u + h * e) - model(0, u - h * e)) / (2 * h) for e in np.eye(4)]
+    )
+    assert np.allclose(model.jacobian(0, u), J_fd, rtol=1e-6, atol=1e-8)
+
+
+def test_radau_with_jacobian_matches_rk45() -> None:
+    """
+    Radau (which receives the exact Jacobian) and RK45 should agree.
+
+    Run test:
+        pytest test_double_pendulum.py::test_radau_with_jacobian_matches_rk45
+    """
+    model = DoublePendulum()
+    u0 = np.array([np.pi / 6, 0.35, 0.0, 0.0])
+    radau = model.solve(u0=u0, T=2.0, dt=0.01, method="Radau")
+    rk45 = model.solve(u0=u0, T=2.0, dt=0.01)
+    assert np.allclose(radau.solution, rk45.solution, atol=5e-2)
+
+
+def test_symplectic_verlet_conserves_energy() -> None:
+    """
+    Check the Hamiltonian form and energy behaviour of method="verlet".
+
+    Run test:
+        pytest test_double_pendulum.py::test_symplectic_verlet_conserves_energy
+    """
+    model = DoublePendulum(L1=1.5, L2=0.7)
+    u = np.array([0.3, 0.7, -1.1, 1.9])
+    q, p = model.to_canonical(u)
+    assert np.allclose(model.from_canonical(q, p), u)
+
+    def energy(r: DoublePendulumResults) -> np.ndarray:
+        theta1, omega1, theta2, omega2 = r.solution
+        T = (
+            r.L1**2 * omega1**2
+            + 0.5 * r.L2**2 * omega2**2
+            + r.L1 * r.L2 * omega1 * omega2 * np.cos(theta2 - theta1)
+        )
+        V = -2 * r.g * r.L1 * np.cos(theta1) - r.g * r.L2 * np.cos(theta2)
+        return T + V
+
+    u0 = np.array([np.pi / 6, 0.35, 0.0, 0.0])
+    result = model.solve(u0=u0, T=20.0, dt=0.01, method="verlet")
+    assert isinstance(result, DoublePendulumResults)
+    E = energy(result)
+    assert np.max(np.abs(E - E[0])) < 1e-2
+
+    ensemble = model.solve_many(np.stack([u0, u]), T=2.0, dt=0.01, method="verlet")
+    assert ensemble.theta1.shape == (2, ensemble.num_timepoints)
+    assert np.allclose(ensemble.solution[:, 0], result.solution[:, :201])
+
+
+@pytest.mark.parametrize("method", ["RK45", "Radau", "rk4", "verlet"])
+def test_iter_solve_chunks_match_solve(method: str) -> None:
+    """
+    Run test:
+        pytest test_double_pendulum.py::test_iter_solve_chunks_match_solve
+    """
+    model = DoublePendulum()
+    u0 = np.array([np.pi / 6, 0.35, 0.0, 0.0])
+    tolerances = dict(rtol=1e-8, atol=1e-10)
+    full = model.solve(u0=u0, T=3.0, dt=0.01, method=method, **tolerances)
+    chunks = list(
+        model.iter_solve(u0=u0, T=3.0, dt=0.01, method=method, chunk=64, **tolerances)
+    )
+
+    assert all(isinstance(c, DoublePendulumResults) for c in chunks)
+    assert [c.num_timepoints for c in chunks[:-1]] == [64] * (len(chunks) - 1)
+    assert np.allclose(np.concatenate([c.time for c in chunks]), full.time)
+    solution = np.concatenate([c.solution for c in chunks], axis=1)
+    assert np.allclose(solution, full.solution, rtol=1e-10, atol=1e-12)
+    assert chunks[0].total_energy.shape == (64,)
+
+
+def test_save_and_load_round_trip(tmp_path) -> None:
+    """
+    Run test:
+        pytest test_double_pendulum.py::test_save_and_load_round_trip
+    """
+    model = DoublePendulum(L1=1.5, L2=0.7, g=9.81)
+    result = model.solve(u0=np.array([np.pi / 6, 0.35, 0.0, 0.0]), T=1.0, dt=0.01)
+    result.save(str(tmp_path))
+
+    loaded = DoublePendulumResults.load(str(tmp_path))
+    assert (loaded.L1, loaded.L2, loaded.g) == (1.5, 0.7, 9.81)
+    assert np.array_equal(loaded.solution, result.solution)
+    assert np.array_equal(loaded.theta2[10:20], result.theta2[10:20])
+
+
+def test_exact_kinetic_energy() -> None:
+    """
+    Run test:
+        pytest test_double_pendulum.py::test_exact_kinetic_energy
+    """
+    model = DoublePendulum(L1=1.5, L2=0.7)
+    result = model.solve(u0=np.array([0.3, 0.7, -1.1, 1.9]), T=2.0, dt=0.001)
+    K = 0.5 * (result.vx1**2 + result.vy1**2 + result.vx2**2 + result.vy2**2)
+    assert np.allclose(result.kinetic_energy, K)
+
+    result.velocity_method = "gradient"
+    # The solver error enters the finite differences, and np.gradient is only
+    # first order at the end points, so compare the interior loosely
+    assert np.allclose(result.kinetic_energy[1:-1], K[1:-1], atol=5e-2)
@@ -34,6 +34,21 @@ Contents:
     - Tests that the plotting function plot_ode_solution saves a PNG file
       to disk when a filename is provided.
     - Confirms that the file is created and deletes it after the test.
+9. test_jacobian
+    - Checks that the exact Jacobian is -a and that an implicit (BDF)
+      solve using it matches the exact solution.
+10. test_fixed_step_methods (parameterized)
+    - Solves with the in-house fixed-step engine ("rk4", "dopri5") and
+      checks the time grid, the evaluation count and the accuracy
+      against the exact solution.
+11. test_exact_method (parameterized)
+    - Checks that solve(method="exact") returns u0 * exp(-a*t) on the grid
+      (also for a batch from solve_many) and uses it as a cheap reference
+      for the numerical methods.
+12. test_downsample_minmax
+    - Checks that a long noisy curve is reduced to at most max_points points
+      in time order, that the global and per-bucket extrema survive,
+      and that short curves and max_points=None are left unchanged.
 
 Dependencies:
 - numpy
@@ -53,7 +68,7 @@ import pytest
 from pathlib import Path
 from typing import List, Tuple
 from exp_decay import ExponentialDecay
-from ode import InvalidInitialConditionError, plot_ode_solution
+from ode import InvalidInitialConditionError, downsample_minmax, plot_ode_solution
 
 
 # Cases for testing: (a, u0_scalar, T, dt)
@@ -221,3 +236,88 @@ def test_plot_ode_solution_saves_file() -> None:
     assert filename.is_file()
     # Delete the file
     filename.unlink()
+
+
+def test_jacobian() -> None:
+    """
+    Run with:
+        pytest test_exp_decay.py::test_jacobian
+    """
+    model = ExponentialDecay(0.4)
+    assert model.has_jacobian
+    assert np.allclose(model.jacobian(0.0, np.array([3.2])), [[-0.4]])
+    assert model.jacobian(0.0, np.ones((1, 5))).shape == (1, 1, 5)
+
+    result = model.solve(np.array([3.2]), T=5.0, dt=0.1, method="BDF")
+    y_exact = 3.2 * np.exp(-0.4 * result.time)
+    assert np.allclose(result.solution[0], y_exact, rtol=1e-2)
+
+
+@pytest.mark.parametrize("method, stages", [("rk4", 4), ("dopri5", 6)])
+def test_fixed_step_methods(method: str, stages: int) -> None:
+    """
+    Run with:
+        pytest test_exp_decay.py::test_fixed_step_methods
+    """
+    a, u0_s, T, dt = 0.4, 3.2, 10.0, 0.01
+    model = ExponentialDecay(a)
+    result = model.solve(np.array([u0_s]), T=T, dt=dt, method=method)
+
+    assert result.time[0] == pytest.approx(0.0)
+    assert result.time[-1] == pytest.approx(T)
+    assert result.solution.shape == (1, len(result.time))
+
+    y = result.solution[0]
+    y_exact = u0_s * np.exp(-a * result.time)
+    relative_error = np.linalg.norm(y - y_exact) / np.linalg.norm(y_exact)
+    assert relative_error <= 1e-9
+
+
+@pytest.mark.parametrize(
+    "method, tol",
+    [
+        ("RK45", 1e-2),
+        ("Radau", 1e-2),
+        ("rk4", 1e-9),
+    ],
+)
+def test_exact_method(method: str, tol: float) -> None:
+    """
+    Run with:
+        pytest test_exp_decay.py::test_exact_method
+    """
+    a, u0_s, T, dt = 0.4, 3.2, 10.0, 0.01
+    model = ExponentialDecay(a)
+    exact = model.solve(np.array([u0_s]), T=T, dt=dt, method="exact")
+    assert np.allclose(exact.solution[0], u0_s * np.exp(-a * exact.time), rtol=1e-14)
+
+    ensemble = model.solve_many(np.array([[u0_s], [1.0]]), T=T, dt=dt, method="exact")
+    assert ensemble.solution.shape == (1, 2, len(exact.time))
+
+    result = model.solve(np.array([u0_s]), T=T, dt=dt, method=method)
+    diff = np.linalg.norm(result.solution - exact.solution)
+    assert diff / np.linalg.norm(exact.solution) <= tol
+
+
+def test_downsample_minmax() -> None:
+    """
+    Run with:
+        pytest test_exp_decay.py::test_downsample_minmax
+    """
+    rng = np.random.default_rng(1)
+    t = np.linspace(0.0, 100.0, 1_000_003)
+    y = np.sin(t) + 0.1 * rng.normal(size=t.size)
+
+    t_small, y_small = downsample_minmax(t, y, max_points=2000)
+    assert len(y_small) <= 2000
+    assert np.all(np.diff(t_small) > 0)
+    assert y_small.max() == y.max() and y_small.min() == y.min()
+    assert np.isin(t_small, t).all()
+
+    # Every bucket keeps its own extrema, so the envelope is preserved
+    size = len(y) // 1000
+    assert y[:size].max() in y_small and y[:size].min() in y_small
+
+    short_t, short_y = downsample_minmax(t[:100], y[:100], max_points=2000)
+    assert np.array_equal(short_t, t[:100]) and np.array_equal(short_y, y[:100])
+    assert downsample_minmax(t, y, None)[1] is y
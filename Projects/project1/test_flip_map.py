@@ -0,0 +1,147 @@
+"""
+test_flip_map.py
+================
+
+This file contains unit tests for the double pendulum flip map in
+flip_map.py.
+
+Overview of Tests
+1. test_flip_times_match_single_solves
+    - Every flip time of a small grid equals the first time an "rk4" solve
+      of that initial condition has |θ1| or |θ2| above π, and the members
+      without a flip time do not flip before T.
+2. test_energy_precheck_skips_low_energy
+    - Initial conditions with too little energy to flip are never
+      integrated and get NaN, and the bound is tight for a single arm.
+3. test_process_pool_matches_serial
+    - Spreading the grid over a process pool in small chunks gives the same
+      image as the serial computation.
+4. test_invalid_arguments_raise
+    - Empty grids, angles outside [-π, π], unknown methods and non-positive
+      T or dt raise ValueError.
+5. test_integrate_until_matches_fixed_step_engine
+    - ode.integrate_until() takes the same steps as integrate_fixed_step():
+      stop indices and final states agree (up to rounding) with the full
+      trajectories, also after members have been dropped.
+
+Dependencies
+- numpy
+- pytest
+
+Run all tests with:
+    pytest test_flip_map.py -v
+"""
+
+import numpy as np
+import pytest
+import flip_map as fm
+from double_pendulum import DoublePendulum
+from flip_map import FlipMap, can_flip, flip_map
+from ode import integrate_fixed_step, integrate_until
+from pendulum import Pendulum
+
+ANGLES = np.linspace(-3.0, 3.0, 9)
+
+
+def test_flip_times_match_single_solves() -> None:
+    """
+    Run with:
+        pytest test_flip_map.py::test_flip_times_match_single_solves
+    """
+    result = flip_map(ANGLES, ANGLES[:7], T=4.0, dt=0.01, L2=0.8, max_workers=1)
+    assert isinstance(result, FlipMap)
+    assert result.flip_time.shape == (7, 9)
+    assert 0 < result.flipped.sum() < result.flip_time.size
+
+    model = DoublePendulum(L1=1.0, L2=0.8)
+    for j, theta2 in enumerate(ANGLES[:7]):
+        for i, theta1 in enumerate(ANGLES):
+            u0 = np.array([theta1, 0.0, theta2, 0.0])
+            solution = model.solve(u0, T=4.0, dt=0.01, method="rk4")
+            over = np.any(np.abs(solution.solution[[0, 2]]) > np.pi, axis=0)
+            if result.flipped[j, i]:
+                assert result.flip_time[j, i] == solution.time[np.argmax(over)]
+            else:
+                assert not over.any()
+
+
+def test_energy_precheck_skips_low_energy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Run with:
+        pytest test_flip_map.py::test_energy_precheck_skips_low_energy
+    """
+    integrated = []
+
+    def recording_chunk(L1, L2, g, theta1, theta2, *args):
+        integrated.extend(zip(theta1, theta2))
+        return original(L1, L2, g, theta1, theta2, *args)
+
+    original = fm._flip_chunk
+    monkeypatch.setattr(fm, "_flip_chunk", recording_chunk)
+    result = flip_map(ANGLES, ANGLES, T=1.0, dt=0.01, max_workers=1)
+
+    grid1, grid2 = np.meshgrid(ANGLES, ANGLES)
+    possible = can_flip(grid1, grid2, 1.0, 1.0, 9.81)
+    assert 0 < len(integrated) == possible.sum() < possible.size
+    assert np.all(np.isnan(result.flip_time[~possible]))
+
+    # Equal arms: the second arm alone can just reach the top (θ1 = 0,
+    # θ2 = π), so a slightly smaller θ2 is excluded
+    assert can_flip(0.0, np.pi, 1.0, 1.0, 9.81)
+    assert not can_flip(0.0, np.pi - 1e-6, 1.0, 1.0, 9.81)
+
+
+def test_process_pool_matches_serial() -> None:
+    """
+    Run with:
+        pytest test_flip_map.py::test_process_pool_matches_serial
+    """
+    serial = flip_map(ANGLES, ANGLES, T=2.0, dt=0.02, method="dopri5", max_workers=1)
+    pooled = flip_map(
+        ANGLES, ANGLES, T=2.0, dt=0.02, method="dopri5", max_workers=2, chunk_size=5
+    )
+    assert np.array_equal(serial.flip_time, pooled.flip_time, equal_nan=True)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(theta1=[]),
+        dict(theta2=[0.0, 3.5]),
+        dict(method="RK45"),
+        dict(T=0.0),
+        dict(dt=-0.01),
+        dict(L1=0.0),
+    ],
+)
+def test_invalid_arguments_raise(kwargs: dict) -> None:
+    """
+    Run with:
+        pytest test_flip_map.py::test_invalid_arguments_raise
+    """
+    args = dict(theta1=ANGLES, theta2=ANGLES, T=1.0, dt=0.01, max_workers=1)
+    with pytest.raises(ValueError):
+        flip_map(**{**args, **kwargs})
+
+
+@pytest.mark.parametrize("method", ["rk4", "dopri5"])
+def test_integrate_until_matches_fixed_step_engine(method: str) -> None:
+    """
+    Run with:
+        pytest test_flip_map.py::test_integrate_until_matches_fixed_step_engine
+    """
+    model = Pendulum(L=1.0, g=9.81)
+    U0 = np.array([[0.0, 0.3, 1.0, 2.0, 3.0], [-1.0, 0.0, 0.0, 0.0, 0.0]])
+    t_eval = 0.01 * np.arange(201)
+
+    def below(t: float, u: np.ndarray) -> np.ndarray:
+        return u[0] < -0.5
+
+    stop_index, final = integrate_until(model, U0, t_eval, below, method)
+    y = integrate_fixed_step(model, U0, t_eval, method).y
+    for k in range(U0.shape[1]):
+        hits = np.flatnonzero(y[0, k] < -0.5)
+        expected = hits[0] if hits.size else -1
+        assert stop_index[k] == expected
+        assert np.allclose(final[:, k], y[:, k, expected], rtol=1e-13, atol=1e-15)
+    assert np.sum(stop_index >= 0) == 3
@@ -0,0 +1,221 @@
+"""
+test_kernels.py
+===============
+
+This file contains unit tests for the compiled backend in kernels.py, the
+RHS kernels of the models and their scalar rhs_into() fast path. The tests run both with and without numba:
+without it the kernels and the integration loop are plain Python
+functions, which is slow but gives the same numbers.
+
+Overview of Tests
+1. test_kernel_matches_rhs
+   - For every shipped model, checks that the kernel writes the same
+     derivatives into its output buffer as the model's __call__.
+2. test_compiled_loop_matches_numpy_engine
+   - Runs kernels.integrate_fixed_step for a single initial condition and
+     for a batch, and compares with the NumPy fixed-step engine in ode.py.
+3. test_rhs_into_matches_call
+   - The scalar rhs_into() writes exactly (bit for bit) the derivatives of
+     __call__ into its buffer, for many random states.
+4. test_solvers_use_rhs_into
+   - The solve_ivp and fixed-step paths give identical trajectories with
+     the rhs_into() fast path and with __call__.
+5. test_inherited_kernel_is_ignored
+   - A subclass that only overrides __call__ does not use its parent's
+     kernel, so the fixed-step methods integrate its own equations even
+     when numba is available.
+6. test_inherited_rhs_into_is_ignored
+   - The same subclass does not use its parent's rhs_into(): solve() with
+     RK45 and rk4 integrates its own __call__ and differs from the plain
+     Pendulum.
+7. test_inherited_hamiltonian_is_ignored
+   - The same subclass does not use its parent's Hamiltonian: it is not
+     Hamiltonian and the symplectic methods raise ValueError instead of
+     integrating the plain Pendulum.
+8. test_inherited_exact_solution_is_ignored
+   - The same subclass has no exact solution: solve(method="exact") raises
+     ValueError instead of returning the small-angle Pendulum solution.
+9. test_inherited_jacobian_is_ignored
+   - The same subclass does not pass its parent's Jacobian to the implicit
+     solvers, which then estimate it by finite differences.
+
+Dependencies
+- numpy
+- pytest
+- numba (optional)
+
+Run all tests with:
+    pytest test_kernels.py -v
+"""
+
+import numpy as np
+import pytest
+import kernels
+from scipy.integrate import solve_ivp
+from ode import FIXED_STEP_METHODS, ODEModel, integrate_fixed_step
+from exp_decay import ExponentialDecay
+from linear import LinearODEModel
+from pendulum import Pendulum, DampenedPendulum
+from double_pendulum import DoublePendulum
+
+
+class DrivenPendulum(Pendulum):
+    """
+    Pendulum with a constant driving torque, overrides only __call__.
+    """
+
+    def __call__(self, t: float, u: np.ndarray) -> np.ndarray:
+        du = super().__call__(t, u)
+        du[1] += 1.5
+        return du
+
+
+MODELS_AND_STATES = [
+    (ExponentialDecay(0.4), np.array([3.2])),
+    (LinearODEModel([[0.0, 1.0], [-4.0, -0.1]]), np.array([1.0, -0.5])),
+    (Pendulum(L=1.42, g=9.81), np.array([np.pi / 6, 0.35])),
+    (DampenedPendulum(L=2.0, g=3.81, B=0.7), np.array([-1.0, 2.0])),
+    (DoublePendulum(L1=1.5, L2=0.7, g=9.81), np.array([0.3, 0.7, -1.1, 1.9])),
+]
+
+
+@pytest.mark.parametrize("model, u", MODELS_AND_STATES)
+def test_kernel_matches_rhs(model, u: np.ndarray) -> None:
+    """
+    Run with:
+        pytest test_kernels.py::test_kernel_matches_rhs
+    """
+    out = np.empty_like(u)
+    model.kernel(0.0, u, model.kernel_params(), out)
+    assert np.allclose(out, model(0.0, u), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("model, u", MODELS_AND_STATES)
+def test_compiled_loop_matches_numpy_engine(model, u: np.ndarray) -> None:
+    """
+    Run with:
+        pytest test_kernels.py::test_compiled_loop_matches_numpy_engine
+    """
+    t_eval = np.arange(0, 0.5 + 0.01, 0.01)
+    tableau = FIXED_STEP_METHODS["rk4"]
+    params = model.kernel_params()
+
+    y = kernels.integrate_fixed_step(model.kernel, params, u, t_eval, *tableau)
+    expected = integrate_fixed_step(model, u, t_eval, "rk4").y
+    assert np.allclose(y, expected, rtol=1e-12, atol=1e-12)
+
+    U = np.stack([u, 0.5 * u], axis=1)
+    Y = kernels.integrate_fixed_step(model.kernel, params, U, t_eval, *tableau)
+    assert Y.shape == U.shape + t_eval.shape
+    assert np.allclose(Y[:, 0], expected, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("model, u", MODELS_AND_STATES)
+def test_rhs_into_matches_call(model, u: np.ndarray) -> None:
+    """
+    Run with:
+        pytest test_kernels.py::test_rhs_into_matches_call
+    """
+    rng = np.random.default_rng(3)
+    out = np.empty_like(u)
+    for state in rng.uniform(-4.0, 4.0, size=(500, len(u))):
+        assert model.rhs_into(0.3, state, out) is out
+        assert np.array_equal(out, model(0.3, state))
+    assert model.has_rhs_into
+
+
+@pytest.mark.parametrize("model, u", MODELS_AND_STATES)
+@pytest.mark.parametrize("method", ["RK45", "Radau", "rk4"])
+def test_solvers_use_rhs_into(
+    model, u: np.ndarray, method: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Run with:
+        pytest test_kernels.py::test_solvers_use_rhs_into
+    """
+    fast = model.solve(u0=u, T=1.0, dt=0.01, method=method)
+    monkeypatch.setattr(type(model), "rhs_into", ODEModel.rhs_into)
+    assert not model.has_rhs_into
+    slow = model.solve(u0=u, T=1.0, dt=0.01, method=method)
+    assert np.array_equal(fast.solution, slow.solution)
+
+
+def test_inherited_kernel_is_ignored(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Run with:
+        pytest test_kernels.py::test_inherited_kernel_is_ignored
+    """
+    assert Pendulum().has_kernel and DampenedPendulum(B=0.5).has_kernel
+    model = DrivenPendulum()
+    assert not model.has_kernel
+
+    monkeypatch.setattr(kernels, "NUMBA_AVAILABLE", True)
+    u0, t_eval = np.array([0.3, 0.0]), np.arange(0, 1.0 + 0.01, 0.01)
+    driven = model._solve_fixed_step(model, u0, t_eval, "rk4")
+    plain = Pendulum()._solve_fixed_step(Pendulum(), u0, t_eval, "rk4")
+    expected = integrate_fixed_step(model, u0, t_eval, "rk4")
+    assert np.array_equal(driven.y, expected.y)
+    assert not np.allclose(driven.y, plain.y)
+
+
+@pytest.mark.parametrize("method", ["RK45", "rk4"])
+def test_inherited_rhs_into_is_ignored(method: str) -> None:
+    """
+    Run with:
+        pytest test_kernels.py::test_inherited_rhs_into_is_ignored
+    """
+    assert Pendulum().has_rhs_into and DampenedPendulum(B=0.5).has_rhs_into
+    model = DrivenPendulum()
+    assert not model.has_rhs_into
+
+    u0 = np.array([0.3, 0.0])
+    driven = model.solve(u0=u0, T=1.0, dt=0.01, method=method)
+    plain = Pendulum().solve(u0=u0, T=1.0, dt=0.01, method=method)
+    assert not np.allclose(driven.solution, plain.solution)
+    if method == "rk4":
+        expected = integrate_fixed_step(model, u0, driven.time, method).y
+    else:
+        expected = solve_ivp(model, (0, 1.0), u0, t_eval=driven.time).y
+    assert np.array_equal(driven.solution, expected)
+
+
+@pytest.mark.parametrize("method", ["verlet", "yoshida4"])
+def test_inherited_hamiltonian_is_ignored(method: str) -> None:
+    """
+    Run with:
+        pytest test_kernels.py::test_inherited_hamiltonian_is_ignored
+    """
+    model = DrivenPendulum()
+    assert model.hamiltonian and not model.has_hamiltonian
+    assert Pendulum().has_hamiltonian and DoublePendulum().has_hamiltonian
+    with pytest.raises(ValueError):
+        model.solve(u0=np.array([0.3, 0.0]), T=1.0, dt=0.01, method=method)
+
+
+def test_inherited_exact_solution_is_ignored() -> None:
+    """
+    Run with:
+        pytest test_kernels.py::test_inherited_exact_solution_is_ignored
+    """
+    model = DrivenPendulum()
+    assert not model.has_exact_solution
+    assert Pendulum().has_exact_solution and DampenedPendulum().has_exact_solution
+    with pytest.raises(ValueError, match="exact_solution"):
+        model.solve(u0=np.array([0.3, 0.0]), T=1.0, dt=0.01, method="exact")
+
+
+@pytest.mark.parametrize("method", ["Radau", "BDF", "LSODA"])
+def test_inherited_jacobian_is_ignored(method: str) -> None:
+    """
+    Run with:
+        pytest test_kernels.py::test_inherited_jacobian_is_ignored
+    """
+    model = DrivenPendulum()
+    assert not model.has_jacobian
+    assert "jac" in Pendulum()._ivp_options(method)[1]
+    assert "jac" not in model._ivp_options(method)[1]
+
+    u0 = np.array([0.3, 0.0])
+    result = model.solve(u0=u0, T=1.0, dt=0.01, method=method)
+    expected = solve_ivp(model, (0, 1.0), u0, method=method, t_eval=result.time).y
+    assert np.array_equal(result.solution, expected)
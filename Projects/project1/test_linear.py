@@ -0,0 +1,131 @@
+"""
+test_linear.py
+==============
+
+This file contains unit tests for the LinearODEModel in linear.py.
+
+Overview of Tests
+1. test_exact_method_harmonic_oscillator
+   - Solves the harmonic oscillator x'' = -x with method="exact" and
+     compares with cos(t), -sin(t), and with a numerical RK45 solve.
+2. test_propagator_is_cached
+   - The propagator expm(A dt) is computed once per (A, dt) and shared
+     by solves and by models with the same A.
+3. test_batched_exact_solve_matches_single
+   - solve_many(method="exact") (one matrix-matrix product per step)
+     equals single solves, and non-uniform times use expm directly.
+4. test_exponential_decay_is_linear_model
+   - ExponentialDecay is a LinearODEModel with A = [[-a]].
+5. test_invalid_matrix_raises
+   - A must be a non-empty square 2D array.
+6. test_implicit_methods_use_jacobian
+   - jacobian() returns A for a single state and a (n, n, k) stack for a
+     batch, and Radau, BDF and LSODA solve with it.
+
+Dependencies
+- numpy
+- scipy
+- pytest
+
+Run all tests with:
+    pytest test_linear.py -v
+"""
+
+import numpy as np
+import pytest
+from scipy.linalg import expm
+from linear import LinearODEModel
+from exp_decay import ExponentialDecay
+
+OSCILLATOR = np.array([[0.0, 1.0], [-1.0, 0.0]])
+
+
+def test_exact_method_harmonic_oscillator() -> None:
+    """
+    Run with:
+        pytest test_linear.py::test_exact_method_harmonic_oscillator
+    """
+    model = LinearODEModel(OSCILLATOR)
+    result = model.solve(u0=np.array([1.0, 0.0]), T=10.0, dt=0.01, method="exact")
+
+    assert result.solution.shape == (2, len(result.time))
+    assert np.allclose(result.solution[0], np.cos(result.time), atol=1e-12)
+    assert np.allclose(result.solution[1], -np.sin(result.time), atol=1e-12)
+
+    u0 = np.array([1.0, 0.0])
+    numerical = model.solve(u0=u0, T=10.0, dt=0.01, rtol=1e-10, atol=1e-12)
+    assert np.allclose(numerical.solution, result.solution, atol=1e-6)
+
+
+def test_propagator_is_cached() -> None:
+    """
+    Run with:
+        pytest test_linear.py::test_propagator_is_cached
+    """
+    model = LinearODEModel(OSCILLATOR)
+    P = model.propagator(0.01)
+    assert np.allclose(P, expm(OSCILLATOR * 0.01))
+    assert model.propagator(0.01) is P
+    assert LinearODEModel(OSCILLATOR.copy()).propagator(0.01) is P
+    assert model.propagator(0.02) is not P
+    with pytest.raises(ValueError):
+        P[0, 0] = 1.0
+
+
+def test_batched_exact_solve_matches_single() -> None:
+    """
+    Run with:
+        pytest test_linear.py::test_batched_exact_solve_matches_single
+    """
+    rng = np.random.default_rng(0)
+    A = rng.normal(size=(4, 4)) - 2 * np.eye(4)
+    model = LinearODEModel(A)
+    U0 = rng.normal(size=(5, 4))
+    ensemble = model.solve_many(U0, T=3.0, dt=0.05, method="exact")
+
+    assert ensemble.solution.shape == (4, 5, len(ensemble.time))
+    for k, u0 in enumerate(U0):
+        single = model.solve(u0=u0, T=3.0, dt=0.05, method="exact")
+        assert np.allclose(ensemble.solution[:, k], single.solution, rtol=1e-12)
+
+    t = np.array([0.0, 0.1, 0.5, 2.9])
+    y = model.exact_solution(t, U0[0])
+    assert np.allclose(y[:, -1], expm(A * 2.9) @ U0[0])
+    assert np.allclose(y[:, 3], ensemble.solution[:, 0, 58])
+
+
+def test_exponential_decay_is_linear_model() -> None:
+    """
+    Run with:
+        pytest test_linear.py::test_exponential_decay_is_linear_model
+    """
+    model = ExponentialDecay(0.4)
+    assert isinstance(model, LinearODEModel)
+    assert np.array_equal(model.A, [[-0.4]])
+    assert np.allclose(model.propagator(0.1), np.exp(-0.04))
+
+
+@pytest.mark.parametrize("A", [np.zeros((2, 3)), np.zeros(3), np.zeros((0, 0))])
+def test_invalid_matrix_raises(A: np.ndarray) -> None:
+    """
+    Run with:
+        pytest test_linear.py::test_invalid_matrix_raises
+    """
+    with pytest.raises(ValueError):
+        LinearODEModel(A)
+
+
+@pytest.mark.parametrize("method", ["Radau", "BDF", "LSODA"])
+def test_implicit_methods_use_jacobian(method: str) -> None:
+    """
+    Run with:
+        pytest test_linear.py::test_implicit_methods_use_jacobian
+    """
+    model = LinearODEModel(OSCILLATOR)
+    assert np.array_equal(model.jacobian(0.0, np.ones(2)), OSCILLATOR)
+    J = model.jacobian(0.0, np.ones((2, 3)))
+    assert J.shape == (2, 2, 3) and np.array_equal(J[..., 2], OSCILLATOR)
+
+    u0 = np.array([1.0, 0.0])
+    result = model.solve(u0=u0, T=2.0, dt=0.01, method=method, rtol=1e-8, atol=1e-10)
+    assert np.allclose(result.solution[0], np.cos(result.time), atol=1e-5)
@@ -0,0 +1,84 @@
+"""
+test_lyapunov.py
+================
+
+This file contains unit tests for the Lyapunov spectrum estimator in
+lyapunov.py.
+
+Overview of Tests
+1. test_double_pendulum_spectrum_regular_vs_chaotic
+   - A small swing of the double pendulum is regular (largest exponent
+     close to 0), a large swing is chaotic (clearly positive). As a
+     Hamiltonian system the spectrum comes in ± pairs that sum to 0.
+2. test_batched_estimate_matches_single_runs
+   - Estimating a batch gives the same exponents as estimating every
+     initial condition on its own, and max_lyapunov_map() returns the
+     largest exponents on the (θ1, θ2) grid.
+3. test_lyapunov_spectrum_validates_input
+   - Wrong U0 shapes and non-positive T raise errors.
+
+Dependencies
+- numpy
+- pytest
+
+Run all tests with:
+    pytest test_lyapunov.py -v
+"""
+
+import numpy as np
+import pytest
+from ode import InvalidInitialConditionError
+from double_pendulum import DoublePendulum
+from lyapunov import lyapunov_spectrum, max_lyapunov_map
+
+
+def test_double_pendulum_spectrum_regular_vs_chaotic() -> None:
+    """
+    Run with:
+        pytest test_lyapunov.py::test_double_pendulum_spectrum_regular_vs_chaotic
+    """
+    model = DoublePendulum()
+    U0 = np.array([[0.1, 0.0, 0.1, 0.0], [2.0, 0.0, 2.5, 0.0]])
+    spectrum = lyapunov_spectrum(model, U0, T=40.0, dt=0.01)
+
+    assert spectrum.shape == (2, 4)
+    assert np.all(np.diff(spectrum, axis=1) <= 0)
+    assert abs(spectrum[0, 0]) < 0.05
+    assert spectrum[1, 0] > 0.5
+    assert np.allclose(spectrum.sum(axis=1), 0.0, atol=0.05)
+    assert spectrum[1, 0] == pytest.approx(-spectrum[1, -1], rel=0.05)
+
+
+def test_batched_estimate_matches_single_runs() -> None:
+    """
+    Run with:
+        pytest test_lyapunov.py::test_batched_estimate_matches_single_runs
+    """
+    model = DoublePendulum(L1=1.5, L2=0.7)
+    U0 = np.array([[0.3, 0.7, -1.1, 1.9], [1.0, 0.0, 2.0, 0.0]])
+    batch = lyapunov_spectrum(model, U0, T=2.0, dt=0.01, transient=0.5)
+    for k in range(len(U0)):
+        single = lyapunov_spectrum(model, U0[k : k + 1], T=2.0, dt=0.01, transient=0.5)
+        assert np.allclose(batch[k], single[0], rtol=1e-10, atol=1e-12)
+
+    theta1, theta2 = np.array([0.3, 1.0]), np.array([-1.1, 0.0, 2.0])
+    chaos_map = max_lyapunov_map(model, theta1, theta2, T=2.0, dt=0.01)
+    assert chaos_map.shape == (2, 3)
+    U0_grid = np.array([[1.0, 0.0, 2.0, 0.0]])
+    assert chaos_map[1, 2] == pytest.approx(
+        lyapunov_spectrum(model, U0_grid, T=2.0, dt=0.01)[0, 0]
+    )
+
+
+def test_lyapunov_spectrum_validates_input() -> None:
+    """
+    Run with:
+        pytest test_lyapunov.py::test_lyapunov_spectrum_validates_input
+    """
+    model = DoublePendulum()
+    with pytest.raises(InvalidInitialConditionError):
+        lyapunov_spectrum(model, np.zeros(4), T=1.0)
+    with pytest.raises(InvalidInitialConditionError):
+        lyapunov_spectrum(model, np.zeros((3, 2)), T=1.0)
+    with pytest.raises(ValueError):
+        lyapunov_spectrum(model, np.zeros((3, 4)), T=0.0)
@@ -0,0 +1,159 @@
+"""
+test_n_pendulum.py
+==================
+
+This file contains unit tests for the N-link pendulum in n_pendulum.py.
+
+Overview of Tests
+1. test_two_links_match_double_pendulum
+   - With two unit masses the RHS and the energies equal DoublePendulum.
+2. test_one_link_matches_pendulum
+   - With one link the RHS equals Pendulum.
+3. test_rhs_matches_dense_mass_matrix
+   - For random lengths, masses and states the O(N) tension formulation
+     gives the same accelerations as solving the dense Lagrangian mass
+     matrix system, for a single state and a (2N, k) batch.
+4. test_chain_conserves_energy
+   - A 20-link chain solved with DOP853 keeps its total energy, and the
+     per-link coordinates have shape (N, T) with |r_i - r_{i-1}| = l_i.
+5. test_invalid_parameters_raise
+   - Empty, non-positive or mismatched lengths and masses and a negative
+     g raise ValueError.
+6. test_save_and_load_round_trip
+   - Saves an NPendulumResults and loads it back with the same lengths,
+     masses and trajectory.
+
+Dependencies
+- numpy
+- pytest
+
+Run all tests with:
+    pytest test_n_pendulum.py -v
+"""
+
+import numpy as np
+import pytest
+from double_pendulum import DoublePendulum
+from n_pendulum import NPendulum, NPendulumResults
+from pendulum import Pendulum
+
+
+def dense_accelerations(
+    lengths: np.ndarray, masses: np.ndarray, g: float, u: np.ndarray
+) -> np.ndarray:
+    """
+    dω/dt from the dense mass matrix M_ij = l_i l_j cos(θi - θj) S_max(i,j),
+    with S_k = m_k + ... + m_N, in O(N^3).
+    """
+    theta, omega = u[0::2], u[1::2]
+    S = np.cumsum(masses[::-1])[::-1]
+    S_max = S[np.maximum.outer(np.arange(len(S)), np.arange(len(S)))]
+    LL = np.outer(lengths, lengths) * S_max
+    diff = theta[:, None] - theta[None, :]
+    f = -(LL * np.sin(diff)) @ omega**2 - g * lengths * S * np.sin(theta)
+    return np.linalg.solve(LL * np.cos(diff), f)
+
+
+def test_two_links_match_double_pendulum() -> None:
+    """
+    Run with:
+        pytest test_n_pendulum.py::test_two_links_match_double_pendulum
+    """
+    chain = NPendulum(lengths=[1.2, 0.7], g=9.0)
+    double = DoublePendulum(L1=1.2, L2=0.7, g=9.0)
+    rng = np.random.default_rng(1)
+    for u in rng.normal(size=(5, 4)):
+        # DoublePendulum adds 1e-12 to its denominators
+        assert np.allclose(chain(0, u), double(0, u), rtol=1e-9, atol=1e-9)
+
+    u0 = np.array([0.5, 0.0, -0.3, 1.0])
+    a = chain.solve(u0, T=2.0, dt=0.01)
+    b = double.solve(u0, T=2.0, dt=0.01)
+    assert isinstance(a, NPendulumResults)
+    assert np.allclose(a.solution, b.solution, atol=1e-8)
+    assert np.allclose(a.x, [b.x1, b.x2]) and np.allclose(a.y, [b.y1, b.y2])
+    assert np.allclose(a.potential_energy, b.potential_energy)
+    assert np.allclose(a.kinetic_energy, b.kinetic_energy)
+
+
+def test_one_link_matches_pendulum() -> None:
+    """
+    Run with:
+        pytest test_n_pendulum.py::test_one_link_matches_pendulum
+    """
+    chain, single = NPendulum(lengths=[1.3]), Pendulum(L=1.3)
+    for u in np.random.default_rng(2).normal(size=(5, 2)):
+        assert np.allclose(chain(0, u), single(0, u), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("N", [3, 5, 12])
+def test_rhs_matches_dense_mass_matrix(N: int) -> None:
+    """
+    Run with:
+        pytest test_n_pendulum.py::test_rhs_matches_dense_mass_matrix
+    """
+    rng = np.random.default_rng(N)
+    lengths, masses = rng.uniform(0.5, 2.0, N), rng.uniform(0.5, 2.0, N)
+    model = NPendulum(lengths, masses, g=9.81)
+    U = rng.normal(size=(2 * N, 6))
+
+    du = model(0, U)
+    assert du.shape == U.shape
+    assert np.array_equal(du[0::2], U[1::2])
+    for k in range(U.shape[1]):
+        expected = dense_accelerations(lengths, masses, 9.81, U[:, k])
+        assert np.allclose(model(0, U[:, k])[1::2], expected, rtol=1e-9, atol=1e-9)
+        assert np.allclose(du[:, k], model(0, U[:, k]), rtol=1e-12, atol=1e-12)
+
+
+def test_chain_conserves_energy() -> None:
+    """
+    Run with:
+        pytest test_n_pendulum.py::test_chain_conserves_energy
+    """
+    N = 20
+    model = NPendulum(lengths=np.full(N, 0.1), masses=np.linspace(1.0, 0.5, N))
+    u0 = np.zeros(2 * N)
+    u0[0::2] = np.linspace(0.2, 1.2, N)
+    result = model.solve(u0, T=1.0, dt=0.01, method="DOP853", rtol=1e-10, atol=1e-10)
+
+    E = result.total_energy
+    assert np.max(np.abs(E - E[0])) < 1e-6 * abs(E[0])
+    assert result.x.shape == result.link_kinetic_energy.shape == (N, 101)
+    dx = np.diff(np.vstack([np.zeros((1, 101)), result.x]), axis=0)
+    dy = np.diff(np.vstack([np.zeros((1, 101)), result.y]), axis=0)
+    assert np.allclose(np.hypot(dx, dy), 0.1)
+
+
+@pytest.mark.parametrize(
+    "lengths, masses, g",
+    [
+        ([], None, 9.81),
+        ([1.0, 0.0], None, 9.81),
+        ([1.0, 1.0], [1.0], 9.81),
+        ([1.0, 1.0], [1.0, -1.0], 9.81),
+        ([1.0], None, -1.0),
+    ],
+)
+def test_invalid_parameters_raise(lengths: list, masses: list, g: float) -> None:
+    """
+    Run with:
+        pytest test_n_pendulum.py::test_invalid_parameters_raise
+    """
+    with pytest.raises(ValueError):
+        NPendulum(lengths, masses, g)
+
+
+def test_save_and_load_round_trip(tmp_path) -> None:
+    """
+    Run with:
+        pytest test_n_pendulum.py::test_save_and_load_round_trip
+    """
+    model = NPendulum(lengths=[0.5, 0.3, 0.2], masses=[1.0, 2.0, 3.0])
+    result = model.solve(np.array([0.3, 0, 0.2, 0, 0.1, 0]), T=1.0, dt=0.01)
+    result.save(str(tmp_path / "chain"))
+
+    loaded = NPendulumResults.load(str(tmp_path / "chain"))
+    assert loaded.lengths == (0.5, 0.3, 0.2) and loaded.masses == (1.0, 2.0, 3.0)
+    assert np.array_equal(loaded.solution, result.solution)
+    assert np.allclose(loaded.total_energy, result.total_energy)
@@ -25,6 +25,74 @@ Overview of Tests
    - Verifies that computed arrays for potential energy, velocities
      (vx, vy), kinetic energy, and total energy all exist and have the
      correct shape relative to the time array.
+6. test_solve_many_matches_single_solves
+   - Checks that an ensemble solve (solve_many) returns (K, T) arrays
+     that agree with solving every initial condition separately.
+7. test_vectorized_rhs_matches_columns
+   - Checks that calling Pendulum and DampenedPendulum with a
+     (2, k) batch of states equals calling them one column at a time.
+8. test_jacobian_matches_finite_differences
+   - Compares the exact Jacobians of Pendulum and DampenedPendulum with
+     central finite differences of the RHS.
+9. test_symplectic_methods_conserve_energy
+   - Solves with "verlet" and "yoshida4" and checks that the energy stays
+     bounded, that the result is a PendulumResults and that yoshida4
+     agrees with a tight DOP853 reference.
+10. test_symplectic_method_rejects_dampened_pendulum
+   - The damped pendulum is not Hamiltonian, so symplectic methods must
+     raise ValueError.
+11. test_fixed_step_rk4_ensemble_matches_single
+   - The fixed-step engine takes identical steps for every member, so an
+     ensemble rk4 solve must equal single rk4 solves.
+12. test_dense_output_matches_grid_solve
+   - A dense-output solve evaluated at the t_eval grid (materialize) and at
+     arbitrary times (at) must agree with the ordinary grid solve.
+13. test_dense_output_validation
+   - Dense output is rejected for the fixed-step methods, and times outside
+     [0, T] raise ValueError.
+14. test_save_and_load_memory_mapped
+   - Saves a PendulumResults to a directory and loads it back, both
+     memory-mapped and in memory, and checks that loading it as the wrong
+     result type fails.
+15. test_derived_quantities_are_cached
+   - Derived arrays are computed once and reused, and reassigning the
+     solution or a parameter recomputes them.
+16. test_exact_velocities_match_gradient
+   - The closed-form velocities and kinetic energy agree with the
+     finite-difference (velocity_method="gradient") values, and unknown
+     velocity methods raise ValueError.
+17. test_solve_events_find_zero_crossings
+   - Events passed to solve() locate the zero crossings of θ (half a
+     period apart), terminal events stop the integration, and fixed-step
+     methods reject events.
+18. test_period_matches_elliptic_integral
+   - Pendulum.period() agrees with the exact period
+     4 sqrt(L/g) K(sin^2(θ0/2)) from Pendulum.exact_period() for small to
+     large amplitudes.
+19. test_exact_period_reference_values
+   - Pendulum.exact_period() reproduces the small-angle limit and a known
+     value of K, and the damped pendulum has no closed form.
+20. test_exact_method_small_angle_limit
+   - solve(method="exact") gives the linearised solution, which agrees
+     with a tight numerical solve for small swings, for the undamped,
+     underdamped, critically damped and overdamped pendulum.
+21. test_solve_stats
+   - With collect_stats = True the result carries a SolveStats whose RHS
+     calls, Jacobian calls and step counts agree with the solver's own
+     counters; without it result.stats is None.
+22. test_solve_many_tolerances_and_events
+   - solve_many() forwards rtol and atol (tolerances divided by sqrt(K)
+     match a tight solve() of every member) and reports events per member
+     like solve(); fixed-step methods reject events.
+23. test_period_is_batched_and_bounded
+   - period() solves all amplitudes in one solve_many() call, gives the
+     damped small-angle period 2π / sqrt(g/L - B²/4) for an underdamped
+     pendulum, and NaN without integrating for a critically or overdamped
+     one.
+24. test_time_grid_ends_at_T
+   - Every method returns the grid 0, dt, ..., T ending exactly at T, also
+     where n * dt rounds above T, and iter_solve() yields the same grid;
+     a T that is not an integer multiple of dt raises ValueError.
 
 Testing Approach
 - Uses pytest.mark.parametrize for compact coverage of different
@@ -44,6 +112,9 @@ To run a specific test (example):
 
 import numpy as np
 import pytest
+from pathlib import Path
+from scipy.integrate import solve_ivp
+from ode import time_grid
 from pendulum import *
 
 
@@ -163,3 +234,434 @@ def test_pendulum_energy_and_velocities(
     assert result.vy.shape == result.time.shape
     assert result.kinetic_energy.shape == result.time.shape
     assert result.total_energy.shape == result.time.shape
+
+
+def test_solve_many_matches_single_solves() -> None:
+    """
+    An ensemble solve should give (K, T) arrays that agree with
+    solving each initial condition on its own.
+
+    Run with:
+        pytest test_pendulum.py::test_solve_many_matches_single_solves
+    """
+    model = Pendulum(L=1.0, g=9.81)
+    U0 = np.array([[np.pi / 6, 0.35], [0.1, 0.0], [0.0, 0.0], [-0.4, 1.0]])
+    T, dt = 2.0, 0.01
+
+    ensemble = model.solve_many(U0, T=T, dt=dt)
+    assert isinstance(ensemble, PendulumResults)
+    assert ensemble.theta.shape == (len(U0), ensemble.num_timepoints)
+    assert ensemble.total_energy.shape == ensemble.theta.shape
+
+    for k, u0 in enumerate(U0):
+        single = model.solve(u0=u0, T=T, dt=dt)
+        assert np.allclose(ensemble.theta[k], single.theta, atol=1e-2)
+        assert np.allclose(ensemble.omega[k], single.omega, atol=1e-2)
+
+
+@pytest.mark.parametrize("model", [Pendulum(L=1.42), DampenedPendulum(B=0.5)])
+def test_vectorized_rhs_matches_columns(model: Pendulum) -> None:
+    """
+    The vectorized RHS contract: a (2, k) input gives the same result
+    as evaluating each column on its own.
+
+    Run with:
+        pytest test_pendulum.py::test_vectorized_rhs_matches_columns
+    """
+    assert model.vectorized
+    u = np.array([[0.0, np.pi / 6, -1.0], [0.35, 0.0, 2.0]])
+    d = model(0.0, u)
+
+    assert d.shape == u.shape
+    for k in range(u.shape[1]):
+        assert np.allclose(d[:, k], model(0.0, u[:, k]), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "model", [Pendulum(L=1.42, g=9.81), DampenedPendulum(L=2.5, g=3.81, B=0.7)]
+)
+def test_jacobian_matches_finite_differences(model: Pendulum) -> None:
+    """
+    The closed-form Jacobian should agree with central differences.
+
+    Run with:
+        pytest test_pendulum.py::test_jacobian_matches_finite_differences
+    """
+    u = np.array([np.pi / 6, 0.35])
+    h = 1e-6
+    J_fd = np.column_stack(
+        [(model(0.0, u + h * e) - model(0.0, u - h * e)) / (2 * h) for e in np.eye(2)]
+    )
+    assert model.has_jacobian
+    assert np.allclose(model.jacobian(0.0, u), J_fd, rtol=1e-6, atol=1e-8)
+
+
+@pytest.mark.parametrize("method, energy_tol", [("verlet", 1e-3), ("yoshida4", 1e-6)])
+def test_symplectic_methods_conserve_energy(method: str, energy_tol: float) -> None:
+    """
+    Symplectic methods keep the energy error bounded over long runs.
+
+    Run with:
+        pytest test_pendulum.py::test_symplectic_methods_conserve_energy
+    """
+    L, g = 1.0, 9.81
+    model = Pendulum(L=L, g=g)
+    u0 = np.array([np.pi / 6, 0.35])
+    result = model.solve(u0=u0, T=200.0, dt=0.01, method=method)
+
+    assert isinstance(result, PendulumResults)
+    assert result.time[1] - result.time[0] == pytest.approx(0.01)
+    # Energy computed from the state, without finite-difference velocities
+    E = 0.5 * L**2 * result.omega**2 + g * L * (1 - np.cos(result.theta))
+    assert np.max(np.abs(E - E[0])) < energy_tol
+
+    if method == "yoshida4":
+        t = result.time[:501]
+        reference = solve_ivp(
+            model, (0, t[-1]), u0, t_eval=t, method="DOP853", rtol=1e-10, atol=1e-10
+        )
+        assert np.allclose(result.solution[:, :501], reference.y, atol=1e-6)
+
+
+def test_symplectic_method_rejects_dampened_pendulum() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_symplectic_method_rejects_dampened_pendulum
+    """
+    model = DampenedPendulum(B=1.0)
+    with pytest.raises(ValueError):
+        model.solve(u0=np.array([0.1, 0.0]), T=1.0, dt=0.01, method="verlet")
+
+
+def test_fixed_step_rk4_ensemble_matches_single() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_fixed_step_rk4_ensemble_matches_single
+    """
+    model = DampenedPendulum(L=1.0, g=9.81, B=0.5)
+    U0 = np.array([[np.pi / 6, 0.35], [1.0, -0.5], [0.0, 0.0]])
+    ensemble = model.solve_many(U0, T=3.0, dt=0.01, method="rk4")
+
+    for k, u0 in enumerate(U0):
+        single = model.solve(u0=u0, T=3.0, dt=0.01, method="rk4")
+        assert np.allclose(ensemble.solution[:, k], single.solution, rtol=1e-13)
+
+
+def test_dense_output_matches_grid_solve() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_dense_output_matches_grid_solve
+    """
+    model = DampenedPendulum(L=1.42, g=9.81, B=0.3)
+    u0 = np.array([np.pi / 6, 0.35])
+    grid = model.solve(u0=u0, T=10.0, dt=0.01)
+    dense = model.solve(u0=u0, T=10.0, dt=0.01, dense_output=True)
+
+    assert isinstance(dense, DenseResult)
+    assert dense.num_steps < grid.num_timepoints
+    full = dense.materialize()
+    assert isinstance(full, PendulumResults)
+    assert np.allclose(full.time, grid.time)
+    assert np.allclose(full.solution, grid.solution, rtol=1e-10, atol=1e-12)
+
+    sample = dense.at([0.5, 2.0, 7.25])
+    assert np.allclose(sample.theta, grid.theta[[50, 200, 725]], atol=1e-12)
+    assert np.allclose(sample.x, model.L * np.sin(sample.theta))
+    assert dense(2.0).shape == (2,)
+
+    U0 = np.array([[np.pi / 6, 0.35], [1.0, -0.5]])
+    ensemble = model.solve_many(U0, T=2.0, dt=0.01, dense_output=True)
+    assert ensemble.at([1.0, 2.0]).theta.shape == (2, 2)
+
+
+def test_dense_output_validation() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_dense_output_validation
+    """
+    model = Pendulum()
+    u0 = np.array([0.1, 0.0])
+    with pytest.raises(ValueError):
+        model.solve(u0=u0, T=1.0, dt=0.01, method="rk4", dense_output=True)
+
+    dense = model.solve(u0=u0, T=1.0, dt=0.01, dense_output=True)
+    with pytest.raises(ValueError):
+        dense.at([0.5, 1.5])
+
+
+def test_save_and_load_memory_mapped(tmp_path) -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_save_and_load_memory_mapped
+    """
+    model = Pendulum(L=1.42, g=9.81)
+    result = model.solve(u0=np.array([np.pi / 6, 0.35]), T=2.0, dt=0.01)
+    path = str(tmp_path / "run")
+    result.save(path)
+
+    loaded = PendulumResults.load(path)
+    assert isinstance(loaded.solution, np.memmap)
+    assert (loaded.L, loaded.g) == (1.42, 9.81)
+    assert np.array_equal(loaded.solution, result.solution)
+    assert np.allclose(loaded.total_energy, result.total_energy)
+
+    in_memory = PendulumResults.load(path, mmap=False)
+    assert not isinstance(in_memory.solution, np.memmap)
+    assert np.array_equal(in_memory.time, result.time)
+
+    from double_pendulum import DoublePendulumResults
+
+    with pytest.raises(ValueError):
+        DoublePendulumResults.load(path)
+
+
+def test_derived_quantities_are_cached() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_derived_quantities_are_cached
+    """
+    model = Pendulum(L=1.42, g=9.81)
+    result = model.solve(u0=np.array([np.pi / 6, 0.35]), T=2.0, dt=0.01)
+
+    kinetic = result.kinetic_energy
+    assert result.kinetic_energy is kinetic
+    assert np.array_equal(result.total_energy, kinetic + result.potential_energy)
+
+    result.solution = np.zeros_like(result.solution)
+    assert result.kinetic_energy is not kinetic
+    assert np.allclose(result.kinetic_energy, 0.0)
+
+    result.L = 2.0
+    assert np.allclose(result.y, -2.0)
+
+
+def test_exact_velocities_match_gradient() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_exact_velocities_match_gradient
+    """
+    model = Pendulum(L=1.42, g=9.81)
+    result = model.solve(u0=np.array([np.pi / 6, 0.35]), T=5.0, dt=0.001)
+    fd = PendulumResults(result.time, result.solution, result.L, result.g, "gradient")
+
+    assert result.velocity_method == "exact"
+    # The solver error enters the finite differences, and np.gradient is only
+    # first order at the end points, so compare the interior loosely
+    inner = slice(1, -1)
+    assert np.allclose(result.vx[inner], fd.vx[inner], atol=1e-2)
+    assert np.allclose(result.vy[inner], fd.vy[inner], atol=1e-2)
+    assert np.allclose(result.kinetic_energy, 0.5 * (result.vx**2 + result.vy**2))
+    assert np.allclose(
+        result.kinetic_energy[inner], fd.kinetic_energy[inner], atol=1e-2
+    )
+
+    with pytest.raises(ValueError):
+        PendulumResults(result.time, result.solution, result.L, result.g, "spline")
+
+
+def test_solve_events_find_zero_crossings() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_solve_events_find_zero_crossings
+    """
+    model = Pendulum(L=1.0, g=9.81)
+    u0 = np.array([0.2, 0.0])
+    crossing = make_event(lambda t, u: u[0])
+    result = model.solve(u0=u0, T=10.0, dt=0.01, events=crossing, rtol=1e-10)
+
+    assert len(result.t_events) == 1
+    t_cross = result.t_events[0]
+    assert np.allclose(result.y_events[0][:, 0], 0.0, atol=1e-8)
+    assert np.allclose(np.diff(t_cross), 0.5 * model.period(0.2), rtol=1e-6)
+
+    stop = make_event(lambda t, u: u[0], terminal=True, direction=-1)
+    stopped = model.solve(u0=u0, T=10.0, dt=0.01, events=stop)
+    assert stopped.time[-1] <= stopped.t_events[0][0]
+    assert stopped.t_events[0][0] == pytest.approx(t_cross[0], rel=1e-3)
+
+    with pytest.raises(ValueError):
+        model.solve(u0=u0, T=1.0, dt=0.01, method="rk4", events=crossing)
+
+
+def test_period_matches_elliptic_integral() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_period_matches_elliptic_integral
+    """
+    model = Pendulum(L=1.42, g=9.81)
+    amplitudes = np.array([[0.0, 0.1, -0.5], [1.0, 2.0, 3.0]])
+    periods = model.period(amplitudes)
+
+    exact = model.exact_period(amplitudes)
+    assert periods.shape == amplitudes.shape
+    assert np.allclose(periods, exact, rtol=1e-8)
+    with pytest.raises(ValueError):
+        model.period([1.0, np.pi])
+
+
+def test_exact_period_reference_values() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_exact_period_reference_values
+    """
+    model = Pendulum(L=2.0, g=9.81)
+    T0 = 2 * np.pi * np.sqrt(model.L / model.g)
+    assert model.exact_period(0.0) == pytest.approx(T0)
+    assert model.exact_period(1e-3) == pytest.approx(T0 * (1 + 1e-6 / 16), rel=1e-12)
+    # K(1/2) = 1.8540746773013719...
+    expected = 4 * np.sqrt(model.L / model.g) * 1.8540746773013719
+    assert model.exact_period(-np.pi / 2) == pytest.approx(expected, rel=1e-14)
+    assert model.exact_period(np.linspace(0, 3, 7)).shape == (7,)
+
+    with pytest.raises(ValueError):
+        model.exact_period(4.0)
+    with pytest.raises(NotImplementedError):
+        DampenedPendulum(B=0.5).exact_period(1.0)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        Pendulum(L=1.3, g=9.81),
+        DampenedPendulum(L=1.0, g=9.81, B=0.5),
+        DampenedPendulum(L=1.0, g=1.0, B=2.0),
+        DampenedPendulum(L=1.0, g=9.81, B=10.0),
+    ],
+)
+def test_exact_method_small_angle_limit(model: Pendulum) -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_exact_method_small_angle_limit
+    """
+    u0 = np.array([1e-3, -2e-3])
+    exact = model.solve(u0=u0, T=5.0, dt=0.01, method="exact")
+    reference = model.solve(
+        u0=u0, T=5.0, dt=0.01, method="DOP853", rtol=1e-12, atol=1e-15
+    )
+
+    assert isinstance(exact, PendulumResults)
+    assert exact.solution.shape == reference.solution.shape
+    # The nonlinear terms are of order θ^3 / 6 ~ 1e-10
+    assert np.allclose(exact.solution, reference.solution, atol=1e-8)
+
+
+@pytest.mark.parametrize("method", ["RK45", "DOP853", "Radau", "LSODA", "rk4"])
+def test_solve_stats(method: str, tmp_path: Path) -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_solve_stats
+    """
+    u0 = np.array([np.pi / 6, 0.35])
+    assert Pendulum().solve(u0=u0, T=2.0, dt=0.01, method=method).stats is None
+
+    model = Pendulum()
+    model.collect_stats = True
+    result = model.solve(u0=u0, T=2.0, dt=0.01, method=method)
+    stats = result.stats
+
+    assert isinstance(stats, SolveStats) and stats.method == method
+    assert stats.rhs_calls == stats.nfev > 0
+    assert stats.jac_calls == stats.njev
+    assert stats.accepted_steps > 0
+    assert 0 < stats.rhs_time < stats.total_time
+    assert 0 < stats.overhead_fraction < 1
+    assert stats.rhs_time_per_call == pytest.approx(stats.rhs_time / stats.rhs_calls)
+    if method == "RK45":
+        # 2 evaluations to start, then 6 stages per step attempt
+        attempts = stats.accepted_steps + stats.rejected_steps
+        assert stats.nfev == 2 + 6 * attempts
+    elif method == "DOP853":
+        assert stats.rejected_steps >= 0
+    elif method == "rk4":
+        assert (stats.accepted_steps, stats.rejected_steps) == (200, 0)
+    else:
+        assert stats.rejected_steps is None
+
+    # Solver output, not a parameter: save() skips it
+    result.save(str(tmp_path / "run"))
+    assert PendulumResults.load(str(tmp_path / "run")).stats is None
+
+
+def test_solve_many_tolerances_and_events() -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_solve_many_tolerances_and_events
+    """
+    model = Pendulum(L=1.0, g=9.81)
+    U0 = np.array([[0.2, 0.0], [1.0, 0.5], [2.5, 0.0], [-0.4, 1.0]])
+    tight = [model.solve(u0=u, T=5.0, dt=0.1, rtol=1e-11, atol=1e-12) for u in U0]
+
+    scale = np.sqrt(len(U0))
+    ensemble = model.solve_many(U0, T=5.0, dt=0.1, rtol=1e-9 / scale, atol=1e-10)
+    loose = model.solve_many(U0, T=5.0, dt=0.1)
+    for k, single in enumerate(tight):
+        assert np.allclose(ensemble.solution[:, k], single.solution, atol=1e-7)
+    errors = [
+        np.abs(loose.solution[:, k] - s.solution).max() for k, s in enumerate(tight)
+    ]
+    assert max(errors) > 1e-5
+
+    crossing = make_event(lambda t, u: u[0])
+    result = model.solve_many(U0, T=5.0, dt=0.1, events=crossing, rtol=1e-10)
+    assert len(result.t_events) == 1 and len(result.t_events[0]) == len(U0)
+    for k, u in enumerate(U0):
+        single = model.solve(u0=u, T=5.0, dt=0.1, events=crossing, rtol=1e-10)
+        assert np.allclose(result.t_events[0][k], single.t_events[0], rtol=1e-6)
+        assert result.y_events[0][k].shape == (len(single.t_events[0]), 2)
+        assert np.allclose(result.y_events[0][k][:, 0], 0.0, atol=1e-8)
+
+    with pytest.raises(ValueError):
+        model.solve_many(U0, T=1.0, dt=0.1, method="rk4", events=crossing)
+
+
+def test_period_is_batched_and_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_period_is_batched_and_bounded
+    """
+    calls = []
+    solve_many = Pendulum.solve_many
+
+    def counting_solve_many(self, *args, **kwargs):
+        calls.append(len(args[0]))
+        return solve_many(self, *args, **kwargs)
+
+    monkeypatch.setattr(Pendulum, "solve_many", counting_solve_many)
+    model = Pendulum(L=1.0, g=9.81)
+    amplitudes = np.linspace(0.0, 3.0, 50)
+    assert np.allclose(model.period(amplitudes), model.exact_period(amplitudes))
+    assert calls == [49]
+
+    damped = DampenedPendulum(L=1.0, g=9.81, B=0.5)
+    expected = 2 * np.pi / np.sqrt(9.81 - 0.25 * 0.5**2)
+    assert damped.period(1e-4) == pytest.approx(expected, rel=1e-8)
+    assert np.all(damped.period([1.0, 2.5]) > expected)
+
+    calls.clear()
+    critical = 2 * np.sqrt(9.81)
+    for B in (critical, 7.0, 30.0, 100.0):
+        assert np.all(np.isnan(DampenedPendulum(B=B).period([0.0, 1.0, 2.5])))
+    assert calls == []
+
+
+@pytest.mark.parametrize("method", ["RK45", "rk4", "verlet", "exact"])
+def test_time_grid_ends_at_T(method: str) -> None:
+    """
+    Run with:
+        pytest test_pendulum.py::test_time_grid_ends_at_T
+    """
+    model = Pendulum(L=1.0, g=9.81)
+    u0 = np.array([0.3, 0.0])
+    # 3 * 0.1 rounds to 0.30000000000000004
+    result = model.solve(u0=u0, T=0.3, dt=0.1, method=method)
+    assert len(result.time) == 4 and result.time[-1] == 0.3
+    assert np.array_equal(result.time, time_grid(0.3, 0.1))
+    chunks = list(model.iter_solve(u0=u0, T=0.3, dt=0.1, method=method, chunk=3))
+    assert np.array_equal(np.concatenate([c.time for c in chunks]), result.time)
+
+    with pytest.raises(ValueError):
+        model.solve(u0=u0, T=1.0, dt=0.3, method=method)
+    with pytest.raises(ValueError):
+        model.solve_many(np.array([u0]), T=1.0, dt=0.3, method=method)
+    with pytest.raises(ValueError):
+        next(model.iter_solve(u0=u0, T=1.0, dt=0.3, method=method))
@@ -0,0 +1,125 @@
+"""
+test_render.py
+==============
+
+This file contains unit tests for the batch renderer in render.py.
+
+Overview of Tests
+1. test_render_batch_png
+    - Renders energy plots of several pendulums to PNG files, in the calling
+      process and in a process pool, and checks that the same files are
+      written and that no pyplot figures are left open.
+2. test_render_batch_pdf
+    - Renders state plots to one multi-page PDF with one page per result.
+3. test_renderer_reuses_lines
+    - FigureRenderer keeps its figure and lines between draws and only
+      replaces their (downsampled) data; a draw without a title shows the
+      default title, not the previous one.
+4. test_render_batch_validates_input
+    - Unknown kinds, wrong numbers of titles and a PDF with workers raise
+      ValueError.
+
+Dependencies
+- numpy
+- matplotlib
+- pytest
+
+Run all tests with:
+    pytest test_render.py -v
+"""
+
+import numpy as np
+import pytest
+import matplotlib.pyplot as plt
+from pathlib import Path
+from pendulum import Pendulum
+from render import FigureRenderer, extract_curves, render_batch
+
+U0 = np.array([np.pi / 6, 0.35])
+
+
+def _results() -> list:
+    return [Pendulum(L=L).solve(u0=U0, T=2.0, dt=0.01) for L in (0.5, 1.0, 2.0)]
+
+
+def test_render_batch_png(tmp_path: Path) -> None:
+    """
+    Run with:
+        pytest test_render.py::test_render_batch_png
+    """
+    results = _results()
+    serial = render_batch(results, str(tmp_path / "serial"), dpi=50)
+    pooled = render_batch(results, str(tmp_path / "pooled"), dpi=50, max_workers=2)
+
+    assert [Path(p).name for p in serial] == [
+        "energy_00000.png",
+        "energy_00001.png",
+        "energy_00002.png",
+    ]
+    for a, b in zip(serial, pooled):
+        assert Path(a).read_bytes()[:8] == b"\x89PNG\r\n\x1a\n"
+        assert Path(a).read_bytes() == Path(b).read_bytes()
+    assert plt.get_fignums() == []
+
+
+def test_render_batch_pdf(tmp_path: Path) -> None:
+    """
+    Run with:
+        pytest test_render.py::test_render_batch_pdf
+    """
+    output = str(tmp_path / "states.pdf")
+    titles = ["L = 0.5", "L = 1", "L = 2"]
+    paths = render_batch(
+        _results(), output, kind="solution", state_labels=["θ", "ω"], titles=titles
+    )
+
+    assert paths == [output]
+    content = Path(output).read_bytes()
+    assert content.startswith(b"%PDF")
+    assert content.count(b"/Type /Page\n") + content.count(b"/Type /Page ") == 3
+
+
+def test_renderer_reuses_lines() -> None:
+    """
+    Run with:
+        pytest test_render.py::test_renderer_reuses_lines
+    """
+    long_run = Pendulum().solve(u0=U0, T=100.0, dt=0.001)
+    curves = extract_curves(long_run, "solution", max_points=500)
+    assert all(len(t) <= 500 for t, _ in curves)
+
+    renderer = FigureRenderer("solution")
+    figure = renderer.draw(curves)
+    lines = list(renderer.lines)
+    renderer.draw(extract_curves(_results()[0], "solution"), title="short")
+
+    assert renderer.figure is figure and renderer.lines == lines
+    assert len(renderer.axes.get_lines()) == 2
+    assert np.array_equal(lines[0].get_xdata(), _results()[0].time)
+    assert renderer.axes.get_xlim()[1] < 3.0
+
+    assert renderer.axes.get_title() == "short"
+    renderer.draw(curves)
+    assert renderer.axes.get_title() == ""
+    energy = FigureRenderer("energy")
+    energy.draw(extract_curves(_results()[0], "energy"), title="first")
+    energy.draw(extract_curves(_results()[1], "energy"), title=None)
+    assert energy.axes.get_title() == "Pendulum Energy VS. Time"
+
+
+def test_render_batch_validates_input(tmp_path: Path) -> None:
+    """
+    Run with:
+        pytest test_render.py::test_render_batch_validates_input
+    """
+    results = _results()
+    with pytest.raises(ValueError):
+        render_batch(results, str(tmp_path), kind="phase")
+    with pytest.raises(ValueError):
+        render_batch(results, str(tmp_path), titles=["only one"])
+    with pytest.raises(ValueError):
+        render_batch(results, str(tmp_path / "a.pdf"), max_workers=2)
+    with pytest.raises(ValueError):
+        FigureRenderer("solution", state_labels=["x"]).draw(
+            extract_curves(results[0], "solution")
+        )
@@ -0,0 +1,92 @@
+"""
+test_sweep.py
+=============
+
+This file contains unit tests for the parameter-sweep engine in sweep.py.
+
+Overview of Tests
+1. test_sweep_matches_direct_solves
+   - Sweeps DampenedPendulum over (L, B), in the calling process and in a
+     process pool, and checks that every trajectory equals a direct
+     model.solve() with the same parameters.
+2. test_sweep_with_batch_of_initial_conditions
+   - Sweeps DoublePendulum over L2 with a batch of initial conditions and
+     checks the shapes and the rebuilt DoublePendulumResults.
+3. test_sweep_rejects_empty_grid
+   - An empty grid or an empty parameter axis raises ValueError.
+
+Dependencies
+- numpy
+- pytest
+
+Run all tests with:
+    pytest test_sweep.py -v
+"""
+
+import numpy as np
+import pytest
+from sweep import SweepResult, sweep
+from pendulum import DampenedPendulum, PendulumResults
+from double_pendulum import DoublePendulum, DoublePendulumResults
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sweep_matches_direct_solves(max_workers: int) -> None:
+    """
+    Run with:
+        pytest test_sweep.py::test_sweep_matches_direct_solves
+    """
+    u0 = np.array([np.pi / 6, 0.35])
+    grid = {"L": [0.5, 1.0, 2.0], "B": [0.0, 0.7]}
+    result = sweep(
+        DampenedPendulum,
+        grid,
+        u0=u0,
+        T=2.0,
+        dt=0.01,
+        max_workers=max_workers,
+        chunk_size=2,
+        g=3.81,
+    )
+
+    assert isinstance(result, SweepResult)
+    assert result.grid_shape == (3, 2)
+    assert result.solution.shape == (3, 2, 2, len(result.time))
+    for i, L in enumerate(grid["L"]):
+        for j, B in enumerate(grid["B"]):
+            direct = DampenedPendulum(L=L, g=3.81, B=B).solve(u0=u0, T=2.0, dt=0.01)
+            assert np.array_equal(result.solution[i, j], direct.solution)
+
+    single = result.result((2, 1))
+    assert isinstance(single, PendulumResults)
+    assert (single.L, single.g) == (2.0, 3.81)
+
+
+def test_sweep_with_batch_of_initial_conditions() -> None:
+    """
+    Run with:
+        pytest test_sweep.py::test_sweep_with_batch_of_initial_conditions
+    """
+    U0 = np.array([[np.pi / 6, 0.35, 0.0, 0.0], [0.1, 0.0, -0.1, 0.0]])
+    result = sweep(
+        DoublePendulum, {"L2": [0.5, 1.0]}, u0=U0, T=1.0, dt=0.05, max_workers=1
+    )
+
+    assert result.solution.shape == (2, 4, 2, len(result.time))
+    member = result.result((1,))
+    assert isinstance(member, DoublePendulumResults)
+    assert member.theta1.shape == (2, len(result.time))
+    direct = DoublePendulum(L2=1.0).solve_many(U0, T=1.0, dt=0.05)
+    assert np.array_equal(member.solution, direct.solution)
+
+
+def test_sweep_rejects_empty_grid() -> None:
+    """
+    Run with:
+        pytest test_sweep.py::test_sweep_rejects_empty_grid
+    """
+    u0 = np.array([0.1, 0.0])
+    with pytest.raises(ValueError):
+        sweep(DampenedPendulum, {}, u0=u0, T=1.0, dt=0.1)
+    with pytest.raises(ValueError):
+        sweep(DampenedPendulum, {"L": []}, u0=u0, T=1.0, dt=0.1)